@@ -0,0 +1,177 @@
+"""
+Changepoints and anomalies for one series.
+
+Segments: PELT (Killick et al. 2012) with a piecewise-linear cost. The RSS of a
+least-squares line over any stretch comes from prefix sums of x, y, x^2, xy and
+y^2 in O(1), every candidate start for a given end is scored in one vectorized
+step, and pruning keeps the candidate set small, so the whole search is roughly
+linear in the number of observations.
+
+Anomalies: period-over-period changes whose robust z-score (median / IQR of the
+preceding window of changes) exceeds ANOMALY_THRESHOLD.
+"""
+import numpy as np
+
+from backend.analytics.units import PERIODS_PER_YEAR
+
+# Trailing window (in observations) the robust z-score of each change is measured against
+ANOMALY_WINDOW = {"d": 63, "w": 26, "bw": 26, "m": 24, "q": 12, "sa": 8, "a": 8}
+ANOMALY_THRESHOLD = 3.5
+MAX_ANOMALIES = 20
+# Longer series (years of daily data) are segmented on block means of about this many points
+MAX_SEARCH_POINTS = 500
+
+
+def robust_zscores(values, window):
+    """Robust z-score of each change vs the `window` changes before it (NaN until there are enough).
+
+    Center is the rolling median and scale the rolling IQR / 1.349 (pandas' rolling
+    quantiles are O(n log window)); windows with no spread, like a policy rate on
+    hold, fall back to the standard deviation.
+    """
+    import pandas as pd
+
+    values = np.asarray(values, dtype=float)
+    z = np.full(len(values), np.nan)
+    if len(values) <= window + 1:
+        return z
+    changes = pd.Series(np.diff(values))
+    history = changes.shift(1).rolling(window, min_periods=window)
+    median = history.median()
+    iqr = history.quantile(0.75) - history.quantile(0.25)
+    scale = np.where(iqr > 0, iqr / 1.349, history.std())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z[1:] = np.where(scale > 0, (changes - median) / scale, np.nan)
+    return z
+
+
+def _segment_rss(sums, starts, end):
+    """RSS of the least-squares line over [start, end) for each start (x = observation index).
+
+    sums is the (5, n + 1) stack of prefix sums of x, y, x^2, xy and y^2.
+    """
+    sx, sy, sxx, sxy, syy = sums[:, end, None] - sums[:, starts]
+    m = end - starts
+    var_x = sxx - sx * sx / m
+    cov = sxy - sx * sy / m
+    var_y = syy - sy * sy / m
+    rss = var_y - cov * cov / np.where(var_x > 0, var_x, np.inf)
+    return np.maximum(rss, 0.0)
+
+
+def _noise_variance(y):
+    """Robust noise variance for a piecewise-linear signal, from second differences."""
+    if len(y) < 4:
+        return float(np.var(y)) or 1.0
+    d2 = np.diff(y, 2)
+    sigma = np.median(np.abs(d2 - np.median(d2))) / 0.6745 / np.sqrt(6)
+    return float(sigma ** 2) or float(np.var(d2) / 6) or 1.0
+
+
+def pelt(values, penalty=None, min_size=None):
+    """Segment boundaries (exclusive end indices, last one = len(values)) minimizing RSS + penalty per segment.
+
+    The default penalty is BIC-like: 3 parameters per segment (level, slope,
+    location) times the noise variance times log(n).
+    """
+    y = np.asarray(values, dtype=float)
+    n = len(y)
+    if n == 0:
+        return []
+    # At most ~15 segments however long the series is
+    min_size = min_size or max(3, n // 15)
+    if n < 2 * min_size:
+        return [n]
+    # Standardize so the prefix sums stay well conditioned
+    y = (y - y.mean()) / (y.std() or 1.0)
+    x = np.arange(n, dtype=float) / n
+    sums = np.zeros((5, n + 1))
+    np.cumsum(np.stack((x, y, x * x, x * y, y * y)), axis=1, out=sums[:, 1:])
+    if penalty is None:
+        penalty = 3 * _noise_variance(y) * np.log(n)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.intp)
+    # Starts that survived pruning; start end - min_size becomes eligible at each step
+    candidates = np.zeros(0, dtype=np.intp)
+    for end in range(min_size, n + 1):
+        newest = end - min_size
+        ready = np.append(candidates, newest) if np.isfinite(best[newest]) else candidates
+        costs = best[ready] + _segment_rss(sums, ready, end)
+        i = int(np.argmin(costs))
+        best[end] = costs[i] + penalty
+        previous[end] = ready[i]
+        # Prune starts that can never beat the current optimum
+        candidates = ready[costs <= best[end]]
+
+    bounds = [n]
+    while bounds[-1] > 0:
+        bounds.append(int(previous[bounds[-1]]))
+    return bounds[-2::-1]
+
+
+def _boundaries(values, penalty=None, min_size=None):
+    """pelt() boundaries, searched over block means when the series is longer than MAX_SEARCH_POINTS."""
+    n = len(values)
+    step = -(-n // MAX_SEARCH_POINTS)
+    if step <= 1:
+        return pelt(values, penalty, min_size)
+    # Segments are at least n/15 long anyway, so a block of `step` observations loses nothing visible
+    blocks = -(-n // step)
+    padded = np.concatenate((values, np.full(blocks * step - n, values[-1])))
+    coarse = pelt(padded.reshape(blocks, step).mean(axis=1), penalty, min_size and max(2, min_size // step))
+    return [min(b * step, n) for b in coarse]
+
+
+def segments(dates, values, frequency="m", penalty=None, min_size=None):
+    """Piecewise-linear segments with their dates, fitted slope (per period and per year) and direction."""
+    values = np.asarray(values, dtype=float)
+    per_year = PERIODS_PER_YEAR.get((frequency or "m").lower(), 12)
+    spread = float(np.std(values)) if len(values) else 0.0
+    found, start = [], 0
+    for end in _boundaries(values, penalty, min_size):
+        y = values[start:end]
+        x = np.arange(len(y), dtype=float)
+        dx = x - x.mean()
+        slope = float(dx @ (y - y.mean()) / (dx @ dx)) if len(y) > 1 else 0.0
+        change = slope * (len(y) - 1)
+        noise = float(np.std(y - y.mean() - slope * dx))
+        # Flat if the fitted move is lost in the noise around the line or tiny next to the series' range
+        flat = abs(change) < max(2 * noise, 0.02 * spread)
+        direction = "flat" if flat else "upward" if change > 0 else "downward"
+        found.append({
+            "start": str(dates[start]),
+            "end": str(dates[end - 1]),
+            "periods": len(y),
+            "slope": slope,
+            "slope_per_year": slope * per_year,
+            "start_value": float(y[0]),
+            "end_value": float(y[-1]),
+            "direction": direction,
+        })
+        start = end
+    return found
+
+
+def anomalies(dates, values, frequency="m", threshold=ANOMALY_THRESHOLD, limit=MAX_ANOMALIES):
+    """Observations whose change from the previous one is a robust outlier (largest |z| first, at most limit)."""
+    values = np.asarray(values, dtype=float)
+    z = robust_zscores(values, ANOMALY_WINDOW.get((frequency or "m").lower(), 24))
+    with np.errstate(invalid="ignore"):
+        hits = np.flatnonzero(np.abs(z) > threshold)
+    hits = hits[np.argsort(-np.abs(z[hits]), kind="stable")][:limit]
+    return [{
+        "date": str(dates[i]),
+        "value": float(values[i]),
+        "change": float(values[i] - values[i - 1]),
+        "z": float(z[i]),
+    } for i in sorted(hits.tolist())]
+
+
+def analyze(dates, values, frequency="m"):
+    """{'segments': [...], 'anomalies': [...]} for date-sorted observations without gaps (NaNs)."""
+    return {
+        "segments": segments(dates, values, frequency),
+        "anomalies": anomalies(dates, values, frequency),
+    }
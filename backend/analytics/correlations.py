@@ -0,0 +1,91 @@
+"""
+Pairwise correlation and lead-lag analysis on an aligned (time x series) matrix.
+
+Cross-correlations for every pair and every lag come out of one batch of FFTs:
+each column is standardized over its own observations (gaps become 0 and are
+tracked in a mask), and by the correlation theorem
+
+    irfft(conj(F_i) * F_j)[L] = sum_t z_i[t] * z_j[t + L]
+
+Dividing by the number of overlapping observations at each lag (the same
+transform applied to the masks) gives the correlation. The series are
+standardized once over their whole history, not per lag, which is the usual
+approximation and makes all k*k pairs cost about as much as one.
+"""
+import numpy as np
+
+
+def _standardize(matrix):
+    mask = np.isfinite(matrix)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(np.where(mask, matrix, np.nan), axis=0)
+        std = np.nanstd(np.where(mask, matrix, np.nan), axis=0)
+        z = (matrix - mean) / np.where(std > 0, std, np.nan)
+    mask &= np.isfinite(z)
+    return np.where(mask, z, 0.0), mask.astype(float)
+
+
+def lead_lag(matrix, max_lag, min_overlap=24):
+    """Cross-correlation of every column pair for lags -max_lag..max_lag.
+
+    Returns (lags, corr) with corr[n, i, j] = corr(x_i[t], x_j[t + lags[n]]), so a
+    peak at a positive lag means column i leads column j by that many periods.
+    Lags with fewer than min_overlap overlapping observations are NaN.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    periods = matrix.shape[0]
+    z, mask = _standardize(matrix)
+    # Zero-pad to at least 2T so the circular correlation doesn't wrap around
+    nfft = 1 << max(1, (2 * periods - 1).bit_length())
+    fz = np.fft.rfft(z, nfft, axis=0)
+    fm = np.fft.rfft(mask, nfft, axis=0)
+    cross = np.fft.irfft(np.conj(fz)[:, :, None] * fz[:, None, :], nfft, axis=0)
+    counts = np.fft.irfft(np.conj(fm)[:, :, None] * fm[:, None, :], nfft, axis=0)
+
+    max_lag = min(max_lag, periods - 1)
+    lags = np.arange(-max_lag, max_lag + 1)
+    cross, counts = cross[lags % nfft], np.rint(counts[lags % nfft])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.where(counts >= min_overlap, cross / counts, np.nan)
+    return lags, np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(matrix, min_overlap=24):
+    """Pearson correlation of every column pair over the rows both observe (lag 0)."""
+    import pandas as pd
+    return pd.DataFrame(np.asarray(matrix, dtype=float)).corr(min_periods=min_overlap).to_numpy()
+
+
+def analyze(matrix, max_lag, min_overlap=24):
+    """(lags, lead-lag corr, lag-0 Pearson matrix) in one call, so it runs as a single pool job."""
+    matrix = np.asarray(matrix, dtype=float)
+    k = matrix.shape[1]
+    if len(matrix) < 2:
+        return np.arange(0), np.empty((0, k, k)), np.full((k, k), np.nan)
+    lags, corr = lead_lag(matrix, max_lag, min_overlap)
+    return lags, corr, correlation_matrix(matrix, min_overlap)
+
+
+def lead_lag_summary(names, lags, corr):
+    """Strongest lag per pair: which series leads, by how many periods, and how strongly."""
+    pairs = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            profile = corr[:, i, j]
+            if np.isnan(profile).all():
+                continue
+            best = int(np.nanargmax(np.abs(profile)))
+            lag = int(lags[best])
+            leader, follower = (names[i], names[j]) if lag >= 0 else (names[j], names[i])
+            pairs.append({
+                "a": names[i],
+                "b": names[j],
+                "best_lag": lag,
+                "best_corr": float(profile[best]),
+                "leader": leader if lag else None,
+                "follower": follower if lag else None,
+                "lead_periods": abs(lag),
+                "profile": profile.tolist(),
+            })
+    pairs.sort(key=lambda p: -abs(p["best_corr"]))
+    return pairs
@@ -0,0 +1,142 @@
+"""
+Regime episodes: spells where a rule holds on consecutive observations.
+
+A rule turns a series into a boolean mask (signal below/above a threshold) and
+the episodes are the runs of True in it, found with one np.diff over the mask.
+Signals are the levels, a FRED units transformation computed locally (e.g. pc1
+for year-over-year inflation) or the Sahm rule indicator.
+
+Episodes are detected once over a series' full history and kept in an
+EpisodeIndex, so date-range queries are two bisects.
+"""
+import bisect
+
+import numpy as np
+
+from backend.analytics.units import transform
+
+# signal: "level", a FRED units code, or "sahm"
+# min_length: shortest run (in observations) that counts as an episode
+# max_gap: runs separated by at most this many observations are merged (daily data flickers around 0)
+EPISODE_RULES = {
+    "t10y3m": [
+        {"rule": "inversion", "label": "Yield curve inverted (10Y-3M spread below 0)",
+         "signal": "level", "op": "below", "threshold": 0.0, "min_length": 5, "max_gap": 10},
+    ],
+    "cpi": [
+        {"rule": "high_inflation", "label": "CPI inflation above 4% year over year",
+         "signal": "pc1", "op": "above", "threshold": 4.0},
+    ],
+    "unemployment": [
+        {"rule": "sahm", "label": "Sahm rule: 3-month average unemployment 0.5pp above its low of the prior 12 months",
+         "signal": "sahm", "op": "above", "threshold": 0.5},
+    ],
+    "gdp": [
+        {"rule": "contraction", "label": "GDP falling quarter over quarter",
+         "signal": "pch", "op": "below", "threshold": 0.0},
+    ],
+}
+
+
+def runs(mask, max_gap=0):
+    """(starts, ends) of the runs of True in mask, inclusive indices.
+
+    Runs separated by max_gap or fewer False values are merged into one.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    if max_gap and len(starts) > 1:
+        # Keep a boundary only where the gap to the next run is too wide to bridge
+        split = starts[1:] - ends[:-1] - 1 > max_gap
+        starts = np.concatenate((starts[:1], starts[1:][split]))
+        ends = np.concatenate((ends[:-1][split], ends[-1:]))
+    return starts, ends
+
+
+def sahm_indicator(values, window=3, lookback=12):
+    """3-month average minus its minimum over the prior 12 months (NaN until there's enough history)."""
+    values = np.asarray(values, dtype=float)
+    ma = np.full(len(values), np.nan)
+    if len(values) >= window:
+        ma[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+    prior_low = np.full(len(values), np.nan)
+    if len(values) > lookback:
+        prior_low[lookback:] = np.lib.stride_tricks.sliding_window_view(ma[:-1], lookback).min(axis=1)
+    return ma - prior_low
+
+
+def signal(dates, values, rule, frequency="m"):
+    kind = rule.get("signal", "level")
+    if kind == "level":
+        return np.asarray(values, dtype=float)
+    if kind == "sahm":
+        return sahm_indicator(values)
+    return transform(dates, values, kind, frequency)
+
+
+def detect(dates, values, rule, frequency="m"):
+    """Episodes of one rule over date-sorted observations, oldest first.
+
+    Each episode has start/end dates, its length in observations and days, the
+    most extreme signal value reached (and when), and whether it is still ongoing.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    values = signal(dates, values, rule, frequency)
+    valid = np.isfinite(values)
+    with np.errstate(invalid="ignore"):
+        mask = values < rule["threshold"] if rule["op"] == "below" else values > rule["threshold"]
+    starts, ends = runs(mask & valid, rule.get("max_gap", 0))
+    keep = ends - starts + 1 >= rule.get("min_length", 1)
+    starts, ends = starts[keep], ends[keep]
+
+    last_valid = int(np.flatnonzero(valid)[-1]) if valid.any() else -1
+    pick = np.nanargmin if rule["op"] == "below" else np.nanargmax
+    episodes = []
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        extreme = s + int(pick(values[s:e + 1]))
+        episodes.append({
+            "rule": rule["rule"],
+            "start": str(dates[s]),
+            "end": str(dates[e]),
+            "periods": e - s + 1,
+            "days": int((dates[e] - dates[s]).astype(int)) + 1,
+            "extreme": float(values[extreme]),
+            "extreme_date": str(dates[extreme]),
+            "ongoing": e == last_valid,
+        })
+    return episodes
+
+
+def detect_all(dates, values, rules, frequency="m"):
+    """{rule name: episodes} for every rule."""
+    return {rule["rule"]: detect(dates, values, rule, frequency) for rule in rules}
+
+
+class EpisodeIndex:
+    """Episodes of one series by rule, sorted by start, for date-range queries.
+
+    Episodes of one rule never overlap, so both starts and ends are sorted and
+    "overlaps [start, end]" is a slice between two bisects.
+    """
+
+    def __init__(self, episodes_by_rule):
+        self.episodes = episodes_by_rule
+        self._starts = {rule: [ep["start"] for ep in eps] for rule, eps in episodes_by_rule.items()}
+        self._ends = {rule: [ep["end"] for ep in eps] for rule, eps in episodes_by_rule.items()}
+
+    def query(self, start=None, end=None, rule=None):
+        """Episodes overlapping start..end (ISO dates, either open), oldest first."""
+        found = []
+        for name, eps in self.episodes.items():
+            if rule and name != rule:
+                continue
+            lo = bisect.bisect_left(self._ends[name], start) if start else 0
+            hi = bisect.bisect_right(self._starts[name], end) if end else len(eps)
+            found.extend(eps[lo:hi])
+        return sorted(found, key=lambda ep: ep["start"])
+
+    def active(self):
+        """Rules whose latest episode is still ongoing."""
+        return [name for name, eps in self.episodes.items() if eps and eps[-1]["ongoing"]]
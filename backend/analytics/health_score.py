@@ -0,0 +1,141 @@
+import math
+import numpy as np
+
+# Order matters: columns of the metric matrix the scorers run over
+METRICS = ['gdp_yoy', 'unemployment', 'cpi_yoy', 'fedfunds', 'pce_yoy', 't10y3m']
+
+# metric -> (source series, YoY periods at the series' native frequency; None = level)
+METRIC_SOURCES = {
+    'gdp_yoy': ('gdp', 4),
+    'cpi_yoy': ('cpi', 12),
+    'unemployment': ('unemployment', None),
+    'fedfunds': ('fedfunds', None),
+    'pce_yoy': ('pce', 12),
+    't10y3m': ('t10y3m', None),
+}
+
+# Memoized results keyed by the observation versions of the input series
+_health_cache = {}
+_MAX_CACHE_ENTRIES = 64
+
+
+def score_matrix(values):
+    """Score a (..., 6) array of metrics (columns in METRICS order) in one vectorized pass.
+
+    Same rules as the frontend scoring. NaN inputs give NaN scores, which are
+    skipped when averaging into the composite.
+    """
+    values = np.asarray(values, dtype=float)
+    gdp, unemp, cpi, fed, pce, spread = np.moveaxis(values, -1, 0)
+    fed_dist = np.where(fed < 2, 2 - fed, np.where(fed > 4, fed - 4, 0.0))
+    scores = np.stack([
+        (gdp + 2) / 8,
+        1 - np.minimum(1, np.abs(unemp - 4) / 4),
+        1 - np.minimum(1, np.abs(cpi - 2) / 4),
+        1 - np.minimum(1, fed_dist / 4),
+        pce / 6,
+        (spread + 1) / 3,
+    ], axis=-1)
+    scores[~np.isfinite(scores)] = np.nan
+    return np.clip(scores, 0.0, 1.0)
+
+
+def health_percent_from_scores(scores):
+    """Average the available scores into a 0-100 composite (NaN where nothing is available)."""
+    scores = np.asarray(scores, dtype=float)
+    available = np.isfinite(scores)
+    counts = available.sum(axis=-1)
+    totals = np.where(available, scores, 0.0).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, totals / counts * 100, np.nan)
+
+
+def _tail_values(df, n):
+    """Last n non-NaN values of a series, reading only as far back as needed."""
+    if df is None or 'value' not in df:
+        return np.empty(0)
+    values = df['value'].to_numpy(dtype=float)
+    # Walk back in small chunks so a long history with a clean tail never gets scanned
+    chunk = max(n * 2, 8)
+    end = len(values)
+    picked = []
+    while end > 0 and sum(len(p) for p in picked) < n:
+        block = values[max(0, end - chunk):end]
+        picked.insert(0, block[~np.isnan(block)])
+        end -= chunk
+    tail = np.concatenate(picked) if picked else np.empty(0)
+    return tail[-n:]
+
+
+def latest_metrics(frames):
+    """Latest headline metrics from a {series: DataFrame} map (None where unavailable)."""
+    metrics = {}
+    for metric, (series, periods) in METRIC_SOURCES.items():
+        if periods is None:
+            tail = _tail_values(frames.get(series), 1)
+            metrics[metric] = float(tail[-1]) if len(tail) else None
+        else:
+            tail = _tail_values(frames.get(series), periods + 1)
+            if len(tail) <= periods or tail[0] == 0:
+                metrics[metric] = None
+            else:
+                metrics[metric] = float((tail[-1] - tail[0]) / tail[0] * 100.0)
+    return metrics
+
+
+def compute_health(frames, versions=None):
+    """Return (health_percent, metrics) for the latest observations.
+
+    versions maps series name -> observation version; when given, the result is
+    memoized so repeated requests over unchanged data skip the computation entirely.
+    """
+    key = tuple(sorted(versions.items())) if versions else None
+    if key is not None and key in _health_cache:
+        return _health_cache[key]
+
+    metrics = latest_metrics(frames)
+    row = np.array([[math.nan if metrics[m] is None else metrics[m] for m in METRICS]])
+    health = health_percent_from_scores(score_matrix(row))[0]
+    result = (None if math.isnan(health) else round(float(health)), metrics)
+
+    if key is not None:
+        if len(_health_cache) >= _MAX_CACHE_ENTRIES:
+            _health_cache.pop(next(iter(_health_cache)))
+        _health_cache[key] = result
+    return result
+
+
+def health_history(frames, start=None, end=None):
+    """Monthly composite health score over a date range as a DataFrame.
+
+    All series are put on one month-start grid (last observation of each month,
+    forward-filled for quarterly GDP), YoY changes are taken as 12-month shifts and
+    the whole metric matrix is scored at once. Frames should begin a year before
+    `start` so YoY values exist for the first months.
+    """
+    import pandas as pd
+
+    columns = {}
+    for metric, (series, periods) in METRIC_SOURCES.items():
+        df = frames.get(series)
+        if df is None or df.empty:
+            continue
+        monthly = df['value'].resample('MS').last().ffill()
+        if periods is not None:
+            monthly = monthly.pct_change(12, fill_method=None) * 100.0
+        columns[metric] = monthly
+
+    if not columns:
+        return pd.DataFrame(columns=METRICS + ['health_percent'])
+
+    matrix = pd.DataFrame(columns).reindex(columns=METRICS)
+    # Carry the last known value forward so series that publish later don't blank out a month
+    matrix = matrix.sort_index().ffill()
+    if start is not None:
+        matrix = matrix[matrix.index >= pd.Timestamp(start)]
+    if end is not None:
+        matrix = matrix[matrix.index <= pd.Timestamp(end)]
+
+    health = health_percent_from_scores(score_matrix(matrix.to_numpy()))
+    matrix['health_percent'] = np.round(health)
+    return matrix
@@ -1,12 +1,23 @@
 # insight_ai.py
-from openai import OpenAI
 import os, json
 import hashlib
+import logging
+import threading
 import time
 
+from backend.analytics.prompt_builder import build_series_prompt, build_batch_prompt
+from backend.analytics.llm_guard import GuardedLLMClient
+from backend.metrics import AI_REQUESTS, span
+
+logger = logging.getLogger(__name__)
+
 base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))  # go up two levels to root
 
 def _load_openai_client():
+    # Local mock so the insight pipeline can be exercised without an API key
+    if os.getenv("OPENAI_MOCK") == "1":
+        from backend.analytics.mock_llm import MockLLMClient
+        return MockLLMClient()
     # Prefer environment variable in deployment
     api_key = os.getenv("OPENAI_KEY")
     if not api_key:
@@ -19,19 +30,61 @@ def _load_openai_client():
                     api_key = secrets.get("OPENAI_KEY")
             except Exception:
                 api_key = None
-    return OpenAI(api_key=api_key) if api_key else None
+    if not api_key:
+        return None
+    # Imported here: the SDK is slow to import and only needed once we actually call the model
+    from openai import OpenAI
+    # The guard owns retries/deadlines, so keep the SDK's own retry loop short
+    return OpenAI(api_key=api_key, max_retries=1)
+
+def _guard_client(raw_client):
+    """Put the rate limiter / concurrency cap / circuit breaker in front of the client."""
+    if raw_client is None:
+        return None
+    return GuardedLLMClient(
+        raw_client,
+        rate_per_minute=float(os.getenv("OPENAI_RATE_PER_MIN", "60")),
+        burst=int(os.getenv("OPENAI_BURST", "5")),
+        max_concurrency=int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+        timeout=float(os.getenv("OPENAI_TIMEOUT", "15")),
+        failure_threshold=int(os.getenv("OPENAI_BREAKER_THRESHOLD", "3")),
+        reset_timeout=float(os.getenv("OPENAI_BREAKER_RESET", "60")),
+    )
 
-client = _load_openai_client()
+_client = None
+_client_loaded = False
+_client_lock = threading.Lock()
+
+def get_client():
+    """The guarded OpenAI client, built on first use (None if no key is configured)."""
+    global _client, _client_loaded
+    if not _client_loaded:
+        with _client_lock:
+            if not _client_loaded:
+                _client = _guard_client(_load_openai_client())
+                _client_loaded = True
+    return _client
 
 # Simple in-memory cache for AI insights to avoid repeated API calls
 _ai_insights_cache = {}
 
+OVERALL_FALLBACK = "If there are no AI insights it's because I ran out of OpenAI tokens haha"
+
 def _get_cache_key(data, series_name, insight_type="individual"):
     """Generate a cache key for AI insights based on data hash and series name"""
     data_str = str(data.to_dict() if hasattr(data, 'to_dict') else data)
     cache_string = f"{insight_type}_{series_name}_{data_str}"
     return hashlib.md5(cache_string.encode()).hexdigest()
 
+def is_fallback_insight(text):
+    """True for the placeholder text we return when OpenAI couldn't be used (never cache these)."""
+    return not text or text == OVERALL_FALLBACK or text.startswith("AI insights temporarily unavailable")
+
+def _overall_cache_key(context):
+    """Stable file-cache key for an overall insight (same across processes)."""
+    metrics_hash = hashlib.md5(str(sorted(context.get('metrics', {}).items())).encode()).hexdigest()
+    return f"overall_ai_{context.get('health_percent', 0)}_{metrics_hash}"
+
 def _get_cached_ai_insight(cache_key):
     """Get cached AI insight if available"""
     return _ai_insights_cache.get(cache_key)
@@ -46,7 +99,7 @@ def _cache_ai_insight(cache_key, insight):
         del _ai_insights_cache[oldest_key]
 
 
-def generate_insight(trend_data, series_name):
+def generate_insight(trend_data, series_name, changepoints=None):
     direction = trend_data['direction']
     pct_change = trend_data['pct_change']
     volatility = trend_data['volatility']
@@ -58,49 +111,78 @@ def generate_insight(trend_data, series_name):
     else:
         direction_phrase = f"{series_name} has remained relatively stable"
 
-    volatility_comment = "and has shown high volatility." if volatility > 3 else "with steady behavior."
+    # Both come back as None for series that start at (or cross) zero, e.g. changes and spreads
+    volatility_comment = "and has shown high volatility." if volatility is not None and volatility > 3 else "with steady behavior."
     
-    if pct_change > 0:
+    if pct_change is None:
+        change_comment = "It started the period at zero, so there's no meaningful percent change."
+    elif pct_change > 0:
         change_comment = f"Overall, it increased by {pct_change}% since the start of the selected period."
     else:
         change_comment = f"Overall, it decreased by {abs(pct_change)}% since the start of the selected period."
 
-    return f"{direction_phrase} {change_comment} The data appears {volatility_comment}\n"
+    regime_comment = ""
+    segments = (changepoints or {}).get('segments') or []
+    if len(segments) > 1:
+        # The whole-window direction can hide a turn; say what the latest stretch is doing
+        latest = segments[-1]
+        moving = {"upward": "rising", "downward": "falling"}.get(latest['direction'])
+        if moving:
+            regime_comment = f" Since {latest['start']} it has been {moving} by about {abs(latest['slope_per_year']):.2f} per year."
+        else:
+            regime_comment = f" Since {latest['start']} it has been roughly flat."
+    anomalies = (changepoints or {}).get('anomalies') or []
+    if anomalies:
+        largest = max(anomalies, key=lambda a: abs(a['z']))
+        regime_comment += f" The most unusual move came on {largest['date']}."
 
+    return f"{direction_phrase} {change_comment} The data appears {volatility_comment}{regime_comment}\n"
 
 
-def generate_ai_insight(trend_data, series_name):
-    """Generate a natural language summary of the economic trend"""
+
+def generate_ai_insight(data, series_name, trend_data=None, changepoints=None):
+    """Generate a natural language summary of the economic trend.
+
+    data is the raw observations DataFrame; it's condensed into a compact prompt
+    (trend stats, extrema, regimes, downsampled key points) before going to the model.
+    """
     try:
+        client = get_client()
         if client is None:
+            AI_REQUESTS.inc(kind="series", result="unavailable")
             return f"AI insights temporarily unavailable for {series_name}."
-        
-        # Check cache first
-        cache_key = _get_cache_key(trend_data, series_name, "individual")
-        cached_insight = _get_cached_ai_insight(cache_key)
-        if cached_insight:
-            print(f"Returning cached AI insight for {series_name}")
-            return cached_insight
-        
-        prompt = f"""
+
+        if hasattr(data, 'columns'):
+            prompt = build_series_prompt(data, series_name, trend_data, changepoints=changepoints)
+        else:
+            prompt = f"""
         Provide a concise, professional summary of the following trend data:
-        {trend_data}
+        {data}
         Series: {series_name}
         """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-        )
+        # Check cache first (the compact prompt is a much cheaper key than the raw data)
+        cache_key = _get_cache_key(prompt, series_name, "individual")
+        cached_insight = _get_cached_ai_insight(cache_key)
+        if cached_insight:
+            AI_REQUESTS.inc(kind="series", result="cached")
+            return cached_insight
+
+        with span("ai", series_name):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+            )
 
         insight = response.choices[0].message.content
         # Cache the result
         _cache_ai_insight(cache_key, insight)
-        print(f"Cached AI insight for {series_name}")
+        AI_REQUESTS.inc(kind="series", result="ok")
         
         return insight
     except Exception as e:
-        print(f"OpenAI API error: {e}")
+        logger.warning("OpenAI API error: %s", e)
+        AI_REQUESTS.inc(kind="series", result="error")
         return f"AI insights temporarily unavailable for {series_name}. Please try again later."
 
 
@@ -114,23 +196,25 @@ def generate_overall_ai_insight(context: dict, backend_cache=None):
       }
     """
     try:
+        client = get_client()
         if client is None:
-            return "If there are no AI insights it's because I ran out of OpenAI tokens haha"
+            AI_REQUESTS.inc(kind="overall", result="unavailable")
+            return OVERALL_FALLBACK
         
         # Use persistent file-based cache if available
         if backend_cache:
             # Create a stable cache key based on context
-            context_str = f"overall_ai_{context.get('health_percent', 0)}_{hash(str(sorted(context.get('metrics', {}).items())))}"
+            context_str = _overall_cache_key(context)
             cached_data = backend_cache.get("ai_insights", context_str, context_str, "")
             if cached_data and cached_data.get('ai_insight'):
-                print(f"Returning cached overall AI insight from file cache")
+                AI_REQUESTS.inc(kind="overall", result="cached")
                 return cached_data['ai_insight']
         
         # Fallback to in-memory cache
         cache_key = _get_cache_key(context, "overall", "overall")
         cached_insight = _get_cached_ai_insight(cache_key)
         if cached_insight:
-            print(f"Returning cached overall AI insight from memory cache")
+            AI_REQUESTS.inc(kind="overall", result="cached")
             return cached_insight
         
         prompt = f"""
@@ -147,23 +231,93 @@ def generate_overall_ai_insight(context: dict, backend_cache=None):
         - Keep the tone neutral and informative; no predictions, just assessment.
         """
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-        )
+        with span("ai", "overall"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+            )
 
         insight = response.choices[0].message.content
+        AI_REQUESTS.inc(kind="overall", result="ok")
         
         # Cache in both persistent and memory cache
         if backend_cache:
             cache_data = {'ai_insight': insight, 'timestamp': time.time()}
             backend_cache.set("ai_insights", context_str, context_str, cache_data, "")
-            print(f"Cached overall AI insight to file cache")
         
         _cache_ai_insight(cache_key, insight)
-        print(f"Cached overall AI insight to memory cache")
         
         return insight
     except Exception as e:
-        print(f"OpenAI API error (overall): {e}")
-        return "If there are no AI insights it's because I ran out of OpenAI tokens haha"
\ No newline at end of file
+        logger.warning("OpenAI API error (overall): %s", e)
+        AI_REQUESTS.inc(kind="overall", result="error")
+        return OVERALL_FALLBACK
+
+
+def generate_batch_ai_insights(series_data: dict, context: dict, backend_cache=None, use_cache=True):
+    """Generate every per-series narrative and the overall assessment in one request.
+
+    series_data maps series name -> (DataFrame, trend_data, changepoints); context has the same
+    shape as for generate_overall_ai_insight. Returns {'series': {name: text}, 'overall': text}.
+    Results are written to the same caches the single-series/overall paths read from;
+    use_cache=False neither reads nor writes them.
+    """
+    names = list(series_data)
+    result = {
+        'series': {name: f"AI insights temporarily unavailable for {name}." for name in names},
+        'overall': OVERALL_FALLBACK,
+    }
+    client = get_client()
+    if client is None:
+        AI_REQUESTS.inc(kind="batch", result="unavailable")
+        return result
+
+    # Reuse whatever is already cached; only go to the model if something is missing
+    series_keys = {
+        name: _get_cache_key(build_series_prompt(df, name, trend_data, changepoints=changepoints), name, "individual")
+        for name, (df, trend_data, changepoints) in series_data.items()
+    }
+    cached_series = {name: use_cache and _get_cached_ai_insight(key) for name, key in series_keys.items()}
+    overall_key = _get_cache_key(context, "overall", "overall")
+    context_str = _overall_cache_key(context)
+    cached_overall = use_cache and _get_cached_ai_insight(overall_key)
+    if use_cache and not cached_overall and backend_cache:
+        cached_data = backend_cache.get("ai_insights", context_str, context_str, "")
+        if cached_data and cached_data.get('ai_insight'):
+            cached_overall = cached_data['ai_insight']
+
+    if cached_overall and all(cached_series.values()):
+        AI_REQUESTS.inc(kind="batch", result="cached")
+        return {'series': cached_series, 'overall': cached_overall}
+
+    try:
+        prompt = build_batch_prompt(series_data, context)
+        with span("ai", "batch"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+            )
+        parsed = json.loads(response.choices[0].message.content)
+    except Exception as e:
+        logger.warning("OpenAI API error (batch): %s", e)
+        AI_REQUESTS.inc(kind="batch", result="error")
+        return result
+
+    series_text = parsed.get('series') if isinstance(parsed.get('series'), dict) else {}
+    for name in names:
+        text = series_text.get(name)
+        if isinstance(text, str) and text.strip():
+            result['series'][name] = text
+            if use_cache:
+                _cache_ai_insight(series_keys[name], text)
+    overall = parsed.get('overall')
+    if isinstance(overall, str) and overall.strip():
+        result['overall'] = overall
+        if use_cache:
+            _cache_ai_insight(overall_key, overall)
+        if use_cache and backend_cache:
+            backend_cache.set("ai_insights", context_str, context_str, {'ai_insight': overall, 'timestamp': time.time()}, "")
+    AI_REQUESTS.inc(kind="batch", result="ok")
+    logger.info("Generated batch AI insights for %d series", len(names))
+    return result
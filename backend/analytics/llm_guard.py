@@ -0,0 +1,141 @@
+import threading
+import time
+from types import SimpleNamespace
+
+
+class LLMUnavailableError(RuntimeError):
+    """Raised instead of calling OpenAI when the guard knows the call can't succeed in time."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting at most `timeout` seconds. Returns False if we'd wait longer."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else float('inf')
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and stays open for `reset_timeout` seconds.
+
+    After the cooldown one trial call is let through (half-open); success closes the
+    breaker again, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return 'closed'
+        if now - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def cancel_trial(self):
+        """Give back a half-open trial slot that never reached OpenAI."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, trip=False):
+        """Count a failure; trip=True opens the breaker immediately (e.g. quota exhausted)."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if trip or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def _is_quota_error(exc):
+    text = str(exc).lower()
+    return 'insufficient_quota' in text or 'exceeded your current quota' in text
+
+
+class GuardedLLMClient:
+    """Wraps an OpenAI-style client with a rate limiter, concurrency cap, deadlines and a circuit breaker.
+
+    Exposes the same `chat.completions.create(...)` call so insights.py doesn't care
+    whether it talks to the guard, the raw SDK client or MockLLMClient.
+    """
+
+    def __init__(self, client, rate_per_minute=60, burst=5, max_concurrency=4,
+                 timeout=15.0, failure_threshold=3, reset_timeout=60.0):
+        self._client = client
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        if not self.breaker.allow():
+            raise LLMUnavailableError("OpenAI circuit open; serving fallback")
+
+        timeout = kwargs.pop('timeout', self.timeout)
+        deadline = time.monotonic() + timeout
+
+        # Waiting for a rate-limit token or a free slot counts against the same deadline
+        if not self.bucket.acquire(timeout=timeout):
+            self.breaker.cancel_trial()
+            raise LLMUnavailableError("OpenAI rate limit reached; serving fallback")
+        if not self.semaphore.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self.breaker.cancel_trial()
+            raise LLMUnavailableError("Too many concurrent OpenAI calls; serving fallback")
+        try:
+            remaining = max(0.1, deadline - time.monotonic())
+            response = self._client.chat.completions.create(timeout=remaining, **kwargs)
+        except Exception as e:
+            self.breaker.record_failure(trip=_is_quota_error(e))
+            raise
+        finally:
+            self.semaphore.release()
+        self.breaker.record_success()
+        return response
@@ -0,0 +1,56 @@
+import json
+import re
+import time
+from types import SimpleNamespace
+
+from backend.analytics.prompt_builder import estimate_tokens
+
+
+class MockLLMClient:
+    """Local stand-in for the OpenAI client (same chat.completions.create shape).
+
+    Returns canned text and records every prompt so callers can check prompt size
+    without spending tokens. Enable in the app with OPENAI_MOCK=1. `latency` and
+    `error` simulate a slow or failing upstream (error is raised on every call).
+    """
+
+    def __init__(self, reply="Mock AI insight.", latency=0.0, error=None):
+        self.reply = reply
+        self.latency = latency
+        self.error = error
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model=None, messages=None, **kwargs):
+        prompt = "\n".join(m.get('content', '') for m in (messages or []))
+        self.calls.append({'model': model, 'prompt': prompt, 'prompt_tokens': estimate_tokens(prompt)})
+        timeout = kwargs.get('timeout')
+        if self.latency:
+            time.sleep(self.latency if timeout is None else min(self.latency, timeout))
+            if timeout is not None and self.latency > timeout:
+                raise TimeoutError(f"Mock LLM timed out after {timeout}s")
+        if self.error is not None:
+            raise self.error
+        content = self.reply(prompt) if callable(self.reply) else self.reply
+        if (kwargs.get('response_format') or {}).get('type') == 'json_object':
+            content = self._fill_json_template(prompt, content)
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    @staticmethod
+    def _fill_json_template(prompt, content):
+        """Answer JSON-mode prompts by filling the template the prompt asks for."""
+        match = re.search(r"JSON shaped like: (\{.*\})\s*$", prompt, re.S)
+        if not match:
+            return json.dumps({'text': content})
+        template = json.loads(match.group(1))
+
+        def _fill(node):
+            if isinstance(node, dict):
+                return {k: _fill(v) for k, v in node.items()}
+            return content
+        return json.dumps(_fill(template))
+
+    @property
+    def total_prompt_tokens(self):
+        return sum(c['prompt_tokens'] for c in self.calls)
@@ -0,0 +1,198 @@
+"""
+Process pool for CPU-bound analytics (changepoints, correlations, episodes).
+
+Request handlers run in FastAPI's threadpool, and NumPy/pandas work there holds
+the GIL long enough to hold up cheap cache hits on other threads. Jobs sent
+through analytics_pool run in worker processes instead:
+
+- ndarray arguments of SHM_MIN_BYTES or more travel in one shared-memory block
+  per job instead of being pickled; smaller arguments are pickled as usual
+- at most `workers` jobs are in flight, so a job's deadline covers its own run,
+  not time spent queued behind others
+- a job that overruns its deadline is abandoned and the pool restarted, so a
+  stuck worker can't hold a slot; callers get AnalyticsTimeoutError and should
+  degrade rather than retry inline
+
+ANALYTICS_WORKERS=0 (the default on single-core hosts) runs every job inline,
+which is also the fallback when the pool can't be started. Workers are only
+spawned on the first job; with the default "spawn" start method, scripts that
+use the backend need an `if __name__ == "__main__":` guard.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from backend.metrics import ANALYTICS_JOBS
+
+logger = logging.getLogger(__name__)
+
+def _usable_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+# One core is left to the server; on a single-core host there's nothing to offload to
+ANALYTICS_WORKERS = int(os.getenv("ANALYTICS_WORKERS", str(max(0, min(2, _usable_cpus() - 1)))))
+ANALYTICS_TIMEOUT = float(os.getenv("ANALYTICS_TIMEOUT", "10"))
+# "spawn" keeps workers from inheriting the server's threads and locks
+ANALYTICS_START_METHOD = os.getenv("ANALYTICS_START_METHOD", "spawn")
+# Below this an array is cheaper to pickle than to map
+SHM_MIN_BYTES = 64 * 1024
+
+
+class AnalyticsTimeoutError(TimeoutError):
+    """The job ran past its deadline, waited too long for a slot, or lost its worker."""
+
+
+class _Shared:
+    """Stands in for an ndarray argument that lives in the job's shared-memory block."""
+
+    def __init__(self, offset, shape, dtype):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _share(args):
+    """Copy the large ndarray args into one SharedMemory block: (block or None, args with placeholders)."""
+    big = [i for i, a in enumerate(args) if isinstance(a, np.ndarray) and a.nbytes >= SHM_MIN_BYTES]
+    if not big:
+        return None, args
+    offsets, total = {}, 0
+    for i in big:
+        offsets[i] = total
+        total += -(-args[i].nbytes // 64) * 64  # keep every array 64-byte aligned
+    block = shared_memory.SharedMemory(create=True, size=total)
+    shared = list(args)
+    for i in big:
+        array = args[i]
+        np.ndarray(array.shape, array.dtype, buffer=block.buf, offset=offsets[i])[...] = array
+        shared[i] = _Shared(offsets[i], array.shape, array.dtype.str)
+    return block, tuple(shared)
+
+
+def _run_job(fn, block_name, args, kwargs):
+    """Worker side: map the job's block, rebuild the arrays as views and call fn.
+
+    fn must not return (views of) its array arguments; the block is closed before
+    the result is sent back.
+    """
+    if block_name is None:
+        return fn(*args, **kwargs)
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        views = [np.ndarray(a.shape, a.dtype, buffer=block.buf, offset=a.offset) if isinstance(a, _Shared) else a
+                 for a in args]
+        result = fn(*views, **kwargs)
+        del views
+        return result
+    finally:
+        block.close()
+
+
+class AnalyticsPool:
+    """Lazily started process pool with per-job deadlines (see module docstring)."""
+
+    def __init__(self, workers=ANALYTICS_WORKERS, timeout=ANALYTICS_TIMEOUT, start_method=ANALYTICS_START_METHOD):
+        self.workers = workers
+        self.timeout = timeout
+        self.start_method = start_method
+        self._executor = None
+        self._disabled = workers <= 0
+        self._started = False  # has a worker ever come up (finished or was still running a job)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, workers))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and not self._disabled:
+                try:
+                    context = multiprocessing.get_context(self.start_method)
+                    self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+                except (OSError, ValueError, NotImplementedError) as e:
+                    logger.warning("Analytics pool unavailable, running jobs inline: %s", e)
+                    self._disabled = True
+            return self._executor
+
+    def _restart(self, executor):
+        """Drop a pool whose worker overran or died; the next job starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # shutdown() alone would wait for (or leave running) the busy worker
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn, *args, job=None, timeout=None, **kwargs):
+        """fn(*args, **kwargs) in a worker process; fn must be a module-level function.
+
+        Raises AnalyticsTimeoutError past `timeout` seconds (default ANALYTICS_TIMEOUT);
+        exceptions raised by fn itself propagate unchanged.
+        """
+        job = job or fn.__name__
+        timeout = self.timeout if timeout is None else timeout
+        executor = self._get_executor()
+        if executor is None:
+            ANALYTICS_JOBS.inc(job=job, result="inline")
+            return fn(*args, **kwargs)
+
+        if not self._slots.acquire(timeout=timeout):
+            ANALYTICS_JOBS.inc(job=job, result="timeout")
+            raise AnalyticsTimeoutError(f"No analytics worker free for {job} within {timeout}s")
+        block = None
+        try:
+            block, shared_args = _share(args)
+            try:
+                future = executor.submit(_run_job, fn, block and block.name, shared_args, kwargs)
+                result = future.result(timeout=timeout)
+            except TimeoutError:
+                ANALYTICS_JOBS.inc(job=job, result="timeout")
+                logger.warning("Analytics job %s ran past %.1fs; restarting the pool", job, timeout)
+                processes = (getattr(executor, "_processes", None) or {}).values()
+                self._started = self._started or any(p.is_alive() for p in list(processes))
+                self._restart(executor)
+                raise AnalyticsTimeoutError(f"{job} took longer than {timeout}s") from None
+            except BrokenProcessPool as e:
+                with self._lock:
+                    # Terminated by another job's timeout restart, not a startup failure
+                    restarted = self._executor is not executor
+                self._restart(executor)
+                if not self._started and not restarted:
+                    # Workers die on startup when e.g. the main script has no __main__ guard;
+                    # a pool that never worked won't start working, so stop trying
+                    logger.warning("Analytics workers failed to start (%s); running jobs inline", e)
+                    self._disabled = True
+                    ANALYTICS_JOBS.inc(job=job, result="inline")
+                    return fn(*args, **kwargs)
+                ANALYTICS_JOBS.inc(job=job, result="error")
+                raise AnalyticsTimeoutError(f"{job} lost its worker: {e}") from None
+            except Exception:
+                ANALYTICS_JOBS.inc(job=job, result="error")
+                raise
+            self._started = True
+            ANALYTICS_JOBS.inc(job=job, result="ok")
+            return result
+        finally:
+            self._slots.release()
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Create a singleton instance
+analytics_pool = AnalyticsPool()
@@ -0,0 +1,167 @@
+import json
+import math
+import numpy as np
+
+from backend.analytics.trend_analysis import Trendanalyzer
+
+# Roughly what a single series insight should cost us on the prompt side
+DEFAULT_TOKEN_BUDGET = 350
+DEFAULT_MAX_POINTS = 16
+# Latest regimes and largest unusual moves included when changepoints are available
+MAX_SEGMENTS = 4
+MAX_ANOMALIES = 3
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English/numeric text)."""
+    if not text:
+        return 0
+    return int(math.ceil(len(text) / 4))
+
+
+def _fmt(value):
+    """Format a number compactly for the prompt."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if math.isnan(value) or math.isinf(value):
+        return "n/a"
+    if abs(value) >= 1000:
+        return f"{value:,.0f}"
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def _downsample_positions(n, max_points):
+    """Evenly spaced positions into a series of length n (always keeps first and last)."""
+    if n <= max_points:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+
+
+def summarize_series(df, trend_data=None, max_points=DEFAULT_MAX_POINTS, column='value', changepoints=None):
+    """Reduce a series DataFrame to the handful of facts the AI prompt actually needs.
+
+    changepoints (segments/anomalies from analytics.changepoints) adds the latest
+    regimes and the largest unusual moves.
+    """
+    values = df[column].dropna()
+    if values.empty:
+        return None
+    if trend_data is None:
+        trend_data = Trendanalyzer(df, column).compute_trend()
+
+    arr = values.to_numpy(dtype=float)
+    dates = values.index
+    positions = _downsample_positions(len(arr), max_points)
+    hi = int(np.argmax(arr))
+    lo = int(np.argmin(arr))
+
+    def _date(i):
+        d = dates[i]
+        return d.strftime('%Y-%m-%d') if hasattr(d, 'strftime') else str(d)[:10]
+
+    return {
+        'start': _date(0),
+        'end': _date(len(arr) - 1),
+        'observations': len(arr),
+        'direction': str(trend_data.get('direction', '')).strip(),
+        'pct_change': trend_data.get('pct_change'),
+        'volatility': trend_data.get('volatility'),
+        'num_peaks': trend_data.get('num_peaks'),
+        'num_troughs': trend_data.get('num_troughs'),
+        'high': (_date(hi), arr[hi]),
+        'low': (_date(lo), arr[lo]),
+        'points': [(_date(i), arr[i]) for i in positions],
+        'segments': (changepoints or {}).get('segments', [])[-MAX_SEGMENTS:],
+        'anomalies': sorted((changepoints or {}).get('anomalies', []), key=lambda a: -abs(a['z']))[:MAX_ANOMALIES],
+    }
+
+
+def _max_points(changepoints):
+    # Segments already describe the shape, so fewer raw points are needed
+    return DEFAULT_MAX_POINTS // 2 if changepoints and changepoints.get('segments') else DEFAULT_MAX_POINTS
+
+
+def _render_series_block(summary, series_name):
+    points = ", ".join(f"{d} {_fmt(v)}" for d, v in summary['points'])
+    block = (
+        f"Series: {series_name}\n"
+        f"Period: {summary['start']} to {summary['end']} ({summary['observations']} observations)\n"
+        f"Trend: {summary['direction']}, change {_fmt(summary['pct_change'])}%, "
+        f"volatility {_fmt(summary['volatility'])}, "
+        f"{summary['num_peaks']} local peaks / {summary['num_troughs']} troughs\n"
+        f"High: {_fmt(summary['high'][1])} on {summary['high'][0]}; "
+        f"Low: {_fmt(summary['low'][1])} on {summary['low'][0]}\n"
+        f"Key points: {points}"
+    )
+    if summary.get('segments'):
+        regimes = "; ".join(f"{seg['direction']} {seg['start']} to {seg['end']} ({_fmt(seg['slope_per_year'])}/yr)"
+                            for seg in summary['segments'])
+        block += f"\nRegimes: {regimes}"
+    if summary.get('anomalies'):
+        moves = ", ".join(f"{a['date']} {_fmt(a['change'])} (z {_fmt(a['z'])})" for a in summary['anomalies'])
+        block += f"\nUnusual moves: {moves}"
+    return block
+
+
+def _render_series_prompt(summary, series_name):
+    return (
+        "Provide a concise, professional summary (3-4 sentences) of this economic series.\n"
+        + _render_series_block(summary, series_name)
+    )
+
+
+def build_series_prompt(df, series_name, trend_data=None, token_budget=DEFAULT_TOKEN_BUDGET, changepoints=None):
+    """Build a compact insight prompt for one series that fits within token_budget."""
+    max_points = _max_points(changepoints)
+    summary = summarize_series(df, trend_data, max_points, changepoints=changepoints)
+    if summary is None:
+        return f"Provide a concise, professional summary of the {series_name} series. No observations are available."
+
+    prompt = _render_series_prompt(summary, series_name)
+    # Halve the number of key points until we're under budget (extrema and trend always stay)
+    while estimate_tokens(prompt) > token_budget and max_points > 2:
+        max_points = max(2, max_points // 2)
+        summary['points'] = [summary['points'][i] for i in _downsample_positions(len(summary['points']), max_points)]
+        prompt = _render_series_prompt(summary, series_name)
+    return prompt
+
+
+def build_batch_prompt(series_data, context, token_budget=DEFAULT_TOKEN_BUDGET * 6):
+    """Build one prompt covering every series plus the overall assessment.
+
+    series_data maps series name -> (DataFrame, trend_data, changepoints). The model is
+    asked to answer with a JSON object so the reply can be split back into per-series text.
+    """
+    names = list(series_data)
+    max_points = DEFAULT_MAX_POINTS
+    summaries = {}
+    for name, (df, trend_data, changepoints) in series_data.items():
+        summary = summarize_series(df, trend_data, _max_points(changepoints), changepoints=changepoints)
+        if summary is not None:
+            summaries[name] = summary
+
+    template = json.dumps({'series': {name: '...' for name in names}, 'overall': '...'})
+
+    def _render():
+        blocks = "\n\n".join(_render_series_block(summ, name) for name, summ in summaries.items())
+        return (
+            "You are an economist. For each U.S. economic series below, write a concise, professional "
+            "summary (2-3 sentences). Then write an overall assessment of U.S. economic health in 4-6 "
+            "sentences using the composite health score and latest metrics. Weigh GDP growth, unemployment, "
+            "inflation vs the 2% target, Fed Funds stance, consumer spending (PCE) and yield curve (10Y-3M) "
+            "inversions. Keep the tone neutral; no predictions, just assessment.\n\n"
+            f"{blocks}\n\n"
+            f"Composite Health: {context.get('health_percent')}%\n"
+            f"Metrics (latest): {context.get('metrics')}\n\n"
+            f"Respond with JSON shaped like: {template}"
+        )
+
+    prompt = _render()
+    while estimate_tokens(prompt) > token_budget and max_points > 2:
+        max_points = max(2, max_points // 2)
+        for summ in summaries.values():
+            summ['points'] = [summ['points'][i] for i in _downsample_positions(len(summ['points']), max_points)]
+        prompt = _render()
+    return prompt
@@ -1,9 +1,26 @@
-import pandas as pd
+import logging
+
 import numpy as np
-from scipy.signal import argrelextrema #this is to find local maxima and minima
+
+logger = logging.getLogger(__name__)
+
+def local_extrema(values):
+    """Indices of strict local maxima and minima (same as scipy's argrelextrema with order=1).
+
+    NumPy only, so importing this module doesn't pull in SciPy. Endpoints and
+    flat tops/bottoms don't count, and NaNs never compare as extrema.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 3:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    mid, left, right = values[1:-1], values[:-2], values[2:]
+    maxima = np.flatnonzero((mid > left) & (mid > right)) + 1
+    minima = np.flatnonzero((mid < left) & (mid < right)) + 1
+    return maxima, minima
 
 class Trendanalyzer:
-    def __init__(self, df: pd.DataFrame, column='value'):
+    def __init__(self, df, column='value'): # df is a pandas DataFrame
         self.df = df # THE DATA FRAM --> ALL THE DATA
         self.column = column
         self.series = df[column] # list of numeric values 
@@ -15,12 +32,14 @@ class Trendanalyzer:
         direction = 'upward' if slope > 0 else 'downward' if slope < 0 else ' flat'
 
         pct_change = ((self.series.iloc[-1] - self.series.iloc[0])/self.series.iloc[0]) * 100
-        print(f"percent change: {pct_change}")
-        volatility = self.series.pct_change().std()*100 #std is standard deviation
-        print(f"Volatility: {volatility}")
+        logger.debug("percent change: %s", pct_change)
+        # Steps from exactly zero are infinite percent changes; leave them out rather than poison the std
+        volatility = self.series.pct_change().replace([np.inf, -np.inf], np.nan).std()*100 #std is standard deviation
+        logger.debug("Volatility: %s", volatility)
 
-        local_max = self.df.iloc[argrelextrema(self.series.values, np.greater)[0]]
-        local_min = self.df.iloc[argrelextrema(self.series.values, np.less)[0]]
+        max_idx, min_idx = local_extrema(self.series.values)
+        local_max = self.df.iloc[max_idx]
+        local_min = self.df.iloc[min_idx]
 
         return {
             'direction': direction,
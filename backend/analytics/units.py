@@ -0,0 +1,95 @@
+"""
+FRED unit transformations, computed locally from `lin` observations.
+
+Same definitions as FRED's `units` parameter (n = observations per year):
+
+    lin  levels                                  x(t)
+    chg  change                                  x(t) - x(t-1)
+    ch1  change from a year ago                  x(t) - x(t-1y)
+    pch  percent change                          (x(t) / x(t-1) - 1) * 100
+    pc1  percent change from a year ago          (x(t) / x(t-1y) - 1) * 100
+    pca  compounded annual rate of change        ((x(t) / x(t-1)) ** n - 1) * 100
+    cch  continuously compounded rate of change  (ln x(t) - ln x(t-1)) * 100
+    cca  continuously compounded annual rate     (ln x(t) - ln x(t-1)) * 100 * n
+    log  natural log                             ln x(t)
+
+Values that can't be computed (first observations, no year-ago value, logs of
+non-positive numbers) come back as NaN.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+UNITS = ("lin", "chg", "ch1", "pch", "pc1", "pca", "cch", "cca", "log")
+
+PERIODS_PER_YEAR = {"d": 260, "w": 52, "bw": 26, "m": 12, "q": 4, "sa": 2, "a": 1}
+
+# Longest gap between consecutive observations, in days (how far back one period reaches)
+PERIOD_DAYS = {"d": 7, "w": 7, "bw": 14, "m": 31, "q": 92, "sa": 184, "a": 366}
+
+# How far before the year-ago date an observation may be and still count (weekends/holidays for daily data)
+YEAR_AGO_TOLERANCE = {"d": 6, "w": 6, "bw": 13}
+
+
+def _year_ago(dates, values, frequency):
+    """Value observed one year before each date (NaN if there isn't one)."""
+    months = dates.astype("datetime64[M]")
+    day_in_month = dates - months.astype("datetime64[D]")
+    target = (months - 12).astype("datetime64[D]") + day_in_month
+    idx = np.searchsorted(dates, target, side="right") - 1
+    found = idx >= 0
+    idx = np.where(found, idx, 0)
+    tolerance = YEAR_AGO_TOLERANCE.get(frequency, 0)
+    found &= (target - dates[idx]).astype(np.int64) <= tolerance
+    return np.where(found, values[idx], np.nan)
+
+
+def transform(dates, values, units, frequency="m"):
+    """Apply a FRED `units` transformation to date-sorted observations.
+
+    dates: datetime64 array (ascending), values: float array; returns a float array.
+    """
+    units = (units or "lin").lower()
+    if units not in UNITS:
+        raise ValueError(f"Unknown units {units!r}; expected one of {', '.join(UNITS)}")
+    values = np.asarray(values, dtype=float)
+    if units == "lin":
+        return values.copy()
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    n = PERIODS_PER_YEAR.get((frequency or "m").lower(), 12)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if units == "log":
+            return np.log(np.where(values > 0, values, np.nan))
+        if units in ("ch1", "pc1"):
+            base = _year_ago(dates, values, (frequency or "m").lower())
+            return values - base if units == "ch1" else (values / base - 1) * 100
+        prev = np.concatenate(([np.nan], values[:-1]))
+        if units == "chg":
+            return values - prev
+        if units == "pch":
+            return (values / prev - 1) * 100
+        if units == "pca":
+            return ((values / prev) ** n - 1) * 100
+        log_change = np.log(np.where(values > 0, values, np.nan)) - np.log(np.where(prev > 0, prev, np.nan))
+        return log_change * 100 if units == "cch" else log_change * 100 * n
+
+
+def lookback_start(start_date, units, frequency="m"):
+    """Earliest date whose observations are needed to transform data from start_date on."""
+    units = (units or "lin").lower()
+    if units in ("lin", "log"):
+        return start_date
+    days = PERIOD_DAYS.get((frequency or "m").lower(), 31)
+    if units in ("ch1", "pc1"):
+        days = 366 + YEAR_AGO_TOLERANCE.get((frequency or "m").lower(), 0)
+    return (date.fromisoformat(start_date) - timedelta(days=days)).isoformat()
+
+
+def transform_values(value_map, units, frequency="m"):
+    """{date string: value} -> {date string: transformed value or None}, sorted by date."""
+    keys = sorted(value_map)
+    dates = np.array([k[:10] for k in keys], dtype="datetime64[D]")
+    values = np.array([np.nan if value_map[k] is None else value_map[k] for k in keys], dtype=float)
+    transformed = transform(dates, values, units, frequency)
+    return {k: (None if np.isnan(v) else float(v)) for k, v in zip(keys, transformed.tolist())}
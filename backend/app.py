@@ -1,6 +1,13 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from backend.series.unemployment import UnemploymentSeries
 from backend.series.cpi import CPISeries
 from backend.series.fed_funds import FedFundsSeries
@@ -8,13 +15,30 @@ from backend.series.gdp import GDPSeries
 from backend.series.pce import PCESeries
 from backend.series.t10y3m import T10Y3MSeries
 from backend.series.nasdaq import NASDAQSeries
+from backend.series import base_series
+from backend.series.metadata import series_metadata
 from backend.analytics.trend_analysis import Trendanalyzer
-from backend.analytics.insights import generate_insight, generate_ai_insight, generate_overall_ai_insight
-from backend.cache import backend_cache
+from backend.analytics.insights import generate_insight, generate_ai_insight, generate_overall_ai_insight, generate_batch_ai_insights, is_fallback_insight
+from backend.analytics.health_score import compute_health, health_history
+from backend.analytics.units import UNITS, lookback_start, transform_values
+from backend.analytics.correlations import analyze as analyze_correlations, lead_lag_summary
+from backend.analytics.episodes import EPISODE_RULES, EpisodeIndex, detect_all
+from backend.analytics.changepoints import analyze as analyze_changepoints
+from backend.analytics.pool import analytics_pool, AnalyticsTimeoutError
+from backend.cache import backend_cache, BackendCache
+from backend.metrics import registry, span, HTTP_REQUEST_SECONDS
 
+import hashlib
 import json
 import math
 
+# LOG_LEVEL=DEBUG brings back the per-lookup cache/insight chatter
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
 def _sanitize_for_json(obj):
     """Recursively replace NaN/Inf with None so JSON serialization succeeds."""
     if isinstance(obj, float):
@@ -27,7 +51,39 @@ def _sanitize_for_json(obj):
         return [_sanitize_for_json(v) for v in obj]
     return obj
 
-app = FastAPI(title="Economic Trends Dashboard API")
+@asynccontextmanager
+async def lifespan(app):
+    # Warm the metadata cache in the background so startup isn't held up by FRED
+    if base_series.FRED_KEY and os.getenv("PREFETCH_METADATA", "1") != "0":
+        threading.Thread(target=series_metadata.prefetch, args=(list(series_map.values()),),
+                         name="metadata-prefetch", daemon=True).start()
+    yield
+    analytics_pool.shutdown()
+
+app = FastAPI(title="Economic Trends Dashboard API", lifespan=lifespan)
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Latency histogram per route template (not raw path, so series names don't explode cardinality)."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Counters and latency histograms in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def root():
@@ -68,87 +124,324 @@ series_map = {
     "t10y3m": T10Y3MSeries,
     "nasdaq": NASDAQSeries
 }
+# Series that feed the composite health score
+HEALTH_SERIES = ["gdp", "cpi", "unemployment", "fedfunds", "pce", "t10y3m"]
 # uvicorn app:app --reload to run application
 # 
+def _frame_from_payload(payload):
+    """Rebuild the observations DataFrame from a /series payload (fresh or cached)."""
+    import pandas as pd
+    df = pd.DataFrame(payload.get('data') or {})
+    if df.empty or 'value' not in df:
+        return None
+    df.index = pd.to_datetime(df.index)
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    return df.sort_index()
+
+
+def _assemble_series_payload(series_name, entry, include_ai, df=None):
+    """Combine cached observations with their derived layers (trend, changepoints, insight, AI insight).
+
+    Each layer is cached separately under the observation version, so it is computed
+    once per distinct dataset and shared by every date range that returns the same data.
+    Legacy entries that bundled trend/insight inline are migrated into the layers on read.
+    """
+    data_dict = entry['data']
+    version = entry.get('version') or backend_cache.observation_version(data_dict)
+    key = f"{series_name}_{version}"
+    units = entry.get('units', 'lin')
+    # Insight text should say which view it describes
+    label = series_name if units == 'lin' else f"{series_name} ({units})"
+
+    trend_data = backend_cache.get_artifact('trend', key)
+    if trend_data is None:
+        trend_data = entry.get('trend')
+        if trend_data is None:
+            df = df if df is not None else _frame_from_payload(entry)
+            with span("trend", series_name):
+                trend_data = _sanitize_for_json(Trendanalyzer(df).compute_trend())
+        backend_cache.set_artifact('trend', key, trend_data)
+
+    changepoints = backend_cache.get_artifact('changepoints', key)
+    if changepoints is None:
+        frequency = entry.get('frequency') or series_map[series_name].frequency
+        try:
+            with span("changepoints", series_name):
+                dates, values = _observation_arrays(data_dict.get('value', {}))
+                changepoints = _sanitize_for_json(
+                    analytics_pool.run(analyze_changepoints, dates, values, frequency, job="changepoints"))
+            backend_cache.set_artifact('changepoints', key, changepoints)
+        except AnalyticsTimeoutError as e:
+            # Serve everything else now; the layer (and the text built on it) is retried next request
+            logger.warning("Changepoints skipped for %s: %s", series_name, e)
+
+    insight = backend_cache.get_artifact('insight', key)
+    if insight is None:
+        insight = entry.get('insight') or generate_insight(trend_data, label, changepoints)
+        if changepoints is not None:
+            backend_cache.set_artifact('insight', key, insight)
+
+    # A missing AI layer now just means "not generated yet", never "AI was off"
+    ai_insight = backend_cache.get_artifact('ai_insight', key)
+    if ai_insight is None and not is_fallback_insight(entry.get('ai_insight')):
+        ai_insight = entry['ai_insight']
+        backend_cache.set_artifact('ai_insight', key, ai_insight)
+    if ai_insight is None and include_ai:
+        try:
+            df = df if df is not None else _frame_from_payload(entry)
+            ai_insight = generate_ai_insight(df, label, trend_data, changepoints)
+            if not is_fallback_insight(ai_insight) and changepoints is not None:
+                backend_cache.set_artifact('ai_insight', key, ai_insight)
+        except Exception as e:
+            logger.warning("AI insight failed for %s: %s", series_name, e)
+            ai_insight = f"AI insights temporarily unavailable for {series_name}."
+
+    return {
+        "data": data_dict,
+        "trend": trend_data,
+        "changepoints": changepoints,
+        "insight": insight,
+        "ai_insight": ai_insight,
+        "frequency": entry.get('frequency'),
+        "units": units,
+        "version": version,
+    }
+
+
+def _observation_arrays(value_map):
+    """{date string: value} -> (datetime64[D] dates, float values), date-sorted, missing values dropped."""
+    import numpy as np
+    keys = sorted(value_map)
+    dates = np.array([k[:10] for k in keys], dtype="datetime64[D]")
+    values = np.array([np.nan if value_map[k] is None else value_map[k] for k in keys], dtype=float)
+    keep = np.isfinite(values)
+    return dates[keep], values[keep]
+
+
+# Default for _load_observations' `cached`: nothing has been looked up yet
+_NOT_LOOKED_UP = object()
+
+
+def _revalidate(series_name, entry):
+    """An expired entry is kept if FRED's last_updated hasn't moved since it was fetched"""
+    return series_metadata.is_unchanged(series_map[series_name], entry)
+
+
+def _lookup_observations(requests):
+    """Cached `lin` entries (or None) for [(series_name, start, end)], with one shared-tier round trip for all of them."""
+    with span("cache_lookup", "batch"):
+        return backend_cache.get_many([(name, start, end, series_map[name].frequency) for name, start, end in requests],
+                                      revalidate=_revalidate, units="lin")
+
+
+def _load_observations(series_name, start, end, use_cache=True, cache_name=None, refresh=None, cached=_NOT_LOOKED_UP):
+    """`lin` observations entry for a range, cache-first; returns (entry, DataFrame or None).
+
+    The DataFrame is only returned after a fresh FRED fetch (cached entries are rebuilt lazily).
+    cache_name stores the entry under another name, so it never answers covering lookups for series_name.
+    refresh (default: not use_cache) makes that fetch revalidate even a recently stored raw response.
+    cached is what _lookup_observations already returned for this range (None on a miss).
+    """
+    series_class = series_map[series_name]
+    cache_name = cache_name or series_name
+    store = use_cache
+    if use_cache:
+        cached_data = cached
+        if cached_data is _NOT_LOOKED_UP:
+            # Frequency-aware cache key straight from the class metadata (no instance, no I/O).
+            # Pinned to units="lin": story data seeded in other FRED units (e.g. pc1 CPI) can't answer,
+            # so the dashboard never gets percent changes back as levels
+            with span("cache_lookup", series_name):
+                cached_data = backend_cache.get(cache_name, start, end, series_class.frequency,
+                                                revalidate=lambda entry: _revalidate(series_name, entry), units="lin")
+        if cached_data:
+            # For NASDAQ, if cache has data but date range doesn't match exactly, 
+            # we'll return it anyway and let frontend filter
+            return cached_data, None
+        # For NASDAQ, don't try to fetch from FRED if cache is not available
+        # Just return an error so frontend can handle gracefully
+        if series_name == 'nasdaq':
+            raise HTTPException(
+                status_code=404, 
+                detail=f"NASDAQ data not available in cache for date range {start} to {end}. Please ensure cache file exists."
+            )
+        logger.info("Cache miss for %s %s..%s, fetching from FRED", series_name, start, end)
+        if backend_cache.exact_units(cache_name, start, end, series_class.frequency) not in (None, "lin"):
+            # Exactly this range is seeded in other units; leave that file alone
+            store = False
+
+    # Fetch fresh data (fred_fetch / parse spans are recorded inside fetch_data)
+    series_instance = series_class(start, end)
+    
+    # use_cache=false (the dashboard's Refresh) revalidates even a recently stored raw response with FRED
+    data = series_instance.fetch_data(refresh=not use_cache if refresh is None else refresh) # raw time value data
+    frequency = series_instance.frequency
+
+    # Observations are cached on their own; trend/insights are derived layers keyed by version.
+    # last_updated is the one recorded with the body fetch_data returned (it may come from the
+    # HTTP cache and predate the current metadata); it never costs a second FRED call
+    last_updated = series_instance.last_updated
+    if store:
+        entry = backend_cache.set_observations(cache_name, start, end, data, frequency, last_updated)
+    else:
+        entry = BackendCache.observations_entry(data, frequency, last_updated)
+    return entry, data
+
+
+def _units_entry(series_name, entry, units, start):
+    """Observations entry converted to FRED `units` locally, from `start` on.
+
+    The full transformed series is memoized as a 'units' artifact per observation
+    version, so switching views never goes back to FRED.
+    """
+    version = entry.get('version') or backend_cache.observation_version(entry['data'])
+    key = f"{series_name}_{version}_{units}"
+    values = backend_cache.get_artifact('units', key)
+    if values is None:
+        frequency = entry.get('frequency') or series_map[series_name].frequency
+        with span("units", series_name):
+            values = transform_values(entry['data'].get('value', {}), units, frequency)
+        backend_cache.set_artifact('units', key, values)
+    data = {'value': {k: v for k, v in values.items() if v is not None and k[:10] >= start}}
+    return {
+        'data': data,
+        'frequency': entry.get('frequency'),
+        'version': backend_cache.observation_version(data),
+        'units': units,
+    }
+
+
+def _fetch_start(series_name, start, units):
+    """Start of the `lin` range that _series_entry loads for `units`"""
+    if units == "lin":
+        return start
+    return lookback_start(start, units, series_map[series_name].frequency)
+
+
+def _series_entry(series_name, start, end, use_cache=True, units="lin", cached=_NOT_LOOKED_UP):
+    """Observations entry in the requested units: (entry, DataFrame or None)."""
+    if units == "lin":
+        return _load_observations(series_name, start, end, use_cache, cached=cached)
+    # Always fetch/cache levels (reaching back far enough for the first change), then transform locally
+    fetch_start = _fetch_start(series_name, start, units)
+    entry, _ = _load_observations(series_name, fetch_start, end, use_cache, cached=cached)
+    return _units_entry(series_name, entry, units, start), None
+
+
+# Aligned resampling: freq -> pandas offset, and the aggregations `how` accepts
+ALIGN_FREQUENCIES = {"d": "D", "w": "W-FRI", "m": "MS", "q": "QS", "a": "YS"}
+ALIGN_METHODS = ("last", "first", "mean", "min", "max", "sum")
+
+
+def _align_frames(values_by_name, freq, how, join):
+    """Resample every {date: value} map onto one `freq` grid and join them into a DataFrame."""
+    import pandas as pd
+
+    columns = []
+    for name, values in values_by_name.items():
+        series = pd.Series(values, dtype=float, name=name)
+        series.index = pd.to_datetime(series.index)
+        bins = series.sort_index().resample(ALIGN_FREQUENCIES[freq])
+        # A plain sum turns empty bins into 0.0, which an outer join would show as real observations
+        columns.append(bins.sum(min_count=1) if how == "sum" else bins.agg(how))
+    frame = pd.concat(columns, axis=1, join=join)
+    return frame.dropna(how="all")
+
+
+@app.get("/series/aligned")
+def aligned_series(names: str, start: str, end: str, freq: str = "m", how: str = "last", join: str = "outer",
+                   units: str = "lin", use_cache: bool = True):
+    """Several series resampled to one date grid and joined, as a columnar matrix.
+
+    values[i] is the column for names[i], aligned with index; gaps are null. Aligned
+    frames are cached by (names, freq, how, join, units, range) and the versions of
+    the underlying observations, so new data invalidates them automatically.
+    """
+    name_list = list(dict.fromkeys(n.strip().lower() for n in names.split(",") if n.strip()))
+    freq, how, join, units = freq.lower(), how.lower(), join.lower(), units.lower()
+    unknown = [n for n in name_list if n not in series_map]
+    if not name_list or unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown series: {', '.join(unknown) or '(none given)'}")
+    if freq not in ALIGN_FREQUENCIES:
+        raise HTTPException(status_code=400, detail=f"freq must be one of {', '.join(ALIGN_FREQUENCIES)}")
+    if how not in ALIGN_METHODS:
+        raise HTTPException(status_code=400, detail=f"how must be one of {', '.join(ALIGN_METHODS)}")
+    if join not in ("outer", "inner"):
+        raise HTTPException(status_code=400, detail="join must be 'outer' or 'inner'")
+    if units not in UNITS:
+        raise HTTPException(status_code=400, detail=f"Unknown units '{units}'; expected one of {', '.join(UNITS)}")
+
+    result = _aligned(name_list, start, end, freq, how, join, units, use_cache)
+    if result["unavailable"]:
+        raise HTTPException(status_code=404,
+                            detail=f"Data unavailable for {', '.join(result['unavailable'])} in {start}..{end}")
+    return result
+
+
+def _aligned(name_list, start, end, freq="m", how="last", join="outer", units="lin", use_cache=True):
+    """Aligned columnar matrix for the series that have data (the rest are listed in `unavailable`)."""
+    entries, unavailable = {}, []
+    known = [name for name in name_list if name in series_map]
+    cached = {}
+    if use_cache:
+        cached = dict(zip(known, _lookup_observations([(name, _fetch_start(name, start, units), end) for name in known])))
+    for name in name_list:
+        try:
+            entries[name], _ = _series_entry(name, start, end, use_cache, units, cached.get(name, _NOT_LOOKED_UP))
+        except Exception as e:
+            logger.info("aligned: %s unavailable: %s", name, e)
+            unavailable.append(name)
+    names = list(entries)
+
+    versions = {name: entry.get('version') or backend_cache.observation_version(entry['data'])
+                for name, entry in entries.items()}
+    # "sum-nan": frames cached before empty sum bins became null had zeros in them
+    key_source = json.dumps([names, freq, how, join, units, start, end, versions, "sum-nan"])
+    key = hashlib.md5(key_source.encode()).hexdigest()[:16]
+    if use_cache:
+        cached = backend_cache.get_artifact('aligned', key)
+        if cached is not None:
+            return dict(cached, unavailable=unavailable)
+
+    result = {"names": names, "freq": freq, "how": how, "join": join, "units": units,
+              "index": [], "values": [], "versions": versions, "key": key}
+    if names:
+        with span("align", ",".join(names)):
+            frame = _align_frames({name: entry['data'].get('value', {}) for name, entry in entries.items()},
+                                  freq, how, join)
+            matrix = frame.to_numpy(dtype=float)
+            result = _sanitize_for_json(dict(result,
+                index=frame.index.strftime("%Y-%m-%d").tolist(),
+                values=[matrix[:, i].tolist() for i in range(matrix.shape[1])],
+            ))
+    if use_cache:
+        backend_cache.set_artifact('aligned', key, result)
+    return dict(result, unavailable=unavailable)
+
+
+# Must stay below /series/aligned, or "aligned" would be taken for a series name
 @app.get("/series/{series_name}")
-def get_series(series_name: str, start: str, end: str, include_ai: bool = True, use_cache: bool = True):
+def get_series(series_name: str, start: str, end: str, include_ai: bool = True, use_cache: bool = True,
+               units: str = "lin"):
+    units = units.lower()
+    if units not in UNITS:
+        raise HTTPException(status_code=400, detail=f"Unknown units '{units}'; expected one of {', '.join(UNITS)}")
     try:
         if series_name.lower() not in series_map:
             raise HTTPException(status_code=404, detail="Series not found")
-        
-        # Check cache first
-        if use_cache:
-            # Try to use frequency-aware cache key by peeking frequency from class
-            series_class = series_map[series_name.lower()]
-            series_instance_for_freq = series_class(start, end)
-            freq = getattr(series_instance_for_freq, 'frequency', '')
-            cached_data = backend_cache.get(series_name.lower(), start, end, freq)
-            if cached_data:
-                print(f"Returning cached data for {series_name}")
-                # For NASDAQ, if cache has data but date range doesn't match exactly, 
-                # we'll return it anyway and let frontend filter
-                return _sanitize_for_json(cached_data)
-            else:
-                print(f"No cache found for {series_name}")
-                # For NASDAQ, don't try to fetch from FRED if cache is not available
-                # Just return an error so frontend can handle gracefully
-                if series_name.lower() == 'nasdaq':
-                    raise HTTPException(
-                        status_code=404, 
-                        detail=f"NASDAQ data not available in cache for date range {start} to {end}. Please ensure cache file exists."
-                    )
-                print(f"Fetching fresh data for {series_name}")
-        
-        # Fetch fresh data
-        series_class = series_map[series_name.lower()]
-        series_instance = series_class(start, end)
-        
-        data = series_instance.fetch_data() # raw time value data
-         # Convert DataFrame to dict for JSON response
-        data_dict = data.to_dict()  # this works because data is a DataFrame
-        
-        # Convert Timestamp objects to strings for JSON serialization
-        for col in data_dict:
-            if isinstance(data_dict[col], dict):
-                data_dict[col] = {str(k): v for k, v in data_dict[col].items()}
+        series_name = series_name.lower()
 
-        # Compute trend
-        trend_data = Trendanalyzer(data).compute_trend() # returns a dict of trends, cause FASTAPI must return a dict
-
-        # Basic insights (always fast)
-        insight = generate_insight(trend_data, series_name)
-        
-        # AI insights (optional and slow)
-        ai_insight = None
-        if include_ai:
-            try:
-                ai_insight = generate_ai_insight(data, series_name)
-            except Exception as e:
-                print(f"AI insight failed for {series_name}: {e}")
-                ai_insight = f"AI insights temporarily unavailable for {series_name}."
-
-        # Include basic frequency metadata for frontend caching
-        result = {
-            "data": data_dict,
-            "trend": trend_data, # already a dict
-            "insight": insight,
-            "ai_insight": ai_insight,
-            "frequency": getattr(series_instance, 'frequency', None)
-        }
-        result = _sanitize_for_json(result)
-        
-        # Cache the result
-        if use_cache:
-            print(f"Caching fresh data for {series_name}")
-            backend_cache.set(series_name.lower(), start, end, result, getattr(series_instance, 'frequency', ''))
-        
-        return result
+        entry, df = _series_entry(series_name, start, end, use_cache, units)
+        payload = _assemble_series_payload(series_name, entry, include_ai, df=df)
+        with span("serialize", series_name):
+            return _sanitize_for_json(payload)
 
     except Exception as e:
-        import traceback
         error_msg = str(e)
-        print("ERROR:", error_msg)
-        traceback.print_exc()
+        if isinstance(e, HTTPException):
+            logger.info("get_series %s: %s", series_name, error_msg)
+        else:
+            logger.exception("get_series failed for %s: %s", series_name, error_msg)
         
         # Check if it's a FRED API error (404 series not found)
         if "404" in error_msg or "Series not found" in error_msg:
@@ -157,17 +450,106 @@ def get_series(series_name: str, start: str, end: str, include_ai: bool = True,
         
         raise HTTPException(status_code=500, detail=error_msg)
 
+@app.get("/series/{series_name}/meta")
+def get_series_meta(series_name: str):
+    """FRED metadata (title, units, seasonal adjustment, last_updated, ...) and axis labels, cached."""
+    series_class = series_map.get(series_name.lower())
+    if series_class is None:
+        raise HTTPException(status_code=404, detail="Series not found")
+    return _sanitize_for_json({
+        "name": series_name.lower(),
+        **series_class.metadata(),
+        "fred": series_metadata.get(series_class),
+        "labels": series_metadata.axis_labels(series_class),
+    })
+
+# Episodes are detected over each series' full history, cached as "{name}_history" so that
+# file never answers covering lookups for dashboard ranges
+EPISODE_HISTORY_START = os.getenv("EPISODE_HISTORY_START", "1970-01-01")
+EPISODE_HISTORY_END = "9999-12-31"  # FRED's default observation_end: everything available
+# How long an in-memory index is served before the history entry is looked at again
+EPISODE_RECHECK = int(os.getenv("EPISODE_RECHECK", str(15 * 60)))
+_episode_indexes = {}  # series name -> (checked_at, version, EpisodeIndex)
+_episode_lock = threading.Lock()
+
+
+def _episode_index(series_name, use_cache=True):
+    """(EpisodeIndex, version) over the series' full history; detection reruns only when the data changes."""
+    series_class = series_map[series_name]
+    rules = EPISODE_RULES[series_name]
+    with _episode_lock:
+        held = _episode_indexes.get(series_name)
+    if use_cache and held and time.time() - held[0] < EPISODE_RECHECK:
+        return held[2], held[1]
+
+    entry, _ = _load_observations(series_name, EPISODE_HISTORY_START, EPISODE_HISTORY_END, use_cache,
+                                  cache_name=f"{series_name}_history")
+    version = entry.get('version') or backend_cache.observation_version(entry['data'])
+    if held and held[1] == version:
+        index = held[2]
+    else:
+        rules_hash = hashlib.md5(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:8]
+        key = f"{series_name}_{version}_{rules_hash}"
+        episodes = backend_cache.get_artifact('episodes', key) if use_cache else None
+        if episodes is None:
+            with span("episodes", series_name):
+                dates, values = _observation_arrays(entry['data'].get('value', {}))
+                episodes = analytics_pool.run(detect_all, dates, values, rules,
+                                              entry.get('frequency') or series_class.frequency, job="episodes")
+            backend_cache.set_artifact('episodes', key, episodes)
+        index = EpisodeIndex(episodes)
+    with _episode_lock:
+        _episode_indexes[series_name] = (time.time(), version, index)
+    return index, version
+
+
+@app.get("/series/{series_name}/episodes")
+def get_series_episodes(series_name: str, start: str = None, end: str = None, rule: str = None,
+                        use_cache: bool = True):
+    """Regime episodes (yield curve inversions, high inflation, Sahm rule, ...) overlapping start..end.
+
+    Served from an index built once per data version over the series' full history,
+    so any date range is answered without touching the observations.
+    """
+    series_name = series_name.lower()
+    if series_name not in series_map:
+        raise HTTPException(status_code=404, detail="Series not found")
+    rules = EPISODE_RULES.get(series_name)
+    if not rules:
+        raise HTTPException(status_code=404, detail=f"No episode rules defined for {series_name}")
+    if rule and rule not in {r["rule"] for r in rules}:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown rule '{rule}'; expected one of {', '.join(r['rule'] for r in rules)}")
+    try:
+        index, version = _episode_index(series_name, use_cache)
+    except HTTPException:
+        raise
+    except AnalyticsTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.exception("Episode detection failed for %s: %s", series_name, e)
+        raise HTTPException(status_code=500, detail=str(e))
+    return _sanitize_for_json({
+        "name": series_name,
+        "rules": [{k: r[k] for k in ("rule", "label", "signal", "op", "threshold")} for r in rules],
+        "episodes": index.query(start, end, rule),
+        "active": index.active(),
+        "version": version,
+    })
+
 @app.post("/cache/clear")
 def clear_cache():
     """Clear all cached data"""
     backend_cache.clear()
+    base_series.fred_http_cache.clear()
+    series_metadata.clear()
+    with _episode_lock:
+        _episode_indexes.clear()
     return {"message": "Cache cleared successfully"}
 
 @app.get("/health")
 def health_check():
     """Simple health check endpoint"""
-    import time
-    import os
     return {
         "status": "healthy", 
         "message": "Backend is running",
@@ -179,8 +561,6 @@ def health_check():
 @app.get("/cache/stats")
 def cache_stats():
     """Get cache statistics"""
-    import time
-    import json
     
     cache_files = list(backend_cache.cache_dir.glob("*.json"))
     current_time = time.time()
@@ -220,10 +600,135 @@ def cache_stats():
         "size": total_size,
         "oldestCache": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(oldest_time)) if oldest_time else 'None',
         "newestCache": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(newest_time)) if newest_time else 'None',
-        "cacheDuration": f"{backend_cache.cache_duration // 3600} hours"
+        "cacheDuration": f"{backend_cache.cache_duration // 3600} hours",
+        "sharedBackend": backend_cache.shared.name if backend_cache.shared is not None else None,
     }
 
 
+def _load_dashboard_frames(start, end, use_cache=True, names=None, refresh=None):
+    """Observations (cache-first) for the dashboard series: ({name: DataFrame}, {name: payload}).
+
+    refresh is passed on to _load_observations.
+    """
+    frames = {}
+    payloads = {}
+    names = names or HEALTH_SERIES
+    cached = {}
+    if use_cache:
+        # One shared-tier round trip for whatever this instance hasn't cached yet
+        cached = dict(zip(names, _lookup_observations([(s, start, end) for s in names])))
+    for s in names:
+        try:
+            entry, df = _load_observations(s, start, end, use_cache, refresh=refresh,
+                                           cached=cached.get(s, _NOT_LOOKED_UP))
+            payload = _sanitize_for_json(_assemble_series_payload(s, entry, False, df=df))
+        except HTTPException as e:
+            logger.warning("Skipping %s: %s", s, e.detail)
+            continue
+        except Exception as e:
+            logger.warning("Skipping %s: %s", s, e)
+            continue
+        df = _frame_from_payload(payload)
+        if df is None or df.empty:
+            continue
+        payloads[s] = payload
+        frames[s] = df
+    if use_cache:
+        _schedule_precompute(start, end)
+    return frames, payloads
+
+
+# Background precompute of cross-series analytics for windows the dashboard has loaded
+_precompute_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="precompute")
+_precompute_pending = set()
+_precompute_lock = threading.Lock()
+
+
+def _schedule_precompute(start, end):
+    """Queue the correlation matrix for this window and any missing episode indexes (once per window while pending)."""
+    if os.getenv("PRECOMPUTE_ANALYTICS", "1") == "0":
+        return
+    with _precompute_lock:
+        if (start, end) in _precompute_pending:
+            return
+        _precompute_pending.add((start, end))
+
+    def run():
+        try:
+            _correlations(start, end)
+        except Exception as e:
+            logger.warning("Correlation precompute failed for %s..%s: %s", start, end, e)
+        try:
+            for name in EPISODE_RULES:
+                if name not in _episode_indexes:
+                    _episode_index(name)
+        except Exception as e:
+            logger.warning("Episode index precompute failed: %s", e)
+        finally:
+            with _precompute_lock:
+                _precompute_pending.discard((start, end))
+
+    _precompute_pool.submit(run)
+
+
+def _correlations(start, end, max_lag=24, units="lin", min_overlap=24, use_cache=True):
+    """Correlation matrix and lead-lag profiles for every series_map series on the monthly grid.
+
+    Cached per aligned-data key (which includes every observation version) and parameters.
+    """
+    import numpy as np
+
+    aligned = _aligned(list(series_map), start, end, "m", "mean", "outer", units, use_cache)
+    key = hashlib.md5(json.dumps([aligned["key"], max_lag, min_overlap]).encode()).hexdigest()[:16]
+    if use_cache:
+        cached = backend_cache.get_artifact('correlations', key)
+        if cached is not None:
+            return cached
+
+    names = aligned["names"]
+    started = time.perf_counter()
+    with span("correlations"):
+        matrix = np.array(aligned["values"], dtype=float).T if names else np.empty((0, 0))
+        lags, corr, pearson = analytics_pool.run(analyze_correlations, matrix, max_lag, min_overlap,
+                                                 job="correlations")
+    result = _sanitize_for_json({
+        "names": names,
+        "start": start,
+        "end": end,
+        "freq": "m",
+        "units": units,
+        "periods": len(aligned["index"]),
+        "matrix": pearson.tolist(),
+        "lags": lags.tolist(),
+        "pairs": lead_lag_summary(names, lags, corr),
+        "unavailable": aligned["unavailable"],
+        "versions": aligned["versions"],
+        "compute_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
+    if use_cache:
+        backend_cache.set_artifact('correlations', key, result)
+    return result
+
+
+@app.get("/analytics/correlations")
+def correlations(start: str, end: str, max_lag: int = 24, units: str = "lin", min_overlap: int = 24,
+                 use_cache: bool = True):
+    """Pairwise correlations plus FFT lead-lag profiles (lags -max_lag..max_lag months) for all series.
+
+    A pair's best_lag > 0 means `a` leads `b`; profile[n] is the correlation at lags[n].
+    Normally served from the background precompute the dashboard triggers.
+    """
+    units = units.lower()
+    if units not in UNITS:
+        raise HTTPException(status_code=400, detail=f"Unknown units '{units}'; expected one of {', '.join(UNITS)}")
+    if not 0 <= max_lag <= 120:
+        raise HTTPException(status_code=400, detail="max_lag must be between 0 and 120 months")
+    try:
+        return _correlations(start, end, max_lag, units, max(2, min_overlap), use_cache)
+    except AnalyticsTimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 @app.get("/insights/overall")
 def overall_insight(start: str, end: str, use_cache: bool = True):
     """Compute combined metrics and return an overall AI-generated assessment."""
@@ -233,89 +738,12 @@ def overall_insight(start: str, end: str, use_cache: bool = True):
             cache_key = f"overall_insights_{start}_{end}"
             cached_data = backend_cache.get("overall_insights", start, end, "")
             if cached_data:
-                print(f"Returning cached overall insights")
                 return _sanitize_for_json(cached_data)
-            else:
-                print(f"No cache found for overall insights, generating fresh data")
         
         # Pull series (use cache to be fast)
-        needed = ["gdp", "cpi", "unemployment", "fedfunds", "pce", "t10y3m"]
-        results = {}
-        for s in needed:
-            if s not in series_map:
-                continue
-            series_instance = series_map[s](start, end)
-            df = series_instance.fetch_data()
-            if df is None or df.empty:
-                continue
-            results[s] = df
-
-        def latest_num(df):
-            try:
-                v = df['value'].dropna()
-                if v.empty:
-                    return None
-                return float(v.iloc[-1])
-            except Exception:
-                return None
-
-        def pct_change(df, periods):
-            try:
-                v = df['value'].dropna()
-                if len(v) <= periods:
-                    return None
-                curr = float(v.iloc[-1])
-                prev = float(v.iloc[-1 - periods])
-                if prev == 0:
-                    return None
-                return ((curr - prev) / prev) * 100.0
-            except Exception:
-                return None
-
-        metrics = {
-            'gdp_yoy': pct_change(results.get('gdp'), 4),
-            'cpi_yoy': pct_change(results.get('cpi'), 12),
-            'unemployment': latest_num(results.get('unemployment')),
-            'fedfunds': latest_num(results.get('fedfunds')),
-            'pce_yoy': pct_change(results.get('pce'), 12),
-            't10y3m': latest_num(results.get('t10y3m')),
-        }
-
-        # Simple reimplementation of frontend scoring for consistency
-        import math
-        def clamp01(x):
-            return max(0.0, min(1.0, x)) if x is not None and not math.isnan(x) and not math.isinf(x) else None
-
-        def score_unemp(x):
-            if x is None: return None
-            return clamp01(1 - min(1, abs(x - 4) / 4))
-        def score_gdp(x):
-            if x is None: return None
-            return clamp01((x - (-2)) / 8)
-        def score_cpi(x):
-            if x is None: return None
-            return clamp01(1 - min(1, abs(x - 2) / 4))
-        def score_fed(x):
-            if x is None: return None
-            d = 2 - x if x < 2 else x - 4 if x > 4 else 0
-            return clamp01(1 - min(1, d / 4))
-        def score_pce(x):
-            if x is None: return None
-            return clamp01((x - 0) / 6)
-        def score_spread(x):
-            if x is None: return None
-            return clamp01((x - (-1)) / 3)
-
-        scores = [
-            score_gdp(metrics['gdp_yoy']),
-            score_unemp(metrics['unemployment']),
-            score_cpi(metrics['cpi_yoy']),
-            score_fed(metrics['fedfunds']),
-            score_pce(metrics['pce_yoy']),
-            score_spread(metrics['t10y3m'])
-        ]
-        scores = [s for s in scores if s is not None]
-        health_percent = round((sum(scores) / len(scores)) * 100) if scores else None
+        results, payloads = _load_dashboard_frames(start, end, use_cache)
+        versions = {name: p.get('version') for name, p in payloads.items()}
+        health_percent, metrics = compute_health(results, versions)
 
         context = _sanitize_for_json({
             'health_percent': health_percent,
@@ -327,10 +755,60 @@ def overall_insight(start: str, end: str, use_cache: bool = True):
         
         # Cache the result
         if use_cache:
-            print(f"Caching overall insights")
             backend_cache.set("overall_insights", start, end, result, "")
         
         return result
     except Exception as e:
-        print("Overall insight error:", e)
+        logger.exception("Overall insight error: %s", e)
         return _sanitize_for_json({ 'health_percent': None, 'metrics': {}, 'ai_insight': 'Overall AI insight temporarily unavailable.' })
+
+
+@app.get("/insights/batch")
+def batch_insights(start: str, end: str, use_cache: bool = True):
+    """All dashboard AI narratives (per-series and overall) from a single OpenAI request.
+
+    use_cache=false skips (and doesn't write) the cached narratives. The dashboard's Refresh
+    has just refetched every series through /series, so the raw FRED responses stored
+    then are reused here instead of downloading them all again.
+    """
+    frames, payloads = _load_dashboard_frames(start, end, use_cache, refresh=False)
+
+    try:
+        versions = {name: p.get('version') for name, p in payloads.items()}
+        health_percent, metrics = compute_health(frames, versions)
+        context = _sanitize_for_json({'health_percent': health_percent, 'metrics': metrics})
+        series_data = {s: (frames[s], payloads[s].get('trend'), payloads[s].get('changepoints')) for s in frames}
+        narratives = generate_batch_ai_insights(series_data, context, backend_cache, use_cache=use_cache)
+    except Exception as e:
+        logger.exception("Batch insight error: %s", e)
+        return _sanitize_for_json({'health_percent': None, 'metrics': {}, 'ai_insight': 'Overall AI insight temporarily unavailable.', 'series': {}})
+
+    overall = _sanitize_for_json({'health_percent': health_percent, 'metrics': metrics, 'ai_insight': narratives['overall']})
+    # Write the narratives back so later /series and /insights/overall calls are cache hits
+    if use_cache:
+        for s, text in narratives['series'].items():
+            if not is_fallback_insight(text):
+                backend_cache.set_artifact('ai_insight', f"{s}_{payloads[s]['version']}", text)
+        backend_cache.set("overall_insights", start, end, overall, "")
+
+    return dict(overall, series=narratives['series'])
+
+
+@app.get("/insights/health/history")
+def health_score_history(start: str, end: str, use_cache: bool = True):
+    """Monthly composite health score over a date range, computed in one vectorized pass."""
+    import pandas as pd
+    try:
+        # Pull an extra year so YoY metrics exist from the first month
+        history_start = (pd.Timestamp(start) - pd.DateOffset(years=1)).strftime('%Y-%m-%d')
+        frames, _ = _load_dashboard_frames(history_start, end, use_cache)
+        history = health_history(frames, start, end)
+    except Exception as e:
+        logger.exception("Health history error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return _sanitize_for_json({
+        'dates': [d.strftime('%Y-%m-%d') for d in history.index],
+        'health_percent': [float(v) for v in history['health_percent']],
+        'metrics': {m: [float(v) for v in history[m]] for m in history.columns if m != 'health_percent'},
+    })
@@ -1,10 +1,119 @@
+import bisect
+import hashlib
 import json
+import logging
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from datetime import date
 from pathlib import Path
 
+from backend import shared_cache
+from backend.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+# Parsed entries kept in memory (L1) in front of the files (L2)
+MEMORY_ENTRIES = int(os.getenv("CACHE_MEMORY_ENTRIES", "256"))
+# Shared copies of series entries outlive their freshness window by this much, so they can still be revalidated
+SHARED_GRACE = 7 * 24 * 60 * 60
+ARTIFACT_TTL = 30 * 24 * 60 * 60
+
+# {series}_{frequency}_{start}_{end}.json; only dated entries with a frequency take part in range lookups
+_RANGE_FILE = re.compile(
+    r"^(?P<series>.+)_(?P<freq>d|w|bw|m|q|sa|a|y)_(?P<start>\d{4}-\d{2}-\d{2})_(?P<end>\d{4}-\d{2}-\d{2})\.json$")
+
+
+class RangeIndex:
+    """Cached date ranges for one (series, frequency), sorted by start.
+
+    Dates are kept as ordinals. `_max_end[i]` is the largest end among the first
+    i + 1 entries, so "nothing covers this" is a single bisect, and the search for
+    the smallest covering range stops as soon as no earlier entry can beat it.
+    """
+
+    def __init__(self):
+        self.entries = []  # (start, end, filename), sorted
+        self.starts = []
+        self._max_end = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, start, end, name):
+        entry = (start, end, name)
+        i = bisect.bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            return
+        self.entries.insert(i, entry)
+        self.starts.insert(i, start)
+        self._max_end = None
+
+    def remove(self, start, end, name):
+        i = bisect.bisect_left(self.entries, (start, end, name))
+        if i < len(self.entries) and self.entries[i] == (start, end, name):
+            del self.entries[i]
+            del self.starts[i]
+            self._max_end = None
+
+    def _prefix_max_end(self):
+        if self._max_end is None:
+            max_end, running = [], None
+            for _, end, _ in self.entries:
+                running = end if running is None or end > running else running
+                max_end.append(running)
+            self._max_end = max_end
+        return self._max_end
+
+    def covering(self, start, end, accept=None):
+        """Smallest cached range containing [start, end], as (start, end, filename), or None.
+
+        accept(filename), if given, can turn down candidates (e.g. entries in other units).
+        """
+        i = bisect.bisect_right(self.starts, start)
+        max_end = self._prefix_max_end()
+        if i == 0 or max_end[i - 1] < end:
+            return None
+        best, best_span = None, None
+        for j in range(i - 1, -1, -1):
+            s, e, name = self.entries[j]
+            # Every earlier entry starts at or before s, so spans at least end - s
+            if max_end[j] < end or (best_span is not None and end - s >= best_span):
+                break
+            if e >= end and (best_span is None or e - s < best_span) and (accept is None or accept(name)):
+                best, best_span = self.entries[j], e - s
+        return best
+
+    def overlaps(self, start, end, limit=3):
+        """Up to `limit` ranges that partly overlap [start, end], largest overlap first.
+
+        Each item is (overlap_days, start, end, filename); useful for fetching only
+        the missing part of a range.
+        """
+        i = bisect.bisect_right(self.starts, end)
+        max_end = self._prefix_max_end()
+        found = []
+        for j in range(i - 1, -1, -1):
+            if max_end[j] < start:
+                break
+            s, e, name = self.entries[j]
+            if e >= start:
+                found.append((min(e, end) - max(s, start) + 1, s, e, name))
+        found.sort(key=lambda item: (-item[0], item[1]))
+        return found[:limit]
+
+
 class BackendCache:
-    def __init__(self, cache_dir="cache"):
+    """Series entries and derived artifacts in up to three tiers: memory (L1), files (L2), shared (L3).
+
+    Reads go down the tiers and fill the ones above on a hit; writes go to all of
+    them. Entries served from memory are shared objects, so callers must not
+    mutate what get()/get_artifact() return.
+    """
+
+    def __init__(self, cache_dir="cache", shared=None, memory_entries=MEMORY_ENTRIES):
         # Use absolute path relative to project root (parent of backend directory)
         if Path(cache_dir).is_absolute():
             self.cache_dir = Path(cache_dir)
@@ -14,8 +123,22 @@ class BackendCache:
             project_root = backend_dir.parent
             self.cache_dir = project_root / cache_dir
         self.cache_dir.mkdir(exist_ok=True)
+        # Derived artifacts (trend, insights) live in their own layer keyed by observation version
+        self.artifact_dir = self.cache_dir / "artifacts"
+        self.artifact_dir.mkdir(exist_ok=True)
         # Default cache duration (fallback)
         self.cache_duration = 24 * 60 * 60  # 24 hours (1 day) in seconds
+        # (series, frequency) -> RangeIndex over the cached files, so range lookups never glob
+        self._ranges = {}
+        self._ranges_lock = threading.RLock()
+        self._ranges_mtime = None
+        self._load_ranges()
+        # file path -> (mtime_ns, parsed JSON); the mtime check drops entries another process rewrote
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self.memory_entries = memory_entries
+        # Optional SharedCache (e.g. Redis) behind the local tiers
+        self.shared = shared
 
     def _duration_for_frequency(self, freq: str) -> int:
         """Return cache duration in seconds based on series frequency."""
@@ -38,123 +161,428 @@ class BackendCache:
         cache_key = f"{series_name}{freq_suffix}_{start_date}_{end_date}.json"
         return self.cache_dir / cache_key
     
-    def get(self, series_name, start_date, end_date, frequency: str = ""):
-        """Get cached data if it exists and is not expired"""
+    # Local tiers --------------------------------------------------------
+
+    def _read_json(self, path):
+        """Parsed JSON file, from memory when the file hasn't changed since it was last read."""
+        mtime = os.stat(path).st_mtime_ns
+        with self._memory_lock:
+            item = self._memory.get(str(path))
+            if item is not None and item[0] == mtime:
+                self._memory.move_to_end(str(path))
+                return item[1]
+        with open(path, 'r') as f:
+            value = json.load(f)
+        self._remember(path, value, mtime)
+        return value
+
+    def _write_json(self, path, value, indent=None):
+        with open(path, 'w') as f:
+            json.dump(value, f, indent=indent)
+        self._remember(path, value)
+
+    def _remember(self, path, value, mtime=None):
+        if self.memory_entries <= 0:
+            return
+        try:
+            mtime = mtime or os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        with self._memory_lock:
+            self._memory[str(path)] = (mtime, value)
+            self._memory.move_to_end(str(path))
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _forget(self, path):
+        with self._memory_lock:
+            self._memory.pop(str(path), None)
+
+    @staticmethod
+    def _entry_units(cached_data):
+        entry = cached_data.get('data') if isinstance(cached_data, dict) else None
+        return entry.get('units', 'lin') if isinstance(entry, dict) else 'lin'
+
+    def _has_units(self, path, units):
+        """True if the file exists and holds an entry in `units` (None accepts any)."""
+        if units is None:
+            return path.exists()
+        try:
+            return self._entry_units(self._read_json(path)) == units
+        except (OSError, ValueError):
+            return False
+
+    def _locate(self, series_name, start_date, end_date, frequency, units=None):
+        """Local file answering the request: exact, without frequency, or the smallest covering range.
+
+        With units set, files holding another FRED units view are passed over (not removed).
+        """
         cache_path = self._get_cache_path(series_name, start_date, end_date, frequency)
-        
-        print(f"[CACHE] Looking for cache: {cache_path}")
-        print(f"[CACHE] Cache exists: {cache_path.exists()}")
-        
-        if not cache_path.exists():
-            # Try without frequency suffix as fallback
-            if frequency:
-                fallback_path = self._get_cache_path(series_name, start_date, end_date, "")
-                print(f"[CACHE] Trying fallback cache: {fallback_path}")
-                if fallback_path.exists():
-                    cache_path = fallback_path
-                else:
-                    # Try to find any cache file for this series that might overlap
-                    print(f"[CACHE] Trying to find any cache file for {series_name} with frequency {frequency}")
-                    cache_pattern = f"{series_name}_{frequency.lower()}_*.json" if frequency else f"{series_name}_*.json"
-                    matching_files = list(self.cache_dir.glob(cache_pattern))
-                    if matching_files:
-                        # Sort by filename (which includes date range) to prefer larger date ranges
-                        matching_files.sort(key=lambda p: p.name)
-                        # Only use files that actually contain the requested date range
-                        requested_start = start_date
-                        requested_end = end_date
-                        best_match = None
-                        for cache_file in matching_files:
-                            # Parse date range from filename: nasdaq_d_1995-01-01_2004-12-31.json
-                            parts = cache_file.stem.split('_')
-                            if len(parts) >= 4:
-                                try:
-                                    file_start = parts[-2]
-                                    file_end = parts[-1]
-                                    # Only use if file's range contains the requested range
-                                    if file_start <= requested_start and file_end >= requested_end:
-                                        best_match = cache_file
-                                        break
-                                except:
-                                    pass
-                        
-                        # Only use if we found a file that contains the full range
-                        if best_match:
-                            cache_path = best_match
-                            print(f"[CACHE] Found cache file containing requested range: {cache_path}")
-                        else:
-                            # Don't use overlapping files that don't contain the full range
-                            print(f"[CACHE] No cache file found containing full date range {start_date} to {end_date}")
-                            return None
-                    else:
-                        return None
+        if self._has_units(cache_path, units):
+            return cache_path
+        if not frequency:
+            return None
+        # Try without frequency suffix as fallback
+        fallback_path = self._get_cache_path(series_name, start_date, end_date, "")
+        if self._has_units(fallback_path, units):
+            return fallback_path
+        # Smallest cached range that contains the requested one
+        best_match = self.find_covering(series_name, start_date, end_date, frequency, units)
+        if best_match is not None:
+            logger.debug("cache covered by %s", best_match.name)
+        elif logger.isEnabledFor(logging.DEBUG):
+            partial = self.find_overlaps(series_name, start_date, end_date, frequency)
+            logger.debug("cache miss %s, partial overlaps: %s", cache_path.name,
+                         [p["path"].name for p in partial] or "none")
+        return best_match
+
+    def exact_units(self, series_name, start_date, end_date, frequency: str = ""):
+        """Units of the entry stored under exactly this key, or None if there is none."""
+        cache_path = self._get_cache_path(series_name, start_date, end_date, frequency)
+        try:
+            return self._entry_units(self._read_json(cache_path))
+        except (OSError, ValueError):
+            return None
+
+    def contains(self, series_name, start_date, end_date, frequency: str = "", units=None):
+        """True if a local file answers the request, expired or not; unlike get() nothing is evicted."""
+        return self._locate(series_name, start_date, end_date, frequency, units) is not None
+
+    # Shared tier --------------------------------------------------------
+
+    @staticmethod
+    def _shared_key(path):
+        # Same names as the files, so every instance agrees on them
+        return path.stem if path.parent.name != "artifacts" else f"artifacts/{path.stem}"
+
+    def _share(self, path, value, ttl):
+        if self.shared is not None:
+            self.shared.set(self._shared_key(path), value, ttl)
+
+    def _pull(self, cache_path, cached_data):
+        """Keep a shared hit locally (memory and disk) so covering lookups can use it too."""
+        try:
+            self._write_json(cache_path, cached_data, indent=2)
+            self._index_file(cache_path)
+        except OSError as e:
+            logger.warning("Failed to keep shared entry %s locally: %s", cache_path.name, e)
+
+    def _shared_usable(self, cache_path, cached_data, units):
+        """A shared entry can be used (and kept locally) if it's in the right units and no local file of other units sits at its path."""
+        if not isinstance(cached_data, dict) or 'data' not in cached_data:
+            return False
+        if units is not None and self._entry_units(cached_data) != units:
+            return False
+        return not cache_path.exists()
+
+    def _prefetch(self, requests, units=None):
+        """Pull the requests no local file answers from the shared tier in one MGET; returns the ones it lacked too."""
+        if self.shared is None:
+            return set()
+        missing = {i: self._get_cache_path(name, start, end, freq)
+                   for i, (name, start, end, freq) in enumerate(requests)
+                   if self._locate(name, start, end, freq, units) is None}
+        if not missing:
+            return set()
+        absent = set()
+        for i, cached_data in zip(missing, self.shared.get_many([self._shared_key(p) for p in missing.values()])):
+            if self._shared_usable(missing[i], cached_data, units):
+                self._pull(missing[i], cached_data)
             else:
-                return None
-        
+                absent.add(i)
+        return absent
+
+    def get_many(self, requests, revalidate=None, units=None):
+        """get() for each (series, start, end, frequency), with one shared-tier round trip for all the local misses.
+
+        revalidate(series, data) is get()'s revalidate with the series name first.
+        """
+        absent = self._prefetch(requests, units)
+        found = []
+        for i, (name, start, end, freq) in enumerate(requests):
+            if i in absent:
+                CACHE_LOOKUPS.inc(series=name, result="miss")
+                found.append(None)
+                continue
+            check = (lambda data, name=name: revalidate(name, data)) if revalidate is not None else None
+            found.append(self.get(name, start, end, freq, revalidate=check, units=units))
+        return found
+
+    def get(self, series_name, start_date, end_date, frequency: str = "", revalidate=None, units=None):
+        """Get cached data if it exists and is not expired.
+
+        revalidate(data) is asked before an expired entry is dropped; if it returns
+        True (e.g. FRED says the series hasn't changed) the entry is renewed instead.
+        With units set, only entries in those FRED units answer (see _locate).
+        """
+        logger.debug("cache lookup %s", self._get_cache_path(series_name, start_date, end_date, frequency).name)
+
+        cache_path = self._locate(series_name, start_date, end_date, frequency, units)
+        result = "hit"
         try:
-            with open(cache_path, 'r') as f:
-                cached_data = json.load(f)
-            
+            if cache_path is None:
+                # Another instance may have fetched it already
+                cache_path = self._get_cache_path(series_name, start_date, end_date, frequency)
+                cached_data = self.shared.get(self._shared_key(cache_path)) if self.shared is not None else None
+                if not self._shared_usable(cache_path, cached_data, units):
+                    CACHE_LOOKUPS.inc(series=series_name, result="miss")
+                    return None
+                self._pull(cache_path, cached_data)
+                result = "shared_hit"
+            else:
+                cached_data = self._read_json(cache_path)
+
             # Check if cache is expired (use per-entry frequency if available)
             entry_freq = cached_data.get('frequency', frequency)
             duration = self._duration_for_frequency(entry_freq)
             if time.time() - cached_data['timestamp'] > duration:
-                cache_path.unlink()  # Delete expired cache
+                if revalidate is not None and revalidate(cached_data['data']):
+                    cached_data = dict(cached_data, timestamp=time.time())
+                    self._write_json(cache_path, cached_data, indent=2)
+                    self._share(cache_path, cached_data, duration + SHARED_GRACE)
+                    CACHE_LOOKUPS.inc(series=series_name, result="revalidated")
+                    return cached_data['data']
+                self._remove_file(cache_path)  # Delete expired cache
+                CACHE_LOOKUPS.inc(series=series_name, result="expired")
                 return None
-            
-            print(f"Cache hit for {series_name}")
-            cached_result = cached_data['data']
-            
-            # Debug: Log cache structure for NASDAQ
-            if series_name.lower() == 'nasdaq':
-                print(f"[CACHE DEBUG] NASDAQ cache structure:")
-                print(f"  - Has 'data' key: {'data' in cached_result}")
-                print(f"  - Has 'data.data' key: {'data' in cached_result.get('data', {})}")
-                print(f"  - Has 'data.value' key: {'value' in cached_result.get('data', {})}")
-                print(f"  - Top level keys: {list(cached_result.keys()) if isinstance(cached_result, dict) else 'not a dict'}")
-            
-            return cached_result
-        
+
+            CACHE_LOOKUPS.inc(series=series_name, result=result)
+            return cached_data['data']
+
         except (json.JSONDecodeError, KeyError, OSError) as e:
-            print(f"Cache error for {series_name}: {e}")
-            cache_path.unlink()  # Delete corrupted cache
+            logger.warning("Cache error for %s: %s", series_name, e)
+            CACHE_LOOKUPS.inc(series=series_name, result="error")
+            self._remove_file(cache_path)  # Delete corrupted cache
             return None
     
     def set(self, series_name, start_date, end_date, data, frequency: str = ""):
-        """Cache the data"""
+        """Cache the data (locally and in the shared tier, if any)"""
         cache_path = self._get_cache_path(series_name, start_date, end_date, frequency)
-        
+        cache_data = {
+            'data': data,
+            'timestamp': time.time(),
+            'series_name': series_name,
+            'start_date': start_date,
+            'end_date': end_date,
+            'frequency': frequency
+        }
+        self._share(cache_path, cache_data, self._duration_for_frequency(frequency) + SHARED_GRACE)
+
         try:
-            cache_data = {
-                'data': data,
-                'timestamp': time.time(),
-                'series_name': series_name,
-                'start_date': start_date,
-                'end_date': end_date,
-                'frequency': frequency
-            }
-            
-            with open(cache_path, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-            
-            print(f"Cached data for {series_name}")
-        
+            self._write_json(cache_path, cache_data, indent=2)
+            self._index_file(cache_path)
+
+            logger.debug("Cached data for %s", series_name)
+
         except OSError as e:
-            print(f"Failed to cache {series_name}: {e}")
+            logger.warning("Failed to cache %s: %s", series_name, e)
     
+    def evict(self, series_name, start_date, end_date, frequency: str = ""):
+        """Drop one cached range (file, index and shared entry). Returns True if it existed locally."""
+        cache_path = self._get_cache_path(series_name, start_date, end_date, frequency)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key(cache_path))
+        if not cache_path.exists():
+            return False
+        self._remove_file(cache_path)
+        return True
+
+    # Range index --------------------------------------------------------
+
+    @staticmethod
+    def _parse_range(name):
+        match = _RANGE_FILE.match(name)
+        if not match:
+            return None
+        try:
+            start = date.fromisoformat(match["start"]).toordinal()
+            end = date.fromisoformat(match["end"]).toordinal()
+        except ValueError:
+            return None
+        return (match["series"], match["freq"]), start, end
+
+    def _dir_mtime(self):
+        try:
+            return os.stat(self.cache_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_ranges(self):
+        """(Re)build the index from the file names in the cache directory."""
+        ranges = {}
+        mtime = self._dir_mtime()
+        for cache_file in self.cache_dir.glob("*.json"):
+            parsed = self._parse_range(cache_file.name)
+            if parsed:
+                key, start, end = parsed
+                ranges.setdefault(key, RangeIndex()).add(start, end, cache_file.name)
+        with self._ranges_lock:
+            self._ranges = ranges
+            self._ranges_mtime = mtime
+
+    def _range_index(self, series_name, frequency):
+        # Another process (e.g. scripts/seed_cache.py) may have added or removed files;
+        # the directory mtime changes when it does, so one stat keeps the index honest
+        if self._dir_mtime() != self._ranges_mtime:
+            self._load_ranges()
+        return self._ranges.get((series_name, frequency.lower()))
+
+    def _index_file(self, cache_path):
+        parsed = self._parse_range(cache_path.name)
+        with self._ranges_lock:
+            if parsed:
+                key, start, end = parsed
+                self._ranges.setdefault(key, RangeIndex()).add(start, end, cache_path.name)
+            self._ranges_mtime = self._dir_mtime()
+
+    def _remove_file(self, cache_path):
+        self._forget(cache_path)
+        try:
+            cache_path.unlink()
+        except FileNotFoundError:
+            pass
+        parsed = self._parse_range(cache_path.name)
+        with self._ranges_lock:
+            if parsed:
+                key, start, end = parsed
+                index = self._ranges.get(key)
+                if index is not None:
+                    index.remove(start, end, cache_path.name)
+            self._ranges_mtime = self._dir_mtime()
+
+    def find_covering(self, series_name, start_date, end_date, frequency, units=None):
+        """Path of the smallest cached range containing start..end, or None.
+
+        No file I/O unless units is set, in which case candidates are read to skip other units.
+        """
+        try:
+            start = date.fromisoformat(start_date).toordinal()
+            end = date.fromisoformat(end_date).toordinal()
+        except (TypeError, ValueError):
+            return None
+        with self._ranges_lock:
+            index = self._range_index(series_name, frequency)
+            accept = None if units is None else (lambda name: self._has_units(self.cache_dir / name, units))
+            found = index.covering(start, end, accept) if index else None
+        return self.cache_dir / found[2] if found else None
+
+    def find_overlaps(self, series_name, start_date, end_date, frequency, limit=3):
+        """Cached ranges that partly overlap start..end, largest overlap first (for gap-filling).
+
+        Returns dicts with start, end, path and overlap_days.
+        """
+        try:
+            start = date.fromisoformat(start_date).toordinal()
+            end = date.fromisoformat(end_date).toordinal()
+        except (TypeError, ValueError):
+            return []
+        with self._ranges_lock:
+            index = self._range_index(series_name, frequency)
+            found = index.overlaps(start, end, limit) if index else []
+        return [{
+            "start": date.fromordinal(s).isoformat(),
+            "end": date.fromordinal(e).isoformat(),
+            "path": self.cache_dir / name,
+            "overlap_days": days,
+        } for days, s, e, name in found]
+
+    @staticmethod
+    def observation_version(data_dict):
+        """Content hash of a series' observations; derived artifacts are keyed by this."""
+        values = data_dict.get('value', data_dict) if isinstance(data_dict, dict) else data_dict
+        payload = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.md5(payload.encode()).hexdigest()[:16]
+
+    @classmethod
+    def observations_entry(cls, df, frequency: str = "", last_updated=None, units="lin"):
+        """Series cache entry for an observations DataFrame: JSON-ready data plus its version.
+
+        last_updated is FRED's timestamp for the series when it was fetched, used to
+        revalidate the entry once it expires. units is only recorded when it isn't
+        'lin' (the API serves levels and transforms them itself).
+        """
+        data_dict = df.to_dict()
+        # Convert Timestamp objects to strings for JSON serialization
+        for col in data_dict:
+            if isinstance(data_dict[col], dict):
+                data_dict[col] = {str(k): v for k, v in data_dict[col].items()}
+        entry = {
+            'data': data_dict,
+            'frequency': frequency,
+            'version': cls.observation_version(data_dict),
+        }
+        if last_updated:
+            entry['last_updated'] = last_updated
+        if units and units != 'lin':
+            entry['units'] = units
+        return entry
+
+    def set_observations(self, series_name, start_date, end_date, df, frequency: str = "", last_updated=None,
+                         units="lin"):
+        """Cache a fetched observations DataFrame; returns the stored entry.
+
+        Only observations (plus their version) go in the series entry; trend and
+        insights are derived layers built on first read.
+        """
+        entry = self.observations_entry(df, frequency, last_updated, units)
+        self.set(series_name, start_date, end_date, entry, frequency)
+        return entry
+
+    def _get_artifact_path(self, kind, key):
+        return self.artifact_dir / f"{kind}_{key}.json"
+
+    def get_artifact(self, kind, key):
+        """Get a derived artifact (e.g. 'trend', 'insight', 'ai_insight') or None.
+
+        Artifacts never expire: the key includes the observation version, so new data
+        simply maps to a new key.
+        """
+        path = self._get_artifact_path(kind, key)
+        try:
+            if path.exists():
+                return self._read_json(path)['value']
+            stored = self.shared.get(self._shared_key(path)) if self.shared is not None else None
+            if not isinstance(stored, dict):
+                return None
+            self._write_json(path, stored)
+            return stored['value']
+        except (json.JSONDecodeError, KeyError, OSError) as e:
+            logger.warning("Artifact cache error for %s_%s: %s", kind, key, e)
+            self._forget(path)
+            path.unlink(missing_ok=True)
+            return None
+
+    def set_artifact(self, kind, key, value):
+        """Store a derived artifact"""
+        path = self._get_artifact_path(kind, key)
+        stored = {'value': value, 'timestamp': time.time()}
+        self._share(path, stored, ARTIFACT_TTL)
+        try:
+            self._write_json(path, stored)
+        except OSError as e:
+            logger.warning("Failed to cache artifact %s_%s: %s", kind, key, e)
+
     def clear(self):
-        """Clear all cache files"""
+        """Clear all cache files (and the shared tier, which other instances read too)"""
+        with self._memory_lock:
+            self._memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
         try:
             for cache_file in self.cache_dir.glob("*.json"):
                 cache_file.unlink()
-            print("Backend cache cleared")
+            for cache_file in self.artifact_dir.glob("*.json"):
+                cache_file.unlink()
+            logger.info("Backend cache cleared")
         except OSError as e:
-            print(f"Failed to clear cache: {e}")
+            logger.warning("Failed to clear cache: %s", e)
+        self._load_ranges()
     
     def cleanup(self):
-        """Remove expired cache files"""
+        """Remove expired cache files, then artifacts that nothing references anymore (see _sweep_artifacts)"""
         cleaned = 0
         current_time = time.time()
+        live_versions = set()
         
         try:
             for cache_file in self.cache_dir.glob("*.json"):
@@ -165,16 +593,47 @@ class BackendCache:
                     if current_time - cached_data.get('timestamp', 0) > self.cache_duration:
                         cache_file.unlink()
                         cleaned += 1
+                        continue
+                    entry = cached_data.get('data')
+                    if isinstance(entry, dict) and 'data' in entry:
+                        live_versions.add(entry.get('version') or self.observation_version(entry['data']))
                 
                 except (json.JSONDecodeError, KeyError):
                     cache_file.unlink()  # Delete corrupted files
                     cleaned += 1
             
             if cleaned > 0:
-                print(f"Cleaned up {cleaned} expired cache files")
+                logger.info("Cleaned up %d expired cache files", cleaned)
+                self._load_ranges()
+            self._sweep_artifacts(live_versions, current_time)
         
         except OSError as e:
-            print(f"Cache cleanup error: {e}")
+            logger.warning("Cache cleanup error: %s", e)
+
+    def _sweep_artifacts(self, live_versions, now):
+        """Drop artifacts older than ARTIFACT_TTL unless their key names an observation version still cached.
+
+        Every new version or range leaves trend/insight/changepoints/aligned/... files
+        behind; versioned ones are kept as long as their observations are, the rest
+        (and hash-keyed ones like aligned/correlations) are recomputed after ARTIFACT_TTL.
+        """
+        removed = 0
+        for path in self.artifact_dir.glob("*.json"):
+            if live_versions.intersection(path.stem.split("_")):
+                continue
+            try:
+                with open(path, 'r') as f:
+                    stored = json.load(f)
+                if now - stored.get('timestamp', 0) <= ARTIFACT_TTL:
+                    continue
+            except (json.JSONDecodeError, AttributeError):
+                pass  # corrupted: remove
+            self._forget(path)
+            path.unlink(missing_ok=True)
+            removed += 1
+        if removed:
+            logger.info("Removed %d unreferenced artifacts", removed)
+        return removed
 
 # Create a singleton instance
-backend_cache = BackendCache()
+backend_cache = BackendCache(shared=shared_cache.from_env())
@@ -1,37 +1,79 @@
 import requests
-import pandas as pd
 import json
+import logging
+
+from backend.metrics import span
+from backend.series.http_cache import fred_http_cache
 
 import os
 base_dir = os.path.dirname(os.path.dirname(__file__))  # go up one level
+logger = logging.getLogger(__name__)
+
+# One pooled HTTP session shared by every series so concurrent fetches reuse connections to FRED
+_session = requests.Session()
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def _load_fred_key():
+    # Prefer environment variable in deployment; fallback to optional secrets.json locally
+    fred_key = os.getenv("FRED_KEY")
+    if not fred_key:
+        secrets_path = os.path.join(base_dir, "secrets.json")
+        if os.path.exists(secrets_path):
+            try:
+                with open(secrets_path, "r") as f:
+                    secrets = json.load(f)
+                    fred_key = secrets.get("FRED_KEY")
+            except Exception:
+                fred_key = None
+    return fred_key
+
+# Read once at startup instead of on every Series() construction
+FRED_KEY = _load_fred_key()
 
 
 class Series:
-    def __init__(self, series_id, start_date, end_date, frequency="m", units="lin" ):
-        self.series_id = series_id
+    # FRED metadata lives on the class so callers (cache keys, registries) can read it
+    # without building an instance; subclasses override these
+    series_id = None
+    frequency = "m"
+    units = "lin"
+
+    # series_id -> Series subclass, filled in as subclasses are defined
+    registry = {}
+
+    # FRED_BASE_URL points every series at another FRED-compatible server (e.g. the benchmark stub)
+    base_url = os.getenv("FRED_BASE_URL", "https://api.stlouisfed.org/fred/")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.series_id:
+            Series.registry[cls.series_id] = cls
+
+    @classmethod
+    def metadata(cls):
+        """Class-level FRED metadata: series_id, frequency and units."""
+        return {"series_id": cls.series_id, "frequency": cls.frequency, "units": cls.units}
+
+    def __init__(self, start_date, end_date, series_id=None, frequency=None, units=None):
+        # Only overrides become instance attributes; otherwise the class values are used
+        if series_id is not None:
+            self.series_id = series_id
+        if frequency is not None:
+            self.frequency = frequency
+        if units is not None:
+            self.units = units
         self.start_date = start_date
         self.end_date = end_date
-        self.frequency = frequency
-        self.units = units
         self.data = None
-        # Prefer environment variable in deployment; fallback to optional secrets.json locally
-        fred_key = os.getenv("FRED_KEY")
-        if not fred_key:
-            secrets_path = os.path.join(base_dir, "secrets.json")
-            if os.path.exists(secrets_path):
-                try:
-                    with open(secrets_path, "r") as f:
-                        secrets = json.load(f)
-                        fred_key = secrets.get("FRED_KEY")
-                except Exception:
-                    fred_key = None
-        self.fred_key = fred_key
-        self.base_url = "https://api.stlouisfed.org/fred/"
+        # FRED's last_updated for the observations fetch_data returned, when known
+        self.last_updated = None
+        self.fred_key = FRED_KEY
         # first endpoint --> series
         self.obs_endpoint = 'series/observations'
 
     def fetch_series_info(self):
-        """Fetch series metadata including title, units, and frequency"""
+        """Fetch series metadata including title, units, and frequency (uncached; prefer series_metadata.get)"""
         series_endpoint = 'series'
         series_params = {
             'series_id': self.series_id,
@@ -39,14 +81,17 @@ class Series:
             'file_type': 'json'
         }
         
-        response = requests.get(self.base_url + series_endpoint, params=series_params)
+        # This is the freshness probe itself, so a stored copy is only reused after a 304
+        with span("fred_meta", self.series_id):
+            response = fred_http_cache.get(_session, self.base_url + series_endpoint, series_params, max_age=0)
         if response.status_code == 200:
             series_data = response.json()
             if 'seriess' in series_data and len(series_data['seriess']) > 0:
                 return series_data['seriess'][0]
         return None
 
-    def fetch_data(self):
+    def fetch_data(self, refresh=False):
+        """Observations DataFrame for the range; refresh=True revalidates any stored raw response with FRED."""
         obs_params = {
             'series_id': self.series_id,
             'api_key': self.fred_key,
@@ -58,28 +103,37 @@ class Series:
         }
 
         #make get request to FRED api
-        response = requests.get(self.base_url + self.obs_endpoint, params=obs_params)
+        # Raw responses are cached below the parser, shared with the scripts (see series/http_cache.py)
+        recorded = self._last_updated(cached_only=True)
+        with span("fred_fetch", self.series_id):
+            response = fred_http_cache.get(_session, self.base_url + self.obs_endpoint, obs_params,
+                                           last_updated=self._last_updated, refresh=refresh)
+        # A body from the HTTP cache may predate the current metadata, so stamp what was recorded with it
+        self.last_updated = getattr(response, "last_updated", recorded)
         # print(base_url + obs_endpoint)
 
         #status code 200 means success
         if response.status_code == 200:
+            import pandas as pd  # lazy: cached requests never need it
+
             res_data = response.json() # parse json data out
             # Check if FRED returned an error in the response
             if 'error_code' in res_data:
                 error_msg = res_data.get('error_message', f"FRED API error: {res_data.get('error_code')}")
-                print(f"FRED API error for {self.series_id}: {error_msg}")
+                logger.warning("FRED API error for %s: %s", self.series_id, error_msg)
                 raise ValueError(f"404: {error_msg}")
             
             # Check if observations exist
             if 'observations' not in res_data or len(res_data['observations']) == 0:
                 raise ValueError(f"404: Series not found or no data available for {self.series_id} in date range {self.start_date} to {self.end_date}")
             
-            obs_data = pd.DataFrame(res_data['observations']) # gets data into obs_data
-            obs_data['date'] = pd.to_datetime(obs_data['date'])
-            obs_data.set_index('date', inplace=True)
-            # FRED uses '.' for missing values; coerce to NaN then drop
-            obs_data['value'] = pd.to_numeric(obs_data['value'], errors='coerce')
-            obs_data = obs_data.dropna(subset=['value'])
+            with span("parse", self.series_id):
+                obs_data = pd.DataFrame(res_data['observations']) # gets data into obs_data
+                obs_data['date'] = pd.to_datetime(obs_data['date'])
+                obs_data.set_index('date', inplace=True)
+                # FRED uses '.' for missing values; coerce to NaN then drop
+                obs_data['value'] = pd.to_numeric(obs_data['value'], errors='coerce')
+                obs_data = obs_data.dropna(subset=['value'])
             
             if len(obs_data) == 0:
                 raise ValueError(f"404: Series not found or no valid data for {self.series_id} in date range {self.start_date} to {self.end_date}")
@@ -87,8 +141,8 @@ class Series:
             self.data = obs_data
         else:
             error_text = response.text
-            print(f"Failed to retrieve data for {self.series_id}. Status code: {response.status_code}")
-            print(f"Response text: {error_text}")
+            logger.warning("Failed to retrieve data for %s. Status code: %s. Response text: %s",
+                           self.series_id, response.status_code, error_text)
             # Try to parse error from FRED
             try:
                 error_json = response.json()
@@ -100,21 +154,14 @@ class Series:
 
         return self.data
 
+    def _last_updated(self, cached_only=False):
+        """FRED's last_updated for this series via series_metadata (cached_only never hits the network)."""
+        from backend.series.metadata import series_metadata
+        if cached_only:
+            return series_metadata.last_updated(self, max_age=None)
+        return series_metadata.last_updated(self)
+
     def get_axis_labels(self):
-        """Get appropriate axis labels based on series metadata"""
-        series_info = self.fetch_series_info()
-        if series_info:
-            title = series_info.get('title', self.series_id)
-            units = series_info.get('units', 'Value')
-            return {
-                'x_label': 'Date',
-                'y_label': f"{title} ({units})",
-                'title': f"{title} ({self.series_id})"
-            }
-        else:
-            # Fallback labels
-            return {
-                'x_label': 'Date',
-                'y_label': f'{self.series_id} Value',
-                'title': f'{self.series_id} Data'
-            }
\ No newline at end of file
+        """Get appropriate axis labels based on series metadata (cached, see series/metadata.py)"""
+        from backend.series.metadata import series_metadata
+        return series_metadata.axis_labels(self)
@@ -0,0 +1,220 @@
+"""
+Transport-level cache for raw FRED responses.
+
+Series.fetch_data and fetch_series_info go through fred_http_cache before any
+parsing, so the same upstream request made by the app, the story scripts or
+seed_cache.py is answered from disk instead of downloading the body again.
+
+Entries are keyed by the endpoint plus the normalized request parameters,
+with api_key left out, so every key and every caller share them. Each one is
+a zlib-compressed body ({key}.z) and a small JSON sidecar ({key}.json) with
+the URL, parameters, fetch time, the response's ETag / Last-Modified and
+FRED's last_updated for the series when it was fetched. A stored body is
+reused when:
+
+- it is younger than max_age (FRED_HTTP_MAX_AGE, 1 hour by default), or
+- the caller's last_updated probe reports the same last_updated as the one
+  recorded with it (the series hasn't been revised since)
+
+Otherwise the request is sent, conditionally (If-None-Match /
+If-Modified-Since) when the entry has validators; a 304 renews the entry.
+Only 200 responses are stored. FRED_HTTP_CACHE=0 turns the cache off;
+refresh=True (the API's use_cache=false) skips the first two checks.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from backend.metrics import FRED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+FRED_HTTP_CACHE = os.getenv("FRED_HTTP_CACHE", "1") != "0"
+FRED_HTTP_MAX_AGE = int(os.getenv("FRED_HTTP_MAX_AGE", str(60 * 60)))
+# Next to the backend cache files by default; relative paths are from the project root
+FRED_HTTP_CACHE_DIR = os.getenv("FRED_HTTP_CACHE_DIR", "cache/http")
+
+# Never part of the key (and never written to disk)
+_SECRET_PARAMS = ("api_key",)
+
+
+class CachedResponse:
+    """The parts of requests.Response that the Series fetchers use, rebuilt from a stored body."""
+
+    def __init__(self, status_code, content, headers=None, last_updated=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        # FRED's last_updated recorded with the stored body (None if unknown)
+        self.last_updated = last_updated
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _endpoint(url):
+    return url.rstrip("/").rsplit("/fred/", 1)[-1] or url
+
+
+class FredHttpCache:
+    def __init__(self, cache_dir=FRED_HTTP_CACHE_DIR, max_age=FRED_HTTP_MAX_AGE, enabled=FRED_HTTP_CACHE):
+        cache_dir = Path(cache_dir)
+        self.cache_dir = cache_dir if cache_dir.is_absolute() else Path(__file__).parent.parent.parent / cache_dir
+        self.max_age = max_age
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(params):
+        """Request parameters as sorted string pairs, without api_key or empty values."""
+        return sorted((str(k), str(v)) for k, v in (params or {}).items()
+                      if k not in _SECRET_PARAMS and v is not None and v != "")
+
+    @classmethod
+    def cache_key(cls, url, params):
+        source = json.dumps([url.rstrip("/"), cls.normalize(params)])
+        return hashlib.md5(source.encode()).hexdigest()
+
+    def _paths(self, key):
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.z"
+
+    def _load(self, key):
+        """(meta, body bytes) or None if missing or unreadable."""
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning("Dropping unreadable FRED response cache entry %s: %s", key, e)
+            self._remove(key)
+            return None
+        if len(body) != meta.get("size"):
+            return None
+        return meta, body
+
+    def _write(self, path, data, mode):
+        # Scripts and the app may share the directory, so never leave a half-written file behind
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, mode) as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _store(self, key, url, params, response, last_updated):
+        body = response.content
+        meta = {
+            "url": url,
+            "params": dict(self.normalize(params)),
+            "fetched_at": time.time(),
+            "size": len(body),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "last_updated": last_updated,
+        }
+        meta_path, body_path = self._paths(key)
+        try:
+            with self._lock:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write(body_path, zlib.compress(body, 6), "wb")
+            self._write(meta_path, json.dumps(meta), "w")
+        except OSError as e:
+            logger.warning("Failed to cache FRED response %s: %s", _endpoint(url), e)
+
+    def _renew(self, key, meta):
+        meta = dict(meta, fetched_at=time.time())
+        try:
+            self._write(self._paths(key)[0], json.dumps(meta), "w")
+        except OSError as e:
+            logger.warning("Failed to renew FRED response cache entry %s: %s", key, e)
+
+    def _remove(self, key):
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def get(self, session, url, params, max_age=None, last_updated=None, refresh=False):
+        """session.get(url, params=params), answered from the cache when the stored body is still good.
+
+        last_updated(cached_only) returns FRED's last_updated for the series (None
+        if unknown); cached_only=True must not touch the network. refresh=True
+        always asks FRED (conditionally, if the entry has validators). Returns a
+        requests.Response or a CachedResponse, whose last_updated is the one
+        recorded with the body.
+        """
+        endpoint = _endpoint(url)
+        if not self.enabled:
+            FRED_REQUESTS.inc(endpoint=endpoint, result="fetched")
+            return session.get(url, params=params)
+
+        max_age = self.max_age if max_age is None else max_age
+        key = self.cache_key(url, params)
+        stored = self._load(key)
+        headers = {}
+        if stored is not None:
+            meta, body = stored
+            if not refresh and time.time() - meta["fetched_at"] < max_age:
+                FRED_REQUESTS.inc(endpoint=endpoint, result="cached")
+                return CachedResponse(200, body, last_updated=meta.get("last_updated"))
+            if not refresh and meta.get("last_updated") and last_updated is not None:
+                try:
+                    current = last_updated(False)
+                except Exception as e:
+                    logger.debug("last_updated probe failed for %s: %s", endpoint, e)
+                    current = None
+                if current is not None and current == meta["last_updated"]:
+                    self._renew(key, meta)
+                    FRED_REQUESTS.inc(endpoint=endpoint, result="unchanged")
+                    return CachedResponse(200, body, last_updated=current)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        # Read before the request: the body that comes back is at least this recent
+        recorded = None
+        if last_updated is not None:
+            try:
+                recorded = last_updated(True)
+            except Exception:
+                recorded = None
+        response = session.get(url, params=params, headers=headers or None)
+        if response.status_code == 304 and stored is not None:
+            self._renew(key, stored[0])
+            FRED_REQUESTS.inc(endpoint=endpoint, result="not_modified")
+            return CachedResponse(200, stored[1], last_updated=stored[0].get("last_updated"))
+        if response.status_code == 200:
+            self._store(key, url, params, response, recorded)
+            FRED_REQUESTS.inc(endpoint=endpoint, result="fetched")
+        else:
+            FRED_REQUESTS.inc(endpoint=endpoint, result="error")
+        return response
+
+    def clear(self):
+        """Remove every stored response"""
+        removed = 0
+        for path in self.cache_dir.glob("*"):
+            if path.suffix in (".json", ".z", ".tmp"):
+                try:
+                    path.unlink()
+                    removed += path.suffix == ".json"
+                except OSError:
+                    pass
+        return removed
+
+
+# Create a singleton instance
+fred_http_cache = FredHttpCache()
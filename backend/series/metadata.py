@@ -0,0 +1,110 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.cache import backend_cache
+
+logger = logging.getLogger(__name__)
+
+# Titles, units and seasonal adjustment practically never change
+METADATA_TTL = int(os.getenv("FRED_METADATA_TTL", str(7 * 24 * 60 * 60)))
+# last_updated is re-read at most this often when used as a freshness probe
+FRESHNESS_TTL = int(os.getenv("FRED_FRESHNESS_TTL", str(60 * 60)))
+
+# Fields of FRED's /series response worth keeping
+FIELDS = ("id", "title", "units", "units_short", "frequency", "frequency_short",
+          "seasonal_adjustment", "seasonal_adjustment_short", "observation_start",
+          "observation_end", "last_updated", "notes")
+
+
+class MetadataCache:
+    """FRED series metadata (title, units, last_updated, ...) with a long TTL.
+
+    Entries live in memory and are persisted as 'meta' artifacts in the backend
+    cache, so a restart doesn't refetch them. `last_updated` doubles as a cheap
+    freshness probe: an expired observations entry whose series hasn't been
+    updated on FRED since it was fetched is kept instead of refetched.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or backend_cache
+        self._entries = {}  # series_id -> {'info': {...}, 'fetched_at': t}
+        self._lock = threading.Lock()
+
+    def _load(self, series_id):
+        entry = self._entries.get(series_id)
+        if entry is None:
+            entry = self.cache.get_artifact('meta', series_id)
+            if entry:
+                with self._lock:
+                    self._entries[series_id] = entry
+        return entry
+
+    def _store(self, series_id, info):
+        entry = {'info': {k: info.get(k) for k in FIELDS if k in info}, 'fetched_at': time.time()}
+        with self._lock:
+            self._entries[series_id] = entry
+        self.cache.set_artifact('meta', series_id, entry)
+        return entry
+
+    def get(self, series, max_age=METADATA_TTL):
+        """Metadata dict for a Series class (or instance), refetched from FRED if older than max_age.
+
+        max_age=None accepts any cached copy and never hits the network. Returns
+        None if nothing is cached and FRED can't be reached.
+        """
+        series_id = series.series_id
+        entry = self._load(series_id)
+        if entry and (max_age is None or time.time() - entry['fetched_at'] <= max_age):
+            return entry['info']
+        if max_age is None:
+            return None
+        try:
+            instance = series(None, None) if isinstance(series, type) else series
+            info = instance.fetch_series_info()
+        except Exception as e:
+            logger.warning("Metadata fetch failed for %s: %s", series_id, e)
+            info = None
+        if not info:
+            # Serve the stale copy rather than nothing
+            return entry['info'] if entry else None
+        return self._store(series_id, info)['info']
+
+    def last_updated(self, series, max_age=FRESHNESS_TTL):
+        info = self.get(series, max_age=max_age)
+        return info.get('last_updated') if info else None
+
+    def is_unchanged(self, series, entry):
+        """True if FRED reports the same last_updated as when `entry` was fetched."""
+        stored = entry.get('last_updated') if isinstance(entry, dict) else None
+        if not stored:
+            return False
+        current = self.last_updated(series)
+        return current is not None and current == stored
+
+    def axis_labels(self, series):
+        info = self.get(series) or {}
+        series_id = series.series_id
+        if info.get('title'):
+            title, units = info['title'], info.get('units', 'Value')
+            return {'x_label': 'Date', 'y_label': f"{title} ({units})", 'title': f"{title} ({series_id})"}
+        return {'x_label': 'Date', 'y_label': f'{series_id} Value', 'title': f'{series_id} Data'}
+
+    def prefetch(self, series_classes, max_workers=4):
+        """Warm the cache for every class (only those missing or past the TTL hit FRED)."""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(self.get, series_classes))
+        logger.info("Prefetched metadata for %d/%d series in %.2fs",
+                    sum(1 for r in results if r), len(results), time.perf_counter() - started)
+        return results
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Create a singleton instance
+series_metadata = MetadataCache()
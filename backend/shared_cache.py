@@ -0,0 +1,211 @@
+"""
+Shared (network) tier behind BackendCache.
+
+Memory (L1) and disk (L2) are per process / per instance, so on Render or
+Vercel every instance starts cold. A SharedCache sits behind them and speaks
+the Redis protocol: entries a neighbour already fetched are read from it
+instead of from FRED or OpenAI, and local writes go through to it.
+
+- values are JSON; anything of COMPRESS_MIN_BYTES or more is zlib-compressed
+  (observation payloads shrink 5-10x), so a one-byte header says which
+- get_many() is a single MGET, so a dashboard load is one round trip
+- a failing server is logged once and skipped for RETRY_AFTER seconds; the
+  local tiers keep working and every shared call just misses
+
+CACHE_BACKEND=redis (implied by REDIS_URL) needs the `redis` package;
+CACHE_BACKEND=memory uses MemoryStore, an in-process stand-in that is also
+what the tests and benchmarks run against.
+"""
+import fnmatch
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "2048"))
+# Key namespace, so one Redis can serve several deployments
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "econ-dashboard:")
+# Seconds to leave an unreachable server alone before trying again
+RETRY_AFTER = 30
+
+_JSON, _ZLIB = b"j", b"z"
+
+
+def encode(value, compress_min=COMPRESS_MIN_BYTES):
+    raw = json.dumps(value, separators=(",", ":")).encode()
+    if len(raw) >= compress_min:
+        return _ZLIB + zlib.compress(raw, 6)
+    return _JSON + raw
+
+
+def decode(blob):
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    if blob[:1] == _ZLIB:
+        return json.loads(zlib.decompress(blob[1:]))
+    if blob[:1] == _JSON:
+        return json.loads(blob[1:])
+    raise ValueError(f"unknown shared cache encoding {blob[:1]!r}")
+
+
+class MemoryStore:
+    """In-process stand-in for a Redis server: the commands SharedCache uses, with TTLs."""
+
+    def __init__(self):
+        self._data = {}  # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        item = self._data.get(key)
+        if item is not None and item[1] is not None and item[1] <= now:
+            del self._data[key]
+            return None
+        return item
+
+    def get(self, key):
+        with self._lock:
+            item = self._live(key, time.monotonic())
+        return item[0] if item else None
+
+    def mget(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            items = [self._live(key, now) for key in keys]
+        return [item[0] if item else None for item in items]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (bytes(value), time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match="*", count=None):
+        with self._lock:
+            keys = list(self._data)
+        return iter([key for key in keys if fnmatch.fnmatchcase(key, match)])
+
+    def pipeline(self, transaction=True):
+        return _MemoryPipeline(self)
+
+    def ping(self):
+        return True
+
+
+class _MemoryPipeline:
+    def __init__(self, store):
+        self._store = store
+        self._calls = []
+
+    def set(self, key, value, ex=None):
+        self._calls.append((key, value, ex))
+        return self
+
+    def execute(self):
+        return [self._store.set(*call) for call in self._calls]
+
+
+class SharedCache:
+    """JSON values under a key prefix on a Redis-protocol client (redis.Redis or MemoryStore).
+
+    Every method swallows client errors (see module docstring): reads miss, writes are dropped.
+    """
+
+    def __init__(self, client, name="redis", prefix=CACHE_PREFIX, compress_min=COMPRESS_MIN_BYTES,
+                 errors=(OSError,)):
+        self.client = client
+        self.name = name
+        self.prefix = prefix
+        self.compress_min = compress_min
+        self._errors = tuple(errors)
+        self._down_until = 0.0
+
+    def _available(self):
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action, e):
+        if self._available():
+            logger.warning("Shared cache (%s) %s failed, skipping it for %ds: %s", self.name, action, RETRY_AFTER, e)
+        self._down_until = time.monotonic() + RETRY_AFTER
+
+    def _decode(self, key, blob):
+        try:
+            return decode(blob)
+        except (ValueError, zlib.error) as e:
+            logger.warning("Bad shared cache entry %s: %s", key, e)
+            return None
+
+    def get(self, key):
+        return self.get_many([key])[0]
+
+    def get_many(self, keys):
+        """Values for keys (None where missing) in one MGET."""
+        if not keys or not self._available():
+            return [None] * len(keys)
+        try:
+            blobs = self.client.mget([self.prefix + key for key in keys])
+        except self._errors as e:
+            self._failed("read", e)
+            return [None] * len(keys)
+        return [self._decode(key, blob) for key, blob in zip(keys, blobs)]
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None):
+        """Store {key: value} in one pipelined round trip; ttl in seconds (None keeps them until evicted)."""
+        if not items or not self._available():
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self.prefix + key, encode(value, self.compress_min), ex=int(ttl) if ttl else None)
+            pipe.execute()
+        except self._errors as e:
+            self._failed("write", e)
+
+    def delete(self, key):
+        if not self._available():
+            return
+        try:
+            self.client.delete(self.prefix + key)
+        except self._errors as e:
+            self._failed("delete", e)
+
+    def clear(self):
+        """Delete every key under the prefix."""
+        if not self._available():
+            return
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*", count=500))
+            for i in range(0, len(keys), 500):
+                self.client.delete(*keys[i:i + 500])
+        except self._errors as e:
+            self._failed("clear", e)
+
+
+def from_env():
+    """SharedCache configured by CACHE_BACKEND / REDIS_URL, or None for local tiers only."""
+    backend = os.getenv("CACHE_BACKEND", "redis" if os.getenv("REDIS_URL") else "").lower()
+    if backend in ("", "none", "local"):
+        return None
+    if backend == "memory":
+        return SharedCache(MemoryStore(), name="memory")
+    if backend != "redis":
+        logger.warning("Unknown CACHE_BACKEND %r, using local cache only", backend)
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("CACHE_BACKEND=redis but the redis package isn't installed; using local cache only")
+        return None
+    client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                                  socket_timeout=1.0, socket_connect_timeout=1.0)
+    return SharedCache(client, name="redis", errors=(redis.RedisError, OSError))
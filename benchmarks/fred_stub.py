@@ -0,0 +1,210 @@
+"""
+Local stand-in for the FRED API, serving recorded observations.
+
+Fixtures live in fixtures/fred_observations.json as
+{"SERIES_ID|frequency|units": [[date, value], ...]}. Requests to
+/fred/series/observations are answered by slicing the matching recording to
+observation_start..observation_end, in FRED's own response shape (values as
+strings), so Series.fetch_data parses them exactly like live responses.
+/fred/series returns minimal metadata. Responses carry an ETag and
+If-None-Match gets a 304, for exercising conditional requests.
+
+Point the backend at it with FRED_BASE_URL (or by setting Series.base_url).
+
+Re-record from live FRED (needs FRED_KEY), or rebuild from the committed cache:
+    python -m benchmarks.fred_stub --record
+    python -m benchmarks.fred_stub --from-cache
+"""
+import re
+import sys
+import json
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "fred_observations.json"
+
+
+def fixture_key(series_id, frequency="m", units="lin"):
+    return f"{series_id}|{frequency or 'm'}|{units or 'lin'}"
+
+
+def load_fixtures(path=FIXTURE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+class FredStub:
+    """Threaded HTTP server on 127.0.0.1 (random port). `latency` seconds are added to every response."""
+
+    def __init__(self, fixtures=None, latency=0.0):
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                if parsed.path.endswith("/series/observations"):
+                    status, body = stub.observations(params)
+                elif parsed.path.endswith("/series"):
+                    status, body = stub.series_info(params)
+                else:
+                    status, body = 404, {"error_code": 404, "error_message": "Not Found"}
+                payload = json.dumps(body).encode()
+                # Recordings never change, so a content hash is a valid ETag
+                etag = '"%s"' % hashlib.md5(payload).hexdigest()[:16]
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/fred/"
+
+    def observations(self, params):
+        key = fixture_key(params.get("series_id"), params.get("frequency"), params.get("units"))
+        rows = self.fixtures.get(key)
+        if rows is None:
+            return 400, {"error_code": 400, "error_message": f"Bad Request. No recording for {key}."}
+        start = params.get("observation_start", "0000-00-00")
+        end = params.get("observation_end", "9999-99-99")
+        observations = [
+            {"realtime_start": start, "realtime_end": end, "date": d, "value": "." if v is None else str(v)}
+            for d, v in rows if start <= d <= end
+        ]
+        return 200, {"observation_start": start, "observation_end": end, "count": len(observations),
+                     "observations": observations}
+
+    def series_info(self, params):
+        series_id = params.get("series_id")
+        matches = [k for k in self.fixtures if k.split("|")[0] == series_id]
+        if not matches:
+            return 400, {"error_code": 400, "error_message": "Bad Request. The series does not exist."}
+        rows = self.fixtures[matches[0]]
+        return 200, {"seriess": [{
+            "id": series_id, "title": series_id, "units": "Recorded fixture",
+            "frequency_short": matches[0].split("|")[1].upper(),
+            "observation_start": rows[0][0] if rows else None,
+            "observation_end": rows[-1][0] if rows else None,
+            "last_updated": "2025-10-15 07:45:00-05",
+        }]}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _merge(fixtures, key, rows):
+    merged = dict(fixtures.get(key, []))
+    merged.update(rows)
+    fixtures[key] = sorted(merged.items())
+
+
+def _write(fixtures, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(fixtures, f, separators=(",", ":"), sort_keys=True)
+    print(f"Wrote {len(fixtures)} recordings to {path}")
+
+
+def record(path=FIXTURE_PATH):
+    """Record every range the app and stories use (seed_cache's plan) from live FRED."""
+    from scripts.seed_cache import build_plan
+
+    fixtures = {}
+    for job in build_plan():
+        series = job["class"](job["start"], job["end"], units=job["units"])
+        df = series.fetch_data()
+        _merge(fixtures, fixture_key(series.series_id, series.frequency, series.units),
+               {d.strftime("%Y-%m-%d"): float(v) for d, v in df["value"].items()})
+        print(f"recorded {series.series_id} {job['start']}..{job['end']} ({len(df)} observations)")
+    _write(fixtures, path)
+
+
+def from_cache(cache_dir=PROJECT_ROOT / "cache", path=FIXTURE_PATH):
+    """Build fixtures from the FRED responses already in the committed cache (no network needed)."""
+    from backend.app import series_map
+    from scripts.seed_cache import build_plan
+
+    # Story ranges can request other units than the class default (e.g. CPI pc1)
+    units_by_range = {(j["name"], j["frequency"], j["start"], j["end"]): j["units"]
+                      for j in build_plan(include_dashboard=False)}
+    pattern = re.compile(r"^(?P<name>[a-z0-9]+?)(?:_(?P<freq>[a-z]+))?_(?P<start>\d{4}-\d\d-\d\d)_(?P<end>\d{4}-\d\d-\d\d)\.json$")
+    fixtures = {}
+    for cache_path in sorted(Path(cache_dir).glob("*.json")):
+        match = pattern.match(cache_path.name)
+        if not match or match["name"] not in series_map:
+            continue
+        series_class = series_map[match["name"]]
+        frequency = match["freq"] or series_class.frequency
+        units = units_by_range.get((match["name"], match["freq"] or "", match["start"], match["end"]), series_class.units)
+        with open(cache_path) as f:
+            data = json.load(f)["data"]
+        data = data.get("data", data)  # observations entry or legacy bare DataFrame dict
+        _merge(fixtures, fixture_key(series_class.series_id, frequency, units),
+               {d[:10]: v for d, v in data.get("value", {}).items() if v is not None})
+    _write(fixtures, path)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="FRED stub server / fixture recorder")
+    parser.add_argument("--record", action="store_true", help="re-record fixtures from live FRED")
+    parser.add_argument("--from-cache", action="store_true", help="rebuild fixtures from the committed cache")
+    parser.add_argument("--serve", action="store_true", help="serve the fixtures until interrupted")
+    args = parser.parse_args()
+    if args.record:
+        record()
+    elif args.from_cache:
+        from_cache()
+    elif args.serve:
+        with FredStub() as stub:
+            print(f"Serving recorded FRED fixtures at {stub.base_url} (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+    else:
+        parser.print_help()
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the backend hot paths.
+
+Everything runs offline and deterministically. FRED is replaced by the local
+stub (benchmarks/fred_stub.py) serving recorded fixtures, OpenAI by
+MockLLMClient, and each case gets its own throwaway BackendCache. The handlers
+are called directly, without the HTTP layer.
+
+Cases:
+    series_cold / series_warm  /series/{name}: FRED fetch + trend + AI layer vs cache hit
+    series_refetch             /series/{name} with an empty backend cache but the raw FRED response cached
+    overall_cold / overall_warm  /insights/overall
+    overall_shared_cold        /insights/overall on a cold instance backed by a warm shared tier (MemoryStore)
+    cache_get                  BackendCache.get with 10..10,000 files (exact hit, covering range, miss)
+    sanitize                   _sanitize_for_json on payloads containing NaN
+    compute_trend              Trendanalyzer.compute_trend on 1k..1M points
+    story_generation           all stories through run_pipeline from a warm cache
+    cold_start                 fresh interpreter to first cached /series (scripts/bench_startup.py)
+
+Results are written as JSON (medians, p95, ...) so two commits can be compared:
+    python benchmarks/run_benchmarks.py --json before.json
+    git checkout other-branch
+    python benchmarks/run_benchmarks.py --json after.json --compare before.json
+
+Use --quick for a short smoke run and --only to pick cases by name prefix.
+"""
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import warnings
+import contextlib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Must be set before the backend is imported
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+os.environ["OPENAI_MOCK"] = "1"
+# Dashboard loads would otherwise queue background analytics that skew the timings
+os.environ["PRECOMPUTE_ANALYTICS"] = "0"
+# NaN-heavy inputs make NumPy warn on every run
+warnings.filterwarnings("ignore", category=RuntimeWarning)
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fred_stub import FredStub
+from backend import app
+from backend.cache import BackendCache
+from backend.shared_cache import MemoryStore, SharedCache
+from backend.series import base_series
+from backend.series.http_cache import FredHttpCache
+from backend.analytics import insights, health_score
+from backend.analytics.llm_guard import GuardedLLMClient
+from backend.analytics.mock_llm import MockLLMClient
+from backend.analytics.trend_analysis import Trendanalyzer
+
+# The ranges recorded in the fixtures (the committed dashboard cache window)
+DASHBOARD_START, DASHBOARD_END = "2020-10-15", "2025-10-15"
+SERIES_CASES = ["unemployment", "cpi", "gdp", "t10y3m"]
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    ms = [s * 1000 for s in samples]
+    return {
+        "n": len(ms),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms": round(_percentile(ms, 0.95), 4),
+        "min_ms": round(min(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+    }
+
+
+def measure(fn, repeat, setup=None, warmup=1):
+    """Run fn `repeat` times (after `warmup` untimed runs); setup() runs untimed before every call."""
+    samples = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+class Bench:
+    """Shared fixtures: the FRED stub, a fresh cache per cold run and the mock LLM."""
+
+    def __init__(self, workdir, stub):
+        self.workdir = Path(workdir)
+        self.stub = stub
+        self._caches = 0
+        base_series.Series.base_url = stub.base_url
+        base_series.FRED_KEY = "benchmark"
+        # Mock LLM behind the real guard, with limits high enough that it never throttles a run
+        insights._client = GuardedLLMClient(MockLLMClient(), rate_per_minute=1e9, burst=10**9)
+        insights._client_loaded = True
+
+    def fresh_cache(self, http_cache=False):
+        """New empty BackendCache; http_cache=True keeps the raw FRED responses fetched so far."""
+        self._caches += 1
+        cache = BackendCache(str(self.workdir / f"cache{self._caches}"))
+        app.backend_cache = cache
+        if not http_cache:
+            base_series.fred_http_cache = FredHttpCache(str(self.workdir / f"http{self._caches}"))
+        return cache
+
+    def reset(self, http_cache=False):
+        """Cold state: empty backend cache and no in-process memo caches (http_cache: see fresh_cache)."""
+        old, old_http = app.backend_cache, base_series.fred_http_cache
+        self.fresh_cache(http_cache)
+        if isinstance(old, BackendCache) and old.cache_dir.is_relative_to(self.workdir):
+            shutil.rmtree(old.cache_dir, ignore_errors=True)
+        if base_series.fred_http_cache is not old_http and old_http.cache_dir.is_relative_to(self.workdir):
+            shutil.rmtree(old_http.cache_dir, ignore_errors=True)
+        insights._ai_insights_cache.clear()
+        health_score._health_cache.clear()
+
+
+def bench_series(bench, repeat):
+    results = {}
+    for name in SERIES_CASES:
+        call = lambda: app.get_series(name, DASHBOARD_START, DASHBOARD_END)
+        results[f"series_cold/{name}"] = (measure(call, repeat, setup=bench.reset), {"series": name})
+        bench.reset()
+        results[f"series_warm/{name}"] = (measure(call, repeat * 5), {"series": name})
+        # Backend cache gone but the raw FRED response still stored (a script or another path fetched it)
+        results[f"series_refetch/{name}"] = (measure(call, repeat, setup=lambda: bench.reset(http_cache=True)),
+                                             {"series": name})
+    return results
+
+
+def bench_overall(bench, repeat):
+    call = lambda: app.overall_insight(DASHBOARD_START, DASHBOARD_END)
+    cold = measure(call, repeat, setup=bench.reset)
+    bench.reset()
+    warm = measure(call, repeat * 5)
+    params = {"start": DASHBOARD_START, "end": DASHBOARD_END}
+    return {"overall_cold": (cold, params), "overall_warm": (warm, params)}
+
+
+def bench_cache_get(bench, repeat, sizes):
+    results = {}
+    entry = BackendCache.observations_entry(pd.DataFrame({"value": np.linspace(1, 2, 60)},
+                                                         index=pd.date_range("2000-01-01", periods=60, freq="MS")), "m")
+    for n in sizes:
+        cache = BackendCache(str(bench.workdir / f"cache_get_{n}"))
+        # n one-year files for the same series, so covering lookups have to scan all of them
+        for i in range(n):
+            start = pd.Timestamp("1900-01-01") + pd.Timedelta(days=i)
+            end = start + pd.Timedelta(days=365)
+            cache.set("bench", start.date().isoformat(), end.date().isoformat(), entry, "m")
+        first_end = (pd.Timestamp("1900-01-01") + pd.Timedelta(days=365)).date().isoformat()
+        last = pd.Timestamp("1900-01-01") + pd.Timedelta(days=n - 1)
+        lookups = {
+            "hit": ("1900-01-01", first_end),
+            "covering": ((last + pd.Timedelta(days=100)).date().isoformat(), (last + pd.Timedelta(days=200)).date().isoformat()),
+            "miss": ("1800-01-01", "1800-12-31"),
+        }
+        for kind, (start, end) in lookups.items():
+            samples = measure(lambda: cache.get("bench", start, end, "m"), repeat * 10)
+            results[f"cache_get/{kind}/{n}"] = (samples, {"files": n, "lookup": kind})
+        shutil.rmtree(cache.cache_dir, ignore_errors=True)
+    return results
+
+
+def bench_shared(bench, repeat):
+    """/insights/overall on a cold instance (empty memory and disk) whose neighbour already loaded the dashboard."""
+    shared = SharedCache(MemoryStore(), name="memory")
+    call = lambda: app.overall_insight(DASHBOARD_START, DASHBOARD_END)
+
+    def cold_instance():
+        bench.reset()
+        app.backend_cache.shared = shared
+
+    cold_instance()
+    call()  # the neighbour
+    samples = measure(call, repeat, setup=cold_instance, warmup=0)
+    bench.reset()
+    return {"overall_shared_cold": (samples, {"start": DASHBOARD_START, "end": DASHBOARD_END, "backend": "memory"})}
+
+
+def _nan_payload(points, rng):
+    values = rng.normal(size=points)
+    values[rng.random(points) < 0.05] = np.nan
+    dates = pd.date_range("1990-01-01", periods=points, freq="D").astype(str)
+    return {"data": {"value": dict(zip(dates, values.tolist()))},
+            "trend": {"rolling": values.tolist(), "summary": {"mean": float("nan"), "max": float("inf")}}}
+
+
+def bench_sanitize(bench, repeat, sizes):
+    rng = np.random.default_rng(0)
+    results = {}
+    for points in sizes:
+        payload = _nan_payload(points, rng)
+        results[f"sanitize/{points}"] = (measure(lambda: app._sanitize_for_json(payload), repeat), {"points": points})
+    return results
+
+
+def bench_trend(bench, repeat, sizes):
+    rng = np.random.default_rng(0)
+    results = {}
+    for points in sizes:
+        dates = pd.date_range("1900-01-01", periods=points, freq="h" if points > 50_000 else "D")
+        df = pd.DataFrame({"value": 100 + rng.normal(size=points).cumsum()}, index=dates)
+        reps = max(1, repeat if points <= 100_000 else repeat // 3)
+        results[f"compute_trend/{points}"] = (measure(lambda: Trendanalyzer(df).compute_trend(), reps),
+                                              {"points": points})
+    return results
+
+
+def bench_contention(bench, repeat, points):
+    """Warm /series hits while two other threads keep running changepoint analysis on a long daily series.
+
+    "inline" runs that analysis on the threads themselves (competing for the GIL),
+    "pool" sends it to worker processes the way the backend does.
+    """
+    import threading
+    from backend.analytics.changepoints import analyze
+    from backend.analytics.pool import AnalyticsPool
+
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("1970-01-01") + np.arange(points)
+    values = 100 + rng.normal(size=points).cumsum()
+    call = lambda: app.get_series("cpi", DASHBOARD_START, DASHBOARD_END)
+    call()
+    results = {"contention/idle": (measure(call, repeat * 20), {})}
+    for mode, workers in (("inline", 0), ("pool", 2)):
+        pool = AnalyticsPool(workers=workers)
+        pool.run(analyze, dates, values, "d")  # start the workers before timing
+        stop = threading.Event()
+
+        def load():
+            while not stop.is_set():
+                pool.run(analyze, dates, values, "d")
+
+        threads = [threading.Thread(target=load, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        try:
+            results[f"contention/{mode}"] = (measure(call, repeat * 20), {"points": points, "workers": workers})
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            pool.shutdown()
+    return results
+
+
+def _seed_story_cache(cache_dir):
+    """Copy the committed observation cache with fresh timestamps, so nothing is expired."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for path in (PROJECT_ROOT / "cache").glob("*.json"):
+        with open(path) as f:
+            entry = json.load(f)
+        entry["timestamp"] = time.time()
+        with open(cache_dir / path.name, "w") as f:
+            json.dump(entry, f)
+
+
+def bench_stories(bench, repeat):
+    import scripts.generate_story_data as gsd
+    from scripts.story_config import STORIES
+    from scripts.story_manifest import write_story_file
+
+    cache_dir = bench.workdir / "story_cache"
+    out_dir = bench.workdir / "story_out"
+    out_dir.mkdir(exist_ok=True)
+    _seed_story_cache(cache_dir)
+    original = gsd.backend_cache
+    gsd.backend_cache = BackendCache(str(cache_dir))
+
+    def run():
+        # The generator is chatty; keep its progress output out of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            gsd.run_pipeline(
+                STORIES,
+                {story_id: builder for story_id, (builder, _) in gsd.STORY_BUILDERS.items()},
+                gsd.fetch_series_data,
+                lambda story_id, data: write_story_file(out_dir, story_id, data),
+            )
+    try:
+        samples = measure(run, repeat)
+    finally:
+        gsd.backend_cache = original
+    return {"story_generation": (samples, {"stories": len(gsd.STORY_BUILDERS)})}
+
+
+def bench_cold_start(bench, repeat):
+    from scripts import bench_startup
+
+    cache_dir = bench.workdir / "startup_cache"
+    cache_dir.mkdir()
+    bench_startup.seed_cache(cache_dir)
+    runs = [bench_startup.run_child(cache_dir) for _ in range(repeat)]
+    return {
+        "cold_start/import": ([r["import_s"] for r in runs], {}),
+        "cold_start/first_series": ([r["total_s"] for r in runs], {}),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["cases"]
+    print(f"\nCompared with {baseline_path} (median, new / old):")
+    for name, case in results.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"  {name:<34} {case['median_ms']:>11.3f} ms   (new case)")
+            continue
+        ratio = case["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        flag = "  slower" if ratio > 1.1 else "  faster" if ratio < 0.9 else ""
+        print(f"  {name:<34} {old['median_ms']:>11.3f} -> {case['median_ms']:>11.3f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backend hot paths against a stub FRED server")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and smaller sizes (smoke run)")
+    parser.add_argument("--repeat", type=int, help="timed runs per case (default 10, 3 with --quick)")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="only cases whose name starts with one of these")
+    parser.add_argument("--no-cold-start", action="store_true", help="skip the subprocess cold-start case")
+    parser.add_argument("--fred-latency", type=float, default=0.0, help="seconds added to every stub FRED response")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="print the change against an earlier --json result")
+    args = parser.parse_args()
+
+    repeat = args.repeat or (3 if args.quick else 10)
+    file_counts = [10, 100, 1000] if args.quick else [10, 100, 1000, 10_000]
+    point_counts = [1_000, 10_000, 100_000] if args.quick else [1_000, 10_000, 100_000, 1_000_000]
+
+    suites = [
+        ("series", lambda b: bench_series(b, repeat)),
+        ("overall", lambda b: bench_overall(b, repeat)),
+        ("cache_get", lambda b: bench_cache_get(b, repeat, file_counts)),
+        ("overall_shared", lambda b: bench_shared(b, repeat)),
+        ("sanitize", lambda b: bench_sanitize(b, repeat, point_counts)),
+        ("compute_trend", lambda b: bench_trend(b, repeat, point_counts)),
+        ("contention", lambda b: bench_contention(b, repeat, 10_000 if args.quick else 40_000)),
+        ("story_generation", lambda b: bench_stories(b, repeat)),
+    ]
+    if not args.no_cold_start:
+        suites.append(("cold_start", lambda b: bench_cold_start(b, repeat)))
+    if args.only:
+        suites = [(name, fn) for name, fn in suites if any(name.startswith(p) or p.startswith(name) for p in args.only)]
+
+    results = {}
+    started = time.time()
+    with tempfile.TemporaryDirectory() as workdir, FredStub(latency=args.fred_latency) as stub:
+        bench = Bench(workdir, stub)
+        bench.reset()
+        for suite, fn in suites:
+            print(f"Running {suite}...", flush=True)
+            for name, (samples, params) in fn(bench).items():
+                if args.only and not any(name.startswith(p) for p in args.only):
+                    continue
+                results[name] = dict(summarize(samples), params=params)
+                r = results[name]
+                print(f"  {name:<34} median {r['median_ms']:>11.3f} ms   p95 {r['p95_ms']:>11.3f} ms   (n={r['n']})")
+
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+            "repeat": repeat,
+            "fred_latency": args.fred_latency,
+            "elapsed_s": round(time.time() - started, 2),
+        },
+        "cases": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.json}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,16 @@ import React, { useEffect, useState } from "react";
 import { Link } from "react-router-dom";
 import ChartCard from "../components/ChartCard";
 
+// Attach per-series narratives from /insights/batch onto the loaded series payloads
+const mergeAIInsights = (prev, seriesInsights) => {
+  if (!seriesInsights) return prev;
+  const next = { ...prev };
+  Object.entries(seriesInsights).forEach(([s, text]) => {
+    if (next[s]) next[s] = { ...next[s], ai_insight: text };
+  });
+  return next;
+};
+
 export default function Dashboard() {
   const [data, setData] = useState({});
   const [loading, setLoading] = useState(true);
@@ -109,7 +119,7 @@ export default function Dashboard() {
         try {
           console.log(`Fetching ${s}...`);
           setLoadingProgress(prev => ({ ...prev, [s]: 'loading' }));
-          const response = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/series/${s}?start=${start}&end=${end}&use_cache=true&include_ai=${enableAI}`);
+          const response = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/series/${s}?start=${start}&end=${end}&use_cache=true&include_ai=false`);
           const result = await response.json();
           console.log(`${s} loaded successfully:`, result);
           setLoadingProgress(prev => ({ ...prev, [s]: 'loaded' }));
@@ -136,14 +146,15 @@ export default function Dashboard() {
       
       // Cache stats not needed with Render backend
 
-      // Fetch overall AI insight (only if AI is enabled)
+      // Fetch all AI insights in one batched request (only if AI is enabled)
       if (enableAI) {
         try {
-          console.log('Fetching overall AI insight...');
-          const res = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/insights/overall?start=${start}&end=${end}&use_cache=true`);
-          console.log('Overall AI insight response status:', res.status);
+          console.log('Fetching batched AI insights...');
+          const res = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/insights/batch?start=${start}&end=${end}&use_cache=true`);
+          console.log('Batched AI insight response status:', res.status);
           const payload = await res.json();
-          console.log('Overall AI insight payload:', payload);
+          console.log('Batched AI insight payload:', payload);
+          setData((prev) => mergeAIInsights(prev, payload.series));
           setOverallInsight(payload);
         } catch (e) {
           console.warn('Overall AI insight fetch failed:', e);
@@ -178,7 +189,7 @@ export default function Dashboard() {
       try {
         console.log(`Refreshing ${s}...`);
         setLoadingProgress(prev => ({ ...prev, [s]: 'loading' }));
-        const response = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/series/${s}?start=${start}&end=${end}&use_cache=false&include_ai=${enableAI}`);
+        const response = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/series/${s}?start=${start}&end=${end}&use_cache=false&include_ai=false`);
         const result = await response.json();
         setLoadingProgress(prev => ({ ...prev, [s]: 'loaded' }));
         return { series: s, data: result };
@@ -200,14 +211,15 @@ export default function Dashboard() {
 
     // Cache stats not needed with Render backend
 
-    // Refresh overall AI insight (only if AI is enabled)
+    // Refresh all AI insights in one batched request (only if AI is enabled)
     if (enableAI) {
       try {
-        console.log('Refreshing overall AI insight...');
-        const res = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/insights/overall?start=${start}&end=${end}&use_cache=false`);
-        console.log('Overall AI insight refresh response status:', res.status);
+        console.log('Refreshing batched AI insights...');
+        const res = await fetch(`${import.meta.env.VITE_API_BASE || 'https://fred-watch-api.onrender.com'}/insights/batch?start=${start}&end=${end}&use_cache=false`);
+        console.log('Batched AI insight refresh response status:', res.status);
         const payload = await res.json();
-        console.log('Overall AI insight refresh payload:', payload);
+        console.log('Batched AI insight refresh payload:', payload);
+        setData((prev) => mergeAIInsights(prev, payload.series));
         setOverallInsight(payload);
       } catch (e) {
         console.warn('Overall AI insight fetch failed:', e);
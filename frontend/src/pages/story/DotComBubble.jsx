@@ -2,7 +2,7 @@ import React, { useState, useEffect } from "react";
 import StoryHeader from "../../components/story/StoryHeader";
 import StoryChart from "../../components/story/StoryChart";
 import Timeline from "../../components/story/Timeline";
-import { loadStoryData, formatChartData } from "../../utils/storyUtils";
+import { loadStoryData, loadStoryFrame, formatChartData } from "../../utils/storyUtils";
 
 // Chart configuration
 const CHART_CONFIG = {
@@ -127,44 +127,53 @@ export default function DotComBubble() {
     }
   ];
 
+  const [story, setStory] = useState(null);
+
   useEffect(() => {
-    async function loadAllData() {
+    async function loadIndex() {
       try {
+        // Index: metadata plus every series over the whole 1995-2004 period, so the
+        // context chart is complete before any frame is selected
         const storyData = await loadStoryData('dotcom');
-        
-        // Combine all time frame data to create full period data (1995-2004)
-        const fullPeriodData = {};
-        
-        // Start with fullPeriodData if available (for NASDAQ)
-        if (storyData.fullPeriodData) {
-          Object.assign(fullPeriodData, storyData.fullPeriodData);
-        }
-        
-        // Combine all time frames for each series
-        storyData.timeFrames.forEach((frame) => {
-          Object.keys(frame.data).forEach((seriesName) => {
-            if (!fullPeriodData[seriesName]) {
-              fullPeriodData[seriesName] = { value: {} };
-            }
-            
-            const frameData = frame.data[seriesName];
-            if (frameData && frameData.value) {
-              // Merge all values, keeping the latest if there are duplicates
-              Object.assign(fullPeriodData[seriesName].value, frameData.value);
-            }
-          });
-        });
-        
-        setData(fullPeriodData);
-        setLoading(false);
+        setStory(storyData);
+        setData((prev) => ({ ...storyData.fullPeriodData, ...prev }));
       } catch (error) {
         console.error("Error loading dot-com bubble data:", error);
         setLoading(false);
       }
     }
-    loadAllData();
+    loadIndex();
   }, []);
 
+  useEffect(() => {
+    if (!story) return;
+    let cancelled = false;
+
+    // Fetch whatever only the selected time frame has and merge it into the full-period data
+    loadStoryFrame(story, selectedTimeFrame)
+      .then((frameData) => {
+        if (cancelled) return;
+        setData((prev) => {
+          const merged = { ...prev };
+          Object.keys(frameData).forEach((seriesName) => {
+            merged[seriesName] = {
+              value: { ...(merged[seriesName]?.value || {}), ...frameData[seriesName].value }
+            };
+          });
+          return merged;
+        });
+        setLoading(false);
+      })
+      .catch((error) => {
+        console.error("Error loading dot-com bubble time frame:", error);
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [story, selectedTimeFrame]);
+
   const currentTimeFrame = timeFrames[selectedTimeFrame];
 
   // Get charts to display for current time frame
@@ -56,20 +56,126 @@ export function formatChartData(seriesData) {
   }).filter(Boolean); // Remove any null entries
 }
 
+let manifestPromise = null;
+
+/**
+ * Load the story data manifest (maps story id -> content-hashed file name)
+ * @returns {Promise<Object|null>} Manifest, or null if unavailable
+ */
+function loadManifest() {
+  if (!manifestPromise) {
+    // The manifest is the only file that must be revalidated; the files it points to are immutable
+    manifestPromise = fetch('/story-data/manifest.json', { cache: 'no-cache' })
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * Decode one compact columnar series (see scripts/story_format.py)
+ * @param {Object} encoded - { origin, unit: 'month'|'day', step | offsets, values }
+ * @returns {Object|null} Series in format { value: { "YYYY-MM-DD": value, ... } }
+ */
+export function decodeSeries(encoded) {
+  if (!encoded) {
+    return null;
+  }
+  // Files from before the compact format already hold { value: {...} }
+  if (encoded.value) {
+    return encoded;
+  }
+
+  const [year, month, day] = encoded.origin.split('-').map(Number);
+  const originMs = Date.UTC(year, month - 1, day);
+  const step = encoded.step || 1;
+  const value = {};
+  encoded.values.forEach((v, i) => {
+    const offset = encoded.offsets ? encoded.offsets[i] : i * step;
+    const date = encoded.unit === 'month'
+      ? new Date(Date.UTC(year, month - 1 + offset, 1))
+      : new Date(originMs + offset * DAY_MS);
+    value[date.toISOString().slice(0, 10)] = v;
+  });
+  return { value };
+}
+
+function decodeSeriesMap(seriesMap) {
+  const decoded = {};
+  Object.entries(seriesMap || {}).forEach(([name, encoded]) => {
+    const series = decodeSeries(encoded);
+    if (series) {
+      decoded[name] = series;
+    }
+  });
+  return decoded;
+}
+
 /**
  * Load story data from static JSON file
+ * Series in `data` / `fullPeriodData` are decoded. `fullPeriodData` covers the whole
+ * story (what the context chart draws); time frames only carry their metadata and,
+ * if they have series of their own, a `chunk` file name - use loadStoryFrame for those.
  * @param {string} storyId - Story identifier (e.g., 'dotcom', 'gfc')
  * @returns {Promise<Object>} Story data
  */
 export async function loadStoryData(storyId) {
   try {
-    const response = await fetch(`/story-data/${storyId}.json`);
+    const manifest = await loadManifest();
+    const file = manifest?.stories?.[storyId]?.file || `${storyId}.json`;
+    const response = await fetch(`/story-data/${file}`);
     if (!response.ok) {
       throw new Error(`Failed to load story data: ${response.status}`);
     }
-    return await response.json();
+    const story = await response.json();
+    if (story.data) {
+      story.data = decodeSeriesMap(story.data);
+    }
+    if (story.fullPeriodData) {
+      story.fullPeriodData = decodeSeriesMap(story.fullPeriodData);
+    }
+    return story;
   } catch (error) {
     console.error(`Error loading story data for ${storyId}:`, error);
     throw error;
   }
 }
+
+const frameCache = new Map();
+
+/**
+ * Load the series for one time frame of a story (fetched lazily, once per chunk)
+ * @param {Object} story - Story returned by loadStoryData
+ * @param {number} index - Time frame index
+ * @returns {Promise<Object>} { seriesName: { value: {...} } }
+ */
+export function loadStoryFrame(story, index) {
+  const frame = story?.timeFrames?.[index];
+  if (!frame) {
+    return Promise.resolve({});
+  }
+  // Older single-file stories embed the frame data directly; frames with nothing
+  // beyond fullPeriodData have neither
+  if (!frame.chunk) {
+    return Promise.resolve(decodeSeriesMap(frame.data));
+  }
+  if (!frameCache.has(frame.chunk)) {
+    const promise = fetch(`/story-data/${frame.chunk}`)
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Failed to load story frame: ${response.status}`);
+        }
+        return response.json();
+      })
+      .then((chunk) => decodeSeriesMap(chunk.data))
+      .catch((error) => {
+        // Let a later selection retry
+        frameCache.delete(frame.chunk);
+        throw error;
+      });
+    frameCache.set(frame.chunk, promise);
+  }
+  return frameCache.get(frame.chunk);
+}
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the backend.
+
+Each run is a fresh interpreter that imports backend.app, then serves /health
+and a cached /series hit (handlers called directly, against a throwaway cache
+seeded here). We record how long each step takes and which heavy modules are
+loaded by then. SciPy and the OpenAI SDK must not be imported before the cached
+/series response; the script exits 1 if they are.
+
+Usage:
+    python scripts/bench_startup.py                 # 5 cold runs, median timings
+    python scripts/bench_startup.py --runs 10 --json startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+HEAVY_MODULES = ["pandas", "scipy", "openai"]
+# Must still be unloaded once /health and a cached /series hit have been served
+FORBIDDEN_MODULES = ["scipy", "openai"]
+
+SERIES, START, END, FREQUENCY = "unemployment", "2020-01-01", "2024-12-31", "m"
+
+# Runs inside the fresh interpreter; prints one JSON line
+CHILD = """
+import sys, time, json
+heavy = %(heavy)r
+loaded = lambda: [m for m in heavy if m in sys.modules]
+t0 = time.perf_counter()
+import backend.app as app
+t1 = time.perf_counter()
+after_import = loaded()
+from backend.cache import BackendCache
+app.backend_cache = BackendCache(%(cache_dir)r)
+app.health_check()
+t2 = time.perf_counter()
+after_health = loaded()
+payload = app.get_series(%(series)r, %(start)r, %(end)r, include_ai=False)
+t3 = time.perf_counter()
+print(json.dumps({
+    "import_s": t1 - t0, "health_s": t2 - t1, "series_s": t3 - t2, "total_s": t3 - t0,
+    "after_import": after_import, "after_health": after_health, "after_series": loaded(),
+    "points": len(payload["data"]["value"]),
+}))
+"""
+
+
+def seed_cache(cache_dir):
+    """Cache one synthetic series and derive its trend/insight layers once (warm run)."""
+    import pandas as pd
+    from backend.cache import BackendCache
+
+    dates = pd.date_range(START, END, freq="MS")
+    df = pd.DataFrame({"value": [4.0 + (i % 12) / 10 for i in range(len(dates))]}, index=dates)
+    BackendCache(cache_dir).set_observations(SERIES, START, END, df, FREQUENCY)
+    run_child(cache_dir)
+
+
+def run_child(cache_dir):
+    code = CHILD % {"heavy": HEAVY_MODULES, "cache_dir": str(cache_dir), "series": SERIES, "start": START, "end": END}
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), OPENAI_KEY="", OPENAI_MOCK="")
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold start")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold interpreter runs")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        seed_cache(cache_dir)
+        runs = [run_child(cache_dir) for _ in range(args.runs)]
+
+    summary = {key: statistics.median(r[key] for r in runs) for key in ("import_s", "health_s", "series_s", "total_s")}
+    leaked = sorted({m for r in runs for m in r["after_series"] if m in FORBIDDEN_MODULES})
+    result = {"runs": runs, "median": summary, "forbidden_loaded": leaked, "ok": not leaked}
+
+    print(f"Cold start over {args.runs} runs (median):")
+    print(f"  import backend.app   {summary['import_s'] * 1000:8.1f} ms")
+    print(f"  first /health        {summary['health_s'] * 1000:8.1f} ms")
+    print(f"  first cached /series {summary['series_s'] * 1000:8.1f} ms")
+    print(f"  total                {summary['total_s'] * 1000:8.1f} ms")
+    last = runs[-1]
+    print(f"Heavy modules loaded: after import {last['after_import'] or 'none'}, "
+          f"after /health {last['after_health'] or 'none'}, after /series {last['after_series'] or 'none'}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    if leaked:
+        print(f"[ERROR] {', '.join(leaked)} imported before the cached /series response")
+        return 1
+    print("[SUCCESS] SciPy and OpenAI stay unloaded")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,18 @@
 """
 Generate static JSON files for Story Mode.
 Fetches historical data from cache or FRED API and saves to frontend/public/story-data/
+Every (series, range) the stories need is fetched once, in parallel, and each story is
+assembled from memory (see story_pipeline.py). Stories whose config and inputs are
+unchanged since the last run are skipped, and outputs are written under content-hashed
+names listed in manifest.json (see story_manifest.py), in the compact columnar
+format from story_format.py.
 """
 import sys
 import json
 import math
+import time
+import argparse
 from pathlib import Path
-from datetime import datetime
 
 # Add backend to path
 backend_dir = Path(__file__).parent.parent / "backend"
@@ -15,6 +21,11 @@ sys.path.insert(0, str(backend_dir.parent))
 
 from backend.cache import backend_cache
 from scripts.story_config import STORIES
+from scripts.story_pipeline import run_pipeline, DEFAULT_WORKERS
+from scripts.verify_story_data import verify_all, print_summary
+from scripts.story_manifest import (
+    config_hash, data_version, load_manifest, save_manifest, is_up_to_date, write_story_file
+)
 
 def format_data_for_frontend(series_obj):
     """Convert backend Series object to frontend-friendly format"""
@@ -43,12 +54,12 @@ def format_data_for_frontend(series_obj):
     
     return {"value": value_dict} if value_dict else None
 
-def fetch_series_data(series_class, start_date, end_date, series_name, frequency=""):
-    """Fetch series data, preferring cache"""
-    print(f"  Fetching {series_name} from {start_date} to {end_date}...")
+def fetch_series_data(series_class, start_date, end_date, series_name, frequency="", units="lin"):
+    """Fetch series data in FRED `units`, preferring cache"""
+    print(f"  Fetching {series_name} from {start_date} to {end_date}" + (f" [{units}]..." if units != "lin" else "..."))
     
-    # Try cache first
-    cached = backend_cache.get(series_name, start_date, end_date, frequency)
+    # Try cache first (only entries stored in the same units)
+    cached = backend_cache.get(series_name, start_date, end_date, frequency, units=units)
     if cached and cached.get("data"):
         print(f"    Using cached data")
         cache_data = cached.get("data", {})
@@ -95,7 +106,7 @@ def fetch_series_data(series_class, start_date, end_date, series_name, frequency
     # Fallback to fetching from FRED
     print(f"    Fetching from FRED API...")
     try:
-        series = series_class(start_date, end_date)
+        series = series_class(start_date, end_date, frequency=frequency or None, units=units)
         data = series.fetch_data()
         if data is None or len(data) == 0:
             print(f"    WARNING: No data returned")
@@ -105,8 +116,40 @@ def fetch_series_data(series_class, start_date, end_date, series_name, frequency
         print(f"    ERROR: {e}")
         return None
 
-def generate_dotcom_story():
+def index_series_data(series_data):
+    """Parse a {"value": {date: v}} payload once into (DatetimeIndex, keys, values), sorted by date."""
+    import numpy as np
+    import pandas as pd
+
+    if not series_data or not series_data.get("value"):
+        return None
+    keys = np.array(list(series_data["value"].keys()), dtype=object)
+    values = np.array(list(series_data["value"].values()), dtype=object)
+    index = pd.to_datetime(pd.Index(keys), format="mixed", errors="coerce")
+    valid = ~index.isna()
+    order = np.argsort(index[valid].values, kind="stable")
+    return index[valid][order], keys[valid][order], values[valid][order]
+
+def slice_indexed(indexed, start_date, end_date):
+    """Cut an indexed series to [start_date, end_date] (whole end day included) by binary search."""
+    import pandas as pd
+
+    if indexed is None:
+        return None
+    index, keys, values = indexed
+    lo = index.searchsorted(pd.Timestamp(start_date), side="left")
+    hi = index.searchsorted(pd.Timestamp(end_date) + pd.Timedelta(days=1), side="left")
+    if hi <= lo:
+        return None
+    return {"value": dict(zip(keys[lo:hi].tolist(), values[lo:hi].tolist()))}
+
+def story_envelope(time_frames):
+    """Earliest start and latest end across a story's time frames."""
+    return min(tf["startDate"] for tf in time_frames), max(tf["endDate"] for tf in time_frames)
+
+def generate_dotcom_story(fetch=None):
     """Generate static JSON for dot-com bubble story"""
+    fetch = fetch or fetch_series_data
     print("\n=== Generating Dot-Com Bubble Story Data ===")
     
     story_config = STORIES["dotcom"]
@@ -123,11 +166,28 @@ def generate_dotcom_story():
             end_date = series_config.get("endDate", story_config["timeFrames"][-1]["endDate"])
             frequency = series_config.get("frequency", "")
             
-            data = fetch_series_data(series_class, start_date, end_date, series_name, frequency)
+            data = fetch(series_class, start_date, end_date, series_name, frequency,
+                         series_config.get("units", "lin"))
             if data:
                 story_data["fullPeriodData"][series_name] = data
+
+    # Fetch each time-frame series once over the whole story. It goes in fullPeriodData, so the
+    # context chart always has the whole period; frames only carry what that doesn't cover
+    env_start, env_end = story_envelope(story_config["timeFrames"])
+    envelope_data = {}
+    for tf_config in story_config["timeFrames"]:
+        for series_name, series_config in tf_config["series"].items():
+            if series_name in envelope_data:
+                continue
+            data = fetch(series_config["class"], env_start, env_end, series_name, series_config.get("frequency", ""),
+                         series_config.get("units", "lin"))
+            envelope_data[series_name] = index_series_data(data)
+            # Cached entries may cover more than the story
+            full = slice_indexed(envelope_data[series_name], env_start, env_end)
+            if full:
+                story_data["fullPeriodData"][series_name] = full
     
-    # Fetch data for each time frame
+    # Build each time frame
     for tf_config in story_config["timeFrames"]:
         print(f"\nProcessing time frame: {tf_config['id']}")
         frame_data = {
@@ -141,52 +201,24 @@ def generate_dotcom_story():
             "data": {}
         }
         
-        # Fetch series data for this time frame
         for series_name, series_config in tf_config["series"].items():
-            series_class = series_config["class"]
-            frequency = series_config.get("frequency", "")
-            data = fetch_series_data(
-                series_class, tf_config["startDate"], tf_config["endDate"], series_name, frequency
+            if series_name in story_data["fullPeriodData"]:
+                continue
+            # Envelope unavailable (e.g. not cached and FRED unreachable); try the frame's own range
+            data = fetch(
+                series_config["class"], tf_config["startDate"], tf_config["endDate"],
+                series_name, series_config.get("frequency", ""), series_config.get("units", "lin")
             )
             if data:
                 frame_data["data"][series_name] = data
         
-        # Filter full period data for this time frame
-        for series_name, full_data in story_data["fullPeriodData"].items():
-            if full_data and full_data.get("value"):
-                filtered_data = {}
-                start = datetime.strptime(tf_config["startDate"], "%Y-%m-%d")
-                end = datetime.strptime(tf_config["endDate"], "%Y-%m-%d")
-                end = end.replace(hour=23, minute=59, second=59)  # Include end date
-                
-                for date_str, value in full_data["value"].items():
-                    try:
-                        # Try parsing with timestamp format first
-                        if " " in date_str:
-                            date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                        else:
-                            date = datetime.strptime(date_str, "%Y-%m-%d")
-                        
-                        if start <= date <= end:
-                            filtered_data[date_str] = value
-                    except:
-                        try:
-                            # Try ISO format
-                            date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                            if start <= date <= end:
-                                filtered_data[date_str] = value
-                        except:
-                            pass
-                
-                if filtered_data:
-                    frame_data["data"][series_name] = {"value": filtered_data}
-        
         story_data["timeFrames"].append(frame_data)
     
     return story_data
 
-def generate_gfc_story():
+def generate_gfc_story(fetch=None):
     """Generate static JSON for 2008 Financial Crisis story"""
+    fetch = fetch or fetch_series_data
     print("\n=== Generating 2008 Financial Crisis Story Data ===")
     
     story_config = STORIES["gfc"]
@@ -202,16 +234,18 @@ def generate_gfc_story():
     for series_name, series_config in story_config["series"].items():
         series_class = series_config["class"]
         frequency = series_config.get("frequency", "")
-        data = fetch_series_data(
-            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency
+        data = fetch(
+            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency,
+            series_config.get("units", "lin")
         )
         if data:
             story_data["data"][series_name] = data
     
     return story_data
 
-def generate_volcker_story():
+def generate_volcker_story(fetch=None):
     """Generate static JSON for Volcker Disinflation story"""
+    fetch = fetch or fetch_series_data
     print("\n=== Generating Volcker Disinflation Story Data ===")
     
     story_config = STORIES["volcker"]
@@ -227,16 +261,18 @@ def generate_volcker_story():
     for series_name, series_config in story_config["series"].items():
         series_class = series_config["class"]
         frequency = series_config.get("frequency", "")
-        data = fetch_series_data(
-            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency
+        data = fetch(
+            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency,
+            series_config.get("units", "lin")
         )
         if data:
             story_data["data"][series_name] = data
     
     return story_data
 
-def generate_oil_shock_story():
+def generate_oil_shock_story(fetch=None):
     """Generate static JSON for 1973 Oil Shock & Stagflation story"""
+    fetch = fetch or fetch_series_data
     print("\n=== Generating 1973 Oil Shock & Stagflation Story Data ===")
     
     story_config = STORIES["oil_shock"]
@@ -252,72 +288,78 @@ def generate_oil_shock_story():
     for series_name, series_config in story_config["series"].items():
         series_class = series_config["class"]
         frequency = series_config.get("frequency", "")
-        data = fetch_series_data(
-            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency
+        data = fetch(
+            series_class, story_config["startDate"], story_config["endDate"], series_name, frequency,
+            series_config.get("units", "lin")
         )
         if data:
             story_data["data"][series_name] = data
     
     return story_data
 
+# story_id -> (builder, label)
+STORY_BUILDERS = {
+    "dotcom": (generate_dotcom_story, "dot-com bubble"),
+    "gfc": (generate_gfc_story, "2008 financial crisis"),
+    "volcker": (generate_volcker_story, "Volcker Disinflation"),
+    "oil_shock": (generate_oil_shock_story, "1973 Oil Shock & Stagflation"),
+}
+
 def main():
     """Generate all story data files"""
+    parser = argparse.ArgumentParser(description="Generate static JSON files for Story Mode")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel series fetches")
+    parser.add_argument("--force", action="store_true", help="rebuild every story even if its inputs are unchanged")
+    args = parser.parse_args()
+
     project_root = Path(__file__).parent.parent
     output_dir = project_root / "frontend" / "public" / "story-data"
     output_dir.mkdir(parents=True, exist_ok=True)
     
     print("Generating static story data files...")
     print(f"Output directory: {output_dir}")
+
+    manifest = load_manifest(output_dir)
+    config_hashes = {story_id: config_hash(STORIES[story_id]) for story_id in STORY_BUILDERS}
+    current_inputs = {}
+
+    def skip_story(story_id, input_versions):
+        current_inputs[story_id] = input_versions
+        if args.force or not is_up_to_date(manifest, output_dir, story_id, config_hashes[story_id], input_versions):
+            return False
+        print(f"\n[SKIP] {STORY_BUILDERS[story_id][1]} is up to date")
+        return True
+
+    def save_story(story_id, story_data):
+        filename, content_hash, chunks = write_story_file(output_dir, story_id, story_data)
+        manifest["stories"][story_id] = {
+            "file": filename,
+            "chunks": chunks,
+            "content_hash": content_hash,
+            "config_hash": config_hashes[story_id],
+            "inputs": current_inputs[story_id],
+        }
+        print(f"\n[SUCCESS] Saved {STORY_BUILDERS[story_id][1]} data to {output_dir / filename}")
+
+    started = time.time()
+    run_pipeline(
+        STORIES,
+        {story_id: builder for story_id, (builder, _) in STORY_BUILDERS.items()},
+        fetch_series_data,
+        save_story,
+        max_workers=args.workers,
+        skip_story=skip_story,
+        version_of=data_version,
+    )
+    save_manifest(output_dir, manifest)
     
-    # Generate dot-com bubble story
-    try:
-        dotcom_data = generate_dotcom_story()
-        dotcom_path = output_dir / "dotcom.json"
-        with open(dotcom_path, 'w') as f:
-            json.dump(dotcom_data, f, indent=2)
-        print(f"\n[SUCCESS] Saved dot-com bubble data to {dotcom_path}")
-    except Exception as e:
-        print(f"\n[ERROR] Error generating dot-com bubble data: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Generate 2008 financial crisis story
-    try:
-        gfc_data = generate_gfc_story()
-        gfc_path = output_dir / "gfc.json"
-        with open(gfc_path, 'w') as f:
-            json.dump(gfc_data, f, indent=2)
-        print(f"\n[SUCCESS] Saved 2008 financial crisis data to {gfc_path}")
-    except Exception as e:
-        print(f"\n[ERROR] Error generating 2008 financial crisis data: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Generate Volcker Disinflation story
-    try:
-        volcker_data = generate_volcker_story()
-        volcker_path = output_dir / "volcker.json"
-        with open(volcker_path, 'w') as f:
-            json.dump(volcker_data, f, indent=2)
-        print(f"\n[SUCCESS] Saved Volcker Disinflation data to {volcker_path}")
-    except Exception as e:
-        print(f"\n[ERROR] Error generating Volcker Disinflation data: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # Generate 1973 Oil Shock & Stagflation story
-    try:
-        oil_shock_data = generate_oil_shock_story()
-        oil_shock_path = output_dir / "oil_shock.json"
-        with open(oil_shock_path, 'w') as f:
-            json.dump(oil_shock_data, f, indent=2)
-        print(f"\n[SUCCESS] Saved 1973 Oil Shock & Stagflation data to {oil_shock_path}")
-    except Exception as e:
-        print(f"\n[ERROR] Error generating 1973 Oil Shock & Stagflation data: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    print("\n=== Story data generation complete ===")
+    print(f"\n=== Story data generation complete ({time.time() - started:.2f}s) ===")
+
+    # Gate on the written files so a bad build never ships
+    print("\nVerifying story data...")
+    result = verify_all(data_dir=output_dir)
+    print_summary(result)
+    return 0 if result["ok"] else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
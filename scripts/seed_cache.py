@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Seed the backend cache for every story (STORIES) and dashboard series (series_map).
+
+Replaces the old per-story cache_*.py scripts. Each (series, frequency, units, range)
+is fetched once, concurrently, through the pooled FRED session and written with
+backend_cache.set_observations (trend/insight layers are derived on first read).
+
+Usage:
+    python scripts/seed_cache.py --dry-run        # show the plan and what's already cached
+    python scripts/seed_cache.py --workers 8      # seed everything that's missing
+    python scripts/seed_cache.py --stories gfc    # only one story (no dashboard series)
+
+Re-running resumes where a failed run stopped: anything already cached is skipped
+(use --force to refetch). Raw FRED responses the app or the story scripts already
+downloaded are reused through the HTTP cache (backend/series/http_cache.py);
+--force bypasses that too.
+"""
+import sys
+import time
+import argparse
+from datetime import date
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_dir.parent))
+
+from backend.cache import backend_cache
+from scripts.story_config import STORIES
+from scripts.story_pipeline import iter_story_series
+
+DEFAULT_WORKERS = 4
+DASHBOARD_YEARS = 5
+
+
+def _dashboard_series_map():
+    # Imported lazily: backend.app builds the FastAPI app on import
+    from backend.app import series_map
+    return series_map
+
+
+def build_plan(story_ids=None, include_dashboard=True, today=None):
+    """Deduplicated list of seed jobs: dicts with name, class, frequency, units, start, end."""
+    jobs = {}
+
+    def add(name, series_class, frequency, units, start, end):
+        key = (name, frequency, units, start, end)
+        jobs.setdefault(key, {
+            "name": name, "class": series_class, "frequency": frequency,
+            "units": units, "start": start, "end": end,
+        })
+
+    for story_id, story_config in STORIES.items():
+        if story_ids and story_id not in story_ids:
+            continue
+        for name, series_config, start, end in iter_story_series(story_config):
+            add(name, series_config["class"], series_config.get("frequency", ""),
+                series_config.get("units", "lin"), start, end)
+
+    if include_dashboard:
+        # Same window the dashboard requests: five years ago to today
+        today = today or date.today()
+        try:
+            start = today.replace(year=today.year - DASHBOARD_YEARS).isoformat()
+        except ValueError:  # Feb 29
+            start = today.replace(year=today.year - DASHBOARD_YEARS, day=28).isoformat()
+        for name, series_class in _dashboard_series_map().items():
+            add(name, series_class, series_class.frequency, series_class.units, start, today.isoformat())
+
+    return list(jobs.values())
+
+
+def is_cached(job):
+    """A local entry in the job's units answers it. Only looks: expired entries count and nothing is evicted."""
+    return backend_cache.contains(job["name"], job["start"], job["end"], job["frequency"], units=job["units"])
+
+
+def seed_job(job):
+    """Fetch one job from FRED and cache it. Returns the number of observations."""
+    series = job["class"](job["start"], job["end"], frequency=job["frequency"] or None, units=job["units"])
+    data = series.fetch_data()
+    if data is None or len(data) == 0:
+        raise ValueError("no data returned")
+    backend_cache.set_observations(job["name"], job["start"], job["end"], data, series.frequency,
+                                   last_updated=series.last_updated, units=job["units"])
+    return len(data)
+
+
+def _label(job):
+    units = f" [{job['units']}]" if job["units"] != "lin" else ""
+    return f"{job['name']}_{job['frequency']}{units} {job['start']}..{job['end']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the backend cache from STORIES and series_map")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent FRED fetches")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan and cache status without fetching")
+    parser.add_argument("--force", action="store_true", help="refetch even if already cached")
+    parser.add_argument("--stories", nargs="*", help="only these story ids")
+    parser.add_argument("--no-dashboard", action="store_true", help="skip the dashboard (series_map) ranges")
+    args = parser.parse_args()
+
+    plan = build_plan(args.stories, include_dashboard=not args.no_dashboard)
+    todo = plan if args.force else [job for job in plan if not is_cached(job)]
+    if args.force:
+        # Really go back to FRED instead of reusing stored raw responses
+        from backend.series import base_series
+        base_series.fred_http_cache.enabled = False
+
+    print(f"Seed plan: {len(plan)} series ranges, {len(plan) - len(todo)} already cached, {len(todo)} to fetch")
+    if args.dry_run:
+        todo_ids = {id(job) for job in todo}
+        for job in plan:
+            status = "fetch " if id(job) in todo_ids else "cached"
+            print(f"  [{status}] {_label(job)}")
+        return 0
+
+    started = time.time()
+    done = 0
+    points = 0
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(seed_job, job): job for job in todo}
+        for future in as_completed(futures):
+            job = futures[future]
+            done += 1
+            try:
+                n = future.result()
+                points += n
+                status = f"ok ({n} points)"
+            except Exception as e:
+                failed.append(job)
+                status = f"FAILED: {e}"
+            elapsed = max(time.time() - started, 1e-9)
+            print(f"[{done}/{len(todo)}] {_label(job)}: {status} "
+                  f"| {done / elapsed:.1f} series/s, {points / elapsed:,.0f} points/s")
+
+    elapsed = time.time() - started
+    print(f"\nSeeded {len(todo) - len(failed)}/{len(todo)} series ranges ({points:,} points) in {elapsed:.2f}s")
+    if failed:
+        print("[ERROR] Failed (re-run to resume):")
+        for job in failed:
+            print(f"  {_label(job)}")
+        return 1
+    print("[SUCCESS] Cache seeded")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -133,7 +133,7 @@ STORIES = {
         "endDate": "1983-12-31",
         "series": {
             "unemployment": {"class": UnemploymentSeries, "frequency": "m"},
-            "cpi": {"class": CPISeries, "frequency": "m"},
+            "cpi": {"class": CPISeries, "frequency": "m", "units": "pc1"},  # inflation rate (YoY %)
             "fedfunds": {"class": FedFundsSeries, "frequency": "m"},
             "gdp": {"class": GDPSeries, "frequency": "q"}
         }
@@ -145,7 +145,7 @@ STORIES = {
         "endDate": "1979-12-31",
         "series": {
             "unemployment": {"class": UnemploymentSeries, "frequency": "m"},
-            "cpi": {"class": CPISeries, "frequency": "m"},
+            "cpi": {"class": CPISeries, "frequency": "m", "units": "pc1"},  # inflation rate (YoY %)
             "fedfunds": {"class": FedFundsSeries, "frequency": "m"},
             "gdp": {"class": GDPSeries, "frequency": "q"}
         }
@@ -0,0 +1,129 @@
+"""
+Compact columnar format for Story Mode data.
+
+The generators build series as {"value": {"YYYY-MM-DD HH:MM:SS": v}} maps; on
+disk each series is stored as a date origin plus integer offsets and a parallel
+value array:
+
+    {"origin": "1995-01-01", "unit": "month", "step": 1, "values": [5.6, 5.4, ...]}
+
+`unit` is "month" when every date falls on the 1st (monthly/quarterly data) and
+"day" otherwise. Regularly spaced series store a single `step`; irregular ones
+(daily trading days) store `offsets` instead. storyUtils.js decodes this back
+into the map format the charts already use.
+
+Stories with time frames are split into an index (metadata + full-period
+series, which the context chart draws whole) and one chunk per frame for series
+only that frame has, so a page only downloads the detail for the frame it shows.
+"""
+import re
+from datetime import date
+
+FORMAT_VERSION = 2
+
+
+def _month_offset(origin, d):
+    return (d.year - origin.year) * 12 + (d.month - origin.month)
+
+
+def encode_series(series_data):
+    """{"value": {date: v}} -> compact columnar dict (None for empty series)."""
+    if not series_data or not series_data.get("value"):
+        return None
+    keys = sorted(series_data["value"])
+    dates = [date.fromisoformat(k[:10]) for k in keys]
+    values = [series_data["value"][k] for k in keys]
+    origin = dates[0]
+
+    if all(d.day == 1 for d in dates):
+        unit = "month"
+        offsets = [_month_offset(origin, d) for d in dates]
+    else:
+        unit = "day"
+        offsets = [(d - origin).days for d in dates]
+
+    encoded = {"origin": origin.isoformat(), "unit": unit}
+    steps = {b - a for a, b in zip(offsets, offsets[1:])}
+    if len(steps) <= 1:
+        encoded["step"] = steps.pop() if steps else 1
+    else:
+        encoded["offsets"] = offsets
+    encoded["values"] = values
+    return encoded
+
+
+def decode_series(encoded):
+    """Compact columnar dict -> {"value": {"YYYY-MM-DD": v}} (mirrors decodeSeries in storyUtils.js)."""
+    if not encoded:
+        return None
+    origin = date.fromisoformat(encoded["origin"])
+    values = encoded["values"]
+    offsets = encoded.get("offsets") or [i * encoded.get("step", 1) for i in range(len(values))]
+    if encoded["unit"] == "month":
+        months = [origin.month - 1 + o for o in offsets]
+        dates = [date(origin.year + m // 12, m % 12 + 1, 1) for m in months]
+    else:
+        dates = [date.fromordinal(origin.toordinal() + o) for o in offsets]
+    return {"value": {d.isoformat(): v for d, v in zip(dates, values)}}
+
+
+def decode_arrays(encoded):
+    """Compact (or legacy {"value": {...}}) series -> (datetime64[D] dates, float values) arrays."""
+    import numpy as np
+
+    if not encoded:
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=float)
+    if "value" in encoded:
+        keys = list(encoded["value"])
+        dates = np.array([k[:10] for k in keys], dtype="datetime64[D]")
+        values = np.array([encoded["value"][k] for k in keys], dtype=float)
+        return dates, values
+
+    values = np.array(encoded["values"], dtype=float)
+    if "offsets" in encoded:
+        offsets = np.asarray(encoded["offsets"], dtype=np.int64)
+    else:
+        offsets = np.arange(len(values), dtype=np.int64) * encoded.get("step", 1)
+    if encoded["unit"] == "month":
+        dates = (np.datetime64(encoded["origin"][:7], "M") + offsets).astype("datetime64[D]")
+    else:
+        dates = np.datetime64(encoded["origin"], "D") + offsets
+    return dates, values
+
+
+def encode_series_map(series_map):
+    return {name: encoded for name, encoded in
+            ((name, encode_series(data)) for name, data in (series_map or {}).items()) if encoded}
+
+
+def frame_slug(frame_id):
+    """File-name-safe version of a time frame id."""
+    return re.sub(r"[^a-z0-9-]+", "-", str(frame_id).lower()).strip("-") or "frame"
+
+
+def split_story(story_data):
+    """Encode a story into (index, [(frame_slug, chunk), ...]).
+
+    The index keeps everything except per-frame series, which move into chunks;
+    each frame in the index gets a `chunk` field filled in once the chunk file is
+    written. Frames without series of their own get no chunk file.
+    """
+    index = {"format": FORMAT_VERSION}
+    chunks = []
+    for key, value in story_data.items():
+        if key in ("data", "fullPeriodData"):
+            index[key] = encode_series_map(value)
+        elif key == "timeFrames":
+            frames = []
+            for frame in value:
+                meta = {k: v for k, v in frame.items() if k != "data"}
+                chunks.append((frame_slug(frame.get("id", len(frames))), {
+                    "format": FORMAT_VERSION,
+                    "id": frame.get("id"),
+                    "data": encode_series_map(frame.get("data")),
+                }))
+                frames.append(meta)
+            index[key] = frames
+        else:
+            index[key] = value
+    return index, chunks
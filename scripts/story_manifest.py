@@ -0,0 +1,102 @@
+"""
+Build manifest for Story Mode data.
+
+manifest.json records, per story, a hash of its STORIES config entry, the
+versions of its input series and the content hash of the file it produced.
+Stories whose config and inputs are unchanged are skipped, and output files
+carry their content hash in the name so the frontend/CDN can cache them
+immutably (only manifest.json needs revalidating). Stories are written in the
+compact format from story_format.py: an index file plus one chunk per time frame.
+"""
+import hashlib
+import json
+
+from scripts.story_format import split_story
+
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 10
+
+
+def _md5(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def config_hash(story_config):
+    """Stable hash of a STORIES entry (series classes are hashed by name)."""
+    return _md5(json.dumps(story_config, sort_keys=True, default=lambda o: getattr(o, "__name__", str(o))))
+
+
+def data_version(series_data):
+    """Content hash of one {"value": {date: v}} series payload."""
+    return _md5(json.dumps(series_data, sort_keys=True))[:16] if series_data else None
+
+
+def load_manifest(output_dir):
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {"stories": {}}
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        manifest.setdefault("stories", {})
+        return manifest
+    except (json.JSONDecodeError, OSError):
+        return {"stories": {}}
+
+
+def save_manifest(output_dir, manifest):
+    with open(output_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def is_up_to_date(manifest, output_dir, story_id, cfg_hash, input_versions):
+    """True if the story's config and inputs match the manifest and its output files still exist."""
+    entry = manifest["stories"].get(story_id)
+    if not entry:
+        return False
+    return (
+        entry.get("config_hash") == cfg_hash
+        and entry.get("inputs") == input_versions
+        and (output_dir / entry.get("file", "")).is_file()
+        and all((output_dir / chunk).is_file() for chunk in entry.get("chunks", []))
+    )
+
+
+def _write_hashed(output_dir, stem, payload):
+    """Write payload as compact JSON to <stem>.<content hash>.json. Returns (filename, hash)."""
+    body = json.dumps(payload, separators=(",", ":"))
+    content_hash = _md5(body)
+    filename = f"{stem}.{content_hash[:HASH_LENGTH]}.json"
+    path = output_dir / filename
+    if not path.exists():
+        with open(path, "w") as f:
+            f.write(body)
+    return filename, content_hash
+
+
+def write_story_file(output_dir, story_id, story_data):
+    """Write a story as a hashed index plus per-frame chunks and drop older versions.
+
+    Returns (index filename, index hash, chunk filenames). Chunks are named
+    <story_id>.<frame>.<hash>.json; the index lists them so it changes whenever
+    a chunk does.
+    """
+    index, chunks = split_story(story_data)
+    chunk_files = []
+    for frame, (slug, chunk) in zip(index.get("timeFrames", []), chunks):
+        if not chunk["data"]:
+            continue
+        frame["chunk"], _ = _write_hashed(output_dir, f"{story_id}.{slug}", chunk)
+        chunk_files.append(frame["chunk"])
+
+    filename, content_hash = _write_hashed(output_dir, story_id, index)
+
+    keep = {filename, *chunk_files}
+    for old in output_dir.glob(f"{story_id}.*.json"):
+        if old.name not in keep:
+            old.unlink()
+    # Unhashed file from before the manifest existed
+    legacy = output_dir / f"{story_id}.json"
+    if legacy.exists():
+        legacy.unlink()
+    return filename, content_hash, chunk_files
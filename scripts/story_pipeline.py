@@ -0,0 +1,155 @@
+"""
+Dependency-aware build pipeline for Story Mode data.
+
+1. Collect every (series, frequency, units, start, end) requirement from STORIES and
+   deduplicate it (identical ranges collapse, ranges contained in a wider one
+   are sliced from it instead of fetched).
+2. Fetch the remaining requirements once, with bounded parallelism.
+3. Assemble each story from memory as soon as all of its inputs are in.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+DEFAULT_WORKERS = 4
+
+
+def iter_story_series(story_config):
+    """Yield (series_name, series_config, start, end) for every series range a story needs."""
+    for series_name, series_config in story_config.get("series", {}).items():
+        yield series_name, series_config, story_config["startDate"], story_config["endDate"]
+
+    # Time-frame series are fetched once over the story's envelope and stored whole in fullPeriodData
+    frames = story_config.get("timeFrames", [])
+    if frames:
+        env_start = min(tf["startDate"] for tf in frames)
+        env_end = max(tf["endDate"] for tf in frames)
+        seen = set()
+        for tf_config in frames:
+            for series_name, series_config in tf_config.get("series", {}).items():
+                if series_name not in seen:
+                    seen.add(series_name)
+                    yield series_name, series_config, env_start, env_end
+
+    for series_name, series_config in story_config.get("fullPeriodSeries", {}).items():
+        start = series_config.get("startDate", frames[0]["startDate"] if frames else story_config.get("startDate"))
+        end = series_config.get("endDate", frames[-1]["endDate"] if frames else story_config.get("endDate"))
+        yield series_name, series_config, start, end
+
+
+def story_requirements(story_config):
+    """All (series_name, frequency, units, start, end) -> series_class pairs one story needs."""
+    return {
+        (series_name, series_config.get("frequency", ""), series_config.get("units", "lin"), start, end):
+            series_config["class"]
+        for series_name, series_config, start, end in iter_story_series(story_config)
+    }
+
+
+def collect_requirements(stories):
+    """Requirements per story plus the deduplicated fetch plan for all of them.
+
+    Returns (per_story, fetch_plan, sources) where fetch_plan maps the keys that
+    actually need fetching to their series class and sources maps every required
+    key to the fetch key it will be served from.
+    """
+    per_story = {story_id: story_requirements(cfg) for story_id, cfg in stories.items()}
+    all_reqs = {}
+    for reqs in per_story.values():
+        all_reqs.update(reqs)
+
+    # Earliest start (and then latest end) first so a container is always planned before what it contains
+    ordered = sorted(sorted(all_reqs, key=lambda k: k[4], reverse=True), key=lambda k: (k[0], k[1], k[2], k[3]))
+    fetch_plan = {}
+    sources = {}
+    for key in ordered:
+        name, freq, units, start, end = key
+        container = next(
+            (f for f in fetch_plan if f[:3] == (name, freq, units) and f[3] <= start and f[4] >= end),
+            None,
+        )
+        if container is None:
+            fetch_plan[key] = all_reqs[key]
+            container = key
+        sources[key] = container
+    return per_story, fetch_plan, sources
+
+
+def _input_key(key):
+    # lin keys keep their old form so existing manifests stay valid
+    name, freq, units, start, end = key
+    return "|".join((name, freq, start, end) + ((units,) if units != "lin" else ()))
+
+
+def slice_series_data(series_data, start, end):
+    """Cut a {"value": {date: v}} payload down to [start, end] (dates compared as YYYY-MM-DD)."""
+    if not series_data or not series_data.get("value"):
+        return None
+    values = {k: v for k, v in series_data["value"].items() if start <= k[:10] <= end}
+    return {"value": values} if values else None
+
+
+def run_pipeline(stories, builders, fetch, on_story_ready, max_workers=DEFAULT_WORKERS,
+                 skip_story=None, version_of=None):
+    """Fetch the deduplicated requirements in parallel and build each story once its inputs arrive.
+
+    builders maps story_id -> builder(fetch_fn); the builder is handed a fetch
+    function with the usual fetch_series_data signature that only reads from
+    memory. on_story_ready(story_id, story_data) is called per finished story.
+    If skip_story(story_id, input_versions) returns True the story isn't rebuilt;
+    input_versions maps "name|freq|start|end" (plus "|units" unless lin) -> version_of(fetched data).
+    """
+    per_story, fetch_plan, sources = collect_requirements(stories)
+    total_reqs = sum(len(r) for r in per_story.values())
+    print(f"Story requirements: {total_reqs} total, {len(fetch_plan)} unique fetches "
+          f"({max_workers} workers)")
+
+    fetched = {}
+    pending = {story_id: {sources[k] for k in reqs} for story_id, reqs in per_story.items() if story_id in builders}
+
+    def memory_fetch(series_class, start_date, end_date, series_name, frequency="", units="lin"):
+        key = (series_name, frequency, units, start_date, end_date)
+        source = sources.get(key)
+        if source is None or source not in fetched:
+            # Not part of the plan (builder asked for something unexpected); fall back to a real fetch
+            return fetch(series_class, start_date, end_date, series_name, frequency, units)
+        data = fetched[source]
+        return data if source == key else slice_series_data(data, start_date, end_date)
+
+    def build(story_id):
+        try:
+            if skip_story is not None:
+                input_versions = {
+                    _input_key(key): version_of(fetched.get(sources[key]))
+                    for key in sorted(per_story[story_id])
+                }
+                if skip_story(story_id, input_versions):
+                    return
+            on_story_ready(story_id, builders[story_id](memory_fetch))
+        except Exception as e:
+            print(f"\n[ERROR] Error generating {story_id} data: {e}")
+            import traceback
+            traceback.print_exc()
+
+    started = time.time()
+    # Stories with no requirements can be built straight away
+    for story_id in [s for s, deps in pending.items() if not deps]:
+        pending.pop(story_id)
+        build(story_id)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(fetch, series_class, key[3], key[4], key[0], key[1], key[2]): key
+            for key, series_class in fetch_plan.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                fetched[key] = future.result()
+            except Exception as e:
+                print(f"    ERROR fetching {key}: {e}")
+                fetched[key] = None
+            for story_id in [s for s, deps in pending.items() if deps <= fetched.keys()]:
+                pending.pop(story_id)
+                build(story_id)
+
+    print(f"Fetched {len(fetch_plan)} series ranges in {time.time() - started:.2f}s")
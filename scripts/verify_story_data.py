@@ -1,49 +1,255 @@
 #!/usr/bin/env python3
-"""Verify story data files are correct"""
+"""
+Verify story data files against STORIES.
+
+Every story in story_config.STORIES is checked in one pass: its files are
+resolved through manifest.json, each series is decoded straight into NumPy
+date/value arrays and checked against the configured range and frequency.
+
+Errors (exit code 1): missing/unreadable files, schema problems, dates that
+are out of order, duplicated or outside the configured range, non-finite values.
+Warnings (errors too with --strict): missing series, incomplete coverage of the
+configured range, gaps longer than the series frequency allows.
+
+Usage:
+    python scripts/verify_story_data.py                      # summary, exit 1 on errors
+    python scripts/verify_story_data.py --json report.json   # also write a machine-readable report
+    python scripts/verify_story_data.py --strict             # fail on warnings as well
+"""
+import sys
 import json
+import time
+import argparse
 from pathlib import Path
 
-def verify_gfc():
-    print("\n=== Verifying GFC Data ===")
-    gfc_path = Path("frontend/public/story-data/gfc.json")
-    with open(gfc_path) as f:
-        data = json.load(f)
-    
-    print(f"Title: {data.get('title')}")
-    print(f"Date range: {data.get('startDate')} to {data.get('endDate')}")
-    
-    for series_name in ["unemployment", "fedfunds", "cpi", "gdp"]:
-        series_data = data.get("data", {}).get(series_name, {}).get("value", {})
-        if series_data:
-            dates = sorted(series_data.keys())
-            print(f"\n{series_name}:")
-            print(f"  Entries: {len(series_data)}")
-            print(f"  First date: {dates[0]}")
-            print(f"  Last date: {dates[-1]}")
-            print(f"  Sample values: {list(series_data.items())[:3]}")
-        else:
-            print(f"\n{series_name}: MISSING")
-
-def verify_dotcom():
-    print("\n=== Verifying Dot-Com Bubble Data ===")
-    dotcom_path = Path("frontend/public/story-data/dotcom.json")
-    with open(dotcom_path) as f:
-        data = json.load(f)
-    
-    print(f"Time frames: {len(data.get('timeFrames', []))}")
-    
-    for frame in data.get("timeFrames", []):
-        print(f"\n{frame['id']} ({frame['startDate']} to {frame['endDate']}):")
-        for series_name in ["unemployment", "gdp", "fedfunds", "nasdaq"]:
-            series_data = frame.get("data", {}).get(series_name, {}).get("value", {})
-            if series_data:
-                dates = sorted(series_data.keys())
-                print(f"  {series_name}: {len(series_data)} entries ({dates[0][:10]} to {dates[-1][:10]})")
-            else:
-                print(f"  {series_name}: MISSING")
+import numpy as np
 
-if __name__ == "__main__":
-    verify_gfc()
-    verify_dotcom()
-    print("\n=== Verification complete ===")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.story_config import STORIES
+from scripts.story_format import decode_arrays
+
+STORY_DATA_DIR = Path(__file__).parent.parent / "frontend" / "public" / "story-data"
+
+# frequency -> (longest allowed gap between observations, slack at either end of the range), in days
+FREQUENCY_TOLERANCE = {
+    "d": (5, 7),       # weekends plus a holiday
+    "w": (8, 7),
+    "bw": (15, 14),
+    "m": (31, 31),
+    "q": (92, 92),
+    "sa": (184, 184),
+    "a": (366, 366),
+}
+DEFAULT_TOLERANCE = (31, 31)
+
+SERIES_KEYS = {"origin", "unit", "values"}
+
+
+def load_manifest(data_dir):
+    path = data_dir / "manifest.json"
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f).get("stories", {})
+
+
+def story_path(story_id, data_dir=STORY_DATA_DIR, manifest=None):
+    """Resolve a story's content-hashed file through manifest.json"""
+    manifest = load_manifest(data_dir) if manifest is None else manifest
+    entry = manifest.get(story_id)
+    if entry:
+        return data_dir / entry["file"]
+    return data_dir / f"{story_id}.json"
+
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def schema_errors(encoded):
+    """Structural problems with one encoded series (empty list if fine)."""
+    if not isinstance(encoded, dict):
+        return ["series is not an object"]
+    if "value" in encoded:
+        return [] if isinstance(encoded["value"], dict) else ["legacy 'value' is not an object"]
+    missing = SERIES_KEYS - encoded.keys()
+    if missing:
+        return [f"missing keys {sorted(missing)}"]
+    errors = []
+    if encoded["unit"] not in ("month", "day"):
+        errors.append(f"unknown unit {encoded['unit']!r}")
+    if "offsets" in encoded and len(encoded["offsets"]) != len(encoded["values"]):
+        errors.append("offsets and values differ in length")
+    if "offsets" not in encoded and "step" not in encoded:
+        errors.append("needs either step or offsets")
+    return errors
+
+
+def check_series(encoded, start, end, frequency, clip=False):
+    """Check one series against its configured [start, end] and frequency.
+
+    clip=True checks only the part inside [start, end] (a frame's slice of a full-period series).
+    Returns (stats, errors, warnings).
+    """
+    problems = schema_errors(encoded)
+    if problems:
+        return {}, problems, []
+    try:
+        dates, values = decode_arrays(encoded)
+    except (ValueError, TypeError) as e:
+        return {}, [f"cannot decode: {e}"], []
+
+    start, end = np.datetime64(start, "D"), np.datetime64(end, "D")
+    if clip:
+        inside = (dates >= start) & (dates <= end)
+        dates, values = dates[inside], values[inside]
+
+    errors, warnings = [], []
+    stats = {"count": int(len(dates))}
+    if len(dates) == 0:
+        return stats, [], ["series is empty"]
 
+    max_gap, slack = FREQUENCY_TOLERANCE.get(frequency, DEFAULT_TOLERANCE)
+    steps = np.diff(dates).astype(np.int64)
+
+    stats.update({"first": str(dates[0]), "last": str(dates[-1])})
+    if (steps < 0).any():
+        errors.append(f"{int((steps < 0).sum())} dates out of order")
+    if (steps == 0).any():
+        errors.append(f"{int((steps == 0).sum())} duplicate dates")
+    non_finite = ~np.isfinite(values)
+    if non_finite.any():
+        errors.append(f"{int(non_finite.sum())} non-finite values")
+    outside = (dates < start) | (dates > end)
+    if outside.any():
+        errors.append(f"{int(outside.sum())} dates outside {start}..{end}")
+
+    first, last = dates.min(), dates.max()
+    if (first - start).astype(int) > slack:
+        warnings.append(f"starts {first}, configured {start}")
+    if (end - last).astype(int) > slack:
+        warnings.append(f"ends {last}, configured {end}")
+    gaps = np.flatnonzero(steps > max_gap)
+    stats["gaps"] = int(len(gaps))
+    if len(gaps):
+        worst = gaps[np.argmax(steps[gaps])]
+        warnings.append(f"{len(gaps)} gaps over {max_gap} days (longest {int(steps[worst])} days after {dates[worst]})")
+    return stats, errors, warnings
+
+
+def expected_series(story_config):
+    """(section, series_name, frequency, start, end) for every series the story's files should contain."""
+    for name, cfg in story_config.get("series", {}).items():
+        yield "data", name, cfg.get("frequency", ""), story_config["startDate"], story_config["endDate"]
+    frames = story_config.get("timeFrames", [])
+    envelope = {}
+    for i, frame in enumerate(frames):
+        for name, cfg in frame.get("series", {}).items():
+            envelope.setdefault(name, cfg.get("frequency", ""))
+            yield f"timeFrames[{i}]", name, cfg.get("frequency", ""), frame["startDate"], frame["endDate"]
+    # Frame series are also stored over the whole story, for the context chart
+    for name, frequency in envelope.items():
+        yield "fullPeriodData", name, frequency, min(f["startDate"] for f in frames), max(f["endDate"] for f in frames)
+    for name, cfg in story_config.get("fullPeriodSeries", {}).items():
+        start = cfg.get("startDate", frames[0]["startDate"] if frames else story_config.get("startDate"))
+        end = cfg.get("endDate", frames[-1]["endDate"] if frames else story_config.get("endDate"))
+        yield "fullPeriodData", name, cfg.get("frequency", ""), start, end
+
+
+def _sections(index, data_dir):
+    """section name -> series map, reading frame chunks where the index points to them."""
+    sections = {"data": index.get("data") or {}, "fullPeriodData": index.get("fullPeriodData") or {}}
+    for i, frame in enumerate(index.get("timeFrames", [])):
+        sections[f"timeFrames[{i}]"] = _read_json(data_dir / frame["chunk"]).get("data", {}) if "chunk" in frame else frame.get("data", {})
+    return sections
+
+
+def verify_story(story_id, story_config, data_dir=STORY_DATA_DIR, manifest=None):
+    """Report for one story: {"ok", "errors", "warnings", "series": {section/name: stats}}."""
+    report = {"errors": [], "warnings": [], "series": {}}
+    path = story_path(story_id, data_dir, manifest)
+    try:
+        index = _read_json(path)
+        sections = _sections(index, data_dir)
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        report["errors"].append(f"cannot read {path.name}: {e}")
+        report["ok"] = False
+        return report
+    report["file"] = path.name
+
+    config_frames = story_config.get("timeFrames", [])
+    if len(index.get("timeFrames", [])) != len(config_frames):
+        report["errors"].append(f"{len(index.get('timeFrames', []))} time frames, configured {len(config_frames)}")
+    for i, (frame, cfg) in enumerate(zip(index.get("timeFrames", []), config_frames)):
+        for key in ("id", "startDate", "endDate"):
+            if frame.get(key) != cfg.get(key):
+                report["errors"].append(f"timeFrames[{i}].{key} is {frame.get(key)!r}, configured {cfg.get(key)!r}")
+
+    for section, name, frequency, start, end in expected_series(story_config):
+        label = f"{section}/{name}"
+        encoded = sections.get(section, {}).get(name)
+        clip = False
+        if encoded is None and section.startswith("timeFrames"):
+            # No series of its own: the frame shows its slice of the full-period one
+            encoded, clip = sections["fullPeriodData"].get(name), True
+        if encoded is None:
+            report["warnings"].append(f"{label}: missing")
+            continue
+        stats, errors, warnings = check_series(encoded, start, end, frequency, clip)
+        report["series"][label] = stats
+        report["errors"].extend(f"{label}: {e}" for e in errors)
+        report["warnings"].extend(f"{label}: {w}" for w in warnings)
+
+    report["ok"] = not report["errors"]
+    return report
+
+
+def verify_all(stories=STORIES, data_dir=STORY_DATA_DIR, strict=False):
+    started = time.perf_counter()
+    manifest = load_manifest(data_dir)
+    reports = {story_id: verify_story(story_id, cfg, data_dir, manifest) for story_id, cfg in stories.items()}
+    if strict:
+        for report in reports.values():
+            report["ok"] = report["ok"] and not report["warnings"]
+    return {
+        "ok": all(r["ok"] for r in reports.values()),
+        "strict": strict,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "stories": reports,
+    }
+
+
+def print_summary(result):
+    for story_id, report in result["stories"].items():
+        status = "OK" if report["ok"] else "FAIL"
+        print(f"[{status}] {story_id} ({report.get('file', 'no file')}): "
+              f"{len(report['series'])} series, {len(report['errors'])} errors, {len(report['warnings'])} warnings")
+        for error in report["errors"]:
+            print(f"    ERROR {error}")
+        for warning in report["warnings"]:
+            print(f"    warn  {warning}")
+    print(f"\n=== Verification {'passed' if result['ok'] else 'FAILED'} in {result['elapsed_ms']:.1f} ms ===")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify Story Mode data against STORIES")
+    parser.add_argument("--json", metavar="PATH", help="write the report as JSON ('-' for stdout)")
+    parser.add_argument("--strict", action="store_true", help="treat warnings as failures")
+    parser.add_argument("--data-dir", type=Path, default=STORY_DATA_DIR, help="story-data directory")
+    args = parser.parse_args()
+
+    result = verify_all(data_dir=args.data_dir, strict=args.strict)
+    if args.json == "-":
+        print(json.dumps(result, indent=2))
+    else:
+        print_summary(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(result, f, indent=2)
+    return 0 if result["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Run from anywhere: make the project root importable as in the app (`backend.*`)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
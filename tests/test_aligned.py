@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import app as app_module
+from backend.cache import BackendCache
+
+START, END = "2020-01-01", "2020-12-31"
+
+
+def frame(values_by_date):
+    return pd.DataFrame({"value": list(values_by_date.values())}, index=pd.to_datetime(list(values_by_date)))
+
+
+def monthly(start, values):
+    return {d.strftime("%Y-%m-%d"): v for d, v in zip(pd.date_range(start, periods=len(values), freq="MS"), values)}
+
+
+GDP = {"2020-01-01": 100.0, "2020-04-01": 90.0, "2020-07-01": 95.0, "2020-10-01": 98.0}
+CPI = monthly("2020-01-01", [float(250 + i) for i in range(12)])
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = BackendCache(str(tmp_path))
+    monkeypatch.setattr(app_module, "backend_cache", cache)
+    cache.set_observations("gdp", START, END, frame(GDP), "q")
+    cache.set_observations("cpi", START, END, frame(CPI), "m")
+    return cache
+
+
+@pytest.fixture
+def client(cache):
+    return TestClient(app_module.app)
+
+
+def aligned(client, **params):
+    return client.get("/series/aligned", params={"start": START, "end": END, **params})
+
+
+def column(body, name):
+    return dict(zip(body["index"], body["values"][body["names"].index(name)]))
+
+
+def test_sum_leaves_empty_bins_null(client):
+    body = aligned(client, names="gdp,cpi", freq="m", how="sum").json()
+    gdp = column(body, "gdp")
+    assert len(body["index"]) == 12
+    assert gdp["2020-01-01"] == 100.0 and gdp["2020-04-01"] == 90.0
+    assert gdp["2020-02-01"] is None and gdp["2020-03-01"] is None and gdp["2020-05-01"] is None
+    assert column(body, "cpi")["2020-02-01"] == 251.0
+
+
+def test_sum_to_quarters(client):
+    body = aligned(client, names="gdp,cpi", freq="q", how="sum").json()
+    assert body["index"] == ["2020-01-01", "2020-04-01", "2020-07-01", "2020-10-01"]
+    assert column(body, "cpi")["2020-01-01"] == 250.0 + 251.0 + 252.0
+    assert column(body, "gdp")["2020-04-01"] == 90.0
+
+
+def test_inner_join_keeps_common_dates(cache, client):
+    cache.set_observations("fedfunds", START, END, frame(monthly("2020-06-01", [0.1] * 7)), "m")
+    outer = aligned(client, names="cpi,fedfunds", freq="m").json()
+    inner = aligned(client, names="cpi,fedfunds", freq="m", join="inner").json()
+    assert len(outer["index"]) == 12
+    assert column(outer, "fedfunds")["2020-01-01"] is None
+    assert inner["index"] == list(monthly("2020-06-01", [0] * 7))
+    assert all(v is not None for values in inner["values"] for v in values)
+
+
+@pytest.mark.parametrize("params, status", [
+    ({"freq": "x"}, 400),
+    ({"how": "median"}, 400),
+    ({"join": "left"}, 400),
+    ({"units": "pct"}, 400),
+    ({"names": "gdp,nope"}, 404),
+])
+def test_rejects_bad_parameters(client, params, status):
+    response = aligned(client, **{"names": "gdp,cpi", **params})
+    assert response.status_code == status
+
+
+def test_cache_key_follows_observation_versions(cache, client):
+    first = aligned(client, names="gdp,cpi").json()
+    assert aligned(client, names="gdp,cpi").json()["key"] == first["key"]
+    revised = dict(CPI, **{"2020-12-01": 300.0})
+    cache.set_observations("cpi", START, END, frame(revised), "m")
+    second = aligned(client, names="gdp,cpi").json()
+    assert second["key"] != first["key"]
+    assert second["versions"]["cpi"] != first["versions"]["cpi"]
+    assert column(second, "cpi")["2020-12-01"] == 300.0
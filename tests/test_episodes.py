@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from backend.analytics.episodes import EPISODE_RULES, EpisodeIndex, detect, runs, sahm_indicator
+
+SAHM = EPISODE_RULES["unemployment"][0]
+
+
+def monthly_dates(n, start="2020-01"):
+    return np.arange(np.datetime64(start), np.datetime64(start) + n).astype("datetime64[D]")
+
+
+def test_runs_and_gap_merging():
+    mask = [0, 1, 1, 0, 1, 0, 0, 0, 1]
+    starts, ends = runs(mask)
+    assert starts.tolist() == [1, 4, 8] and ends.tolist() == [2, 4, 8]
+    starts, ends = runs(mask, max_gap=1)
+    assert starts.tolist() == [1, 8] and ends.tolist() == [4, 8]
+
+
+def test_sahm_indicator():
+    values = np.array([4.0] * 16 + [4.6, 4.9])
+    indicator = sahm_indicator(values)
+    # 12 months of 3-month averages before the first value
+    assert np.isnan(indicator[:14]).all()
+    assert indicator[14:16].tolist() == pytest.approx([0.0, 0.0])
+    assert indicator[16] == pytest.approx((4 + 4 + 4.6) / 3 - 4)
+    assert indicator[17] == pytest.approx((4 + 4.6 + 4.9) / 3 - 4)
+
+
+def test_sahm_episode():
+    # Flat at 4%, a six-month spell at 5%, then back
+    values = np.array([4.0] * 20 + [5.0] * 6 + [4.0] * 20)
+    dates = monthly_dates(len(values))
+    [episode] = detect(dates, values, SAHM)
+    assert episode["start"] == "2021-10-01"  # 3-month average first 0.67pp above its low
+    assert episode["end"] == "2022-03-01"
+    assert episode["periods"] == 6
+    assert episode["extreme"] == pytest.approx(1.0)
+    assert episode["extreme_date"] == "2021-11-01"
+    assert not episode["ongoing"]
+
+
+def test_sahm_episode_ongoing():
+    values = np.array([4.0] * 20 + [5.0] * 3)
+    [episode] = detect(monthly_dates(len(values)), values, SAHM)
+    assert episode["ongoing"]
+    assert episode["end"] == "2021-11-01"
+
+
+def test_no_episode_below_threshold():
+    values = np.array([4.0] * 20 + [4.3] * 6)
+    assert detect(monthly_dates(len(values)), values, SAHM) == []
+
+
+def test_episode_index_queries():
+    episodes = {
+        "sahm": [
+            {"rule": "sahm", "start": "2001-04-01", "end": "2001-12-01", "ongoing": False},
+            {"rule": "sahm", "start": "2008-05-01", "end": "2009-12-01", "ongoing": False},
+            {"rule": "sahm", "start": "2020-04-01", "end": "2020-09-01", "ongoing": True},
+        ],
+        "other": [],
+    }
+    index = EpisodeIndex(episodes)
+    assert [ep["start"] for ep in index.query("2001-12-01", "2008-05-01")] == ["2001-04-01", "2008-05-01"]
+    assert index.query("2002-01-01", "2008-04-30") == []
+    assert len(index.query()) == 3
+    assert index.query(rule="other") == []
+    assert index.active() == ["sahm"]
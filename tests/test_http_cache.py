@@ -0,0 +1,87 @@
+import json
+
+from backend.series.http_cache import FredHttpCache
+
+URL = "https://api.stlouisfed.org/fred/series/observations"
+PARAMS = {"series_id": "CPIAUCSL", "api_key": "secret", "file_type": "json"}
+BODY = json.dumps({"observations": [{"date": "2020-01-01", "value": "1"}]}).encode()
+
+
+class Response:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class Session:
+    """Answers 200 with an ETag, or 304 when it's sent back."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, headers=None):
+        self.calls.append(headers or {})
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return Response(304)
+        return Response(200, BODY, {"ETag": '"v1"'})
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path):
+    cache, session = FredHttpCache(tmp_path, max_age=3600), Session()
+    assert cache.get(session, URL, PARAMS).content == BODY
+    response = cache.get(session, URL, PARAMS)
+    assert response.content == BODY and response.json()["observations"][0]["value"] == "1"
+    assert len(session.calls) == 1
+
+
+def test_api_key_is_not_part_of_the_key_or_stored(tmp_path):
+    cache = FredHttpCache(tmp_path)
+    assert cache.cache_key(URL, PARAMS) == cache.cache_key(URL, dict(PARAMS, api_key="other"))
+    cache.get(Session(), URL, PARAMS)
+    assert all("secret" not in path.read_text() for path in tmp_path.glob("*.json"))
+
+
+def test_stale_entry_is_revalidated_with_its_etag(tmp_path):
+    cache, session = FredHttpCache(tmp_path, max_age=0), Session()
+    cache.get(session, URL, PARAMS)
+    response = cache.get(session, URL, PARAMS)
+    assert session.calls[-1] == {"If-None-Match": '"v1"'}
+    assert response.status_code == 200 and response.content == BODY
+
+
+def test_unchanged_last_updated_skips_the_request(tmp_path):
+    cache, session = FredHttpCache(tmp_path, max_age=0), Session()
+    probe = lambda cached_only: "2024-01-01 08:00:00"
+    cache.get(session, URL, PARAMS, last_updated=probe)
+    response = cache.get(session, URL, PARAMS, last_updated=probe)
+    assert len(session.calls) == 1
+    assert response.last_updated == "2024-01-01 08:00:00"
+    # A revision means going back to FRED
+    cache.get(session, URL, PARAMS, last_updated=lambda cached_only: "2024-02-01 08:00:00")
+    assert len(session.calls) == 2
+
+
+def test_refresh_always_asks_fred(tmp_path):
+    cache, session = FredHttpCache(tmp_path, max_age=3600), Session()
+    cache.get(session, URL, PARAMS)
+    cache.get(session, URL, PARAMS, refresh=True)
+    assert len(session.calls) == 2 and session.calls[-1] == {"If-None-Match": '"v1"'}
+
+
+def test_errors_are_not_stored(tmp_path):
+    cache = FredHttpCache(tmp_path)
+
+    class Failing:
+        def get(self, url, params=None, headers=None):
+            return Response(500, b"oops")
+
+    assert cache.get(Failing(), URL, PARAMS).status_code == 500
+    assert list(tmp_path.glob("*.z")) == []
+
+
+def test_disabled_cache_passes_through(tmp_path):
+    cache, session = FredHttpCache(tmp_path, enabled=False), Session()
+    cache.get(session, URL, PARAMS)
+    cache.get(session, URL, PARAMS)
+    assert len(session.calls) == 2
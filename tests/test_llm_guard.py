@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.analytics import llm_guard
+from backend.analytics.llm_guard import CircuitBreaker, GuardedLLMClient, LLMUnavailableError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_guard.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock.now += 59
+    assert not breaker.allow()
+
+
+def test_cancelled_trial_frees_the_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.allow()
+    breaker.cancel_trial()
+    assert breaker.allow()
+
+
+def test_trip_opens_immediately(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure(trip=True)
+    assert breaker.state == "open"
+
+
+class FailingClient:
+    def __init__(self, error):
+        self.calls = 0
+        self.error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def test_guard_serves_fallback_once_open(clock):
+    inner = FailingClient(RuntimeError("boom"))
+    guard = GuardedLLMClient(inner, failure_threshold=2, burst=10)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            guard.chat.completions.create(model="m", messages=[])
+    with pytest.raises(LLMUnavailableError):
+        guard.chat.completions.create(model="m", messages=[])
+    assert inner.calls == 2
+
+
+def test_guard_trips_on_quota_errors(clock):
+    inner = FailingClient(RuntimeError("You exceeded your current quota"))
+    guard = GuardedLLMClient(inner, failure_threshold=5, burst=10)
+    with pytest.raises(RuntimeError):
+        guard.chat.completions.create(model="m", messages=[])
+    assert guard.breaker.state == "open"
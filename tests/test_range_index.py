@@ -0,0 +1,79 @@
+import random
+
+from backend.cache import BackendCache, RangeIndex
+
+
+def brute_covering(entries, start, end):
+    covering = [e for e in entries if e[0] <= start and e[1] >= end]
+    return min(covering, key=lambda e: e[1] - e[0]) if covering else None
+
+
+def test_covering_picks_smallest_range():
+    index = RangeIndex()
+    index.add(0, 100, "wide")
+    index.add(10, 50, "narrow")
+    index.add(40, 60, "other")
+    assert index.covering(20, 30) == (10, 50, "narrow")
+    assert index.covering(45, 55) == (40, 60, "other")
+    assert index.covering(5, 95) == (0, 100, "wide")
+    assert index.covering(-1, 10) is None
+    assert index.covering(90, 101) is None
+
+
+def test_covering_accept_filters_candidates():
+    index = RangeIndex()
+    index.add(0, 100, "lin")
+    index.add(10, 50, "pc1")
+    assert index.covering(20, 30, accept=lambda name: name != "pc1") == (0, 100, "lin")
+    assert index.covering(20, 30, accept=lambda name: False) is None
+
+
+def test_remove_and_duplicates():
+    index = RangeIndex()
+    index.add(0, 10, "a")
+    index.add(0, 10, "a")
+    assert len(index) == 1
+    index.remove(0, 10, "a")
+    assert len(index) == 0
+    assert index.covering(2, 3) is None
+
+
+def test_overlaps_largest_first():
+    index = RangeIndex()
+    index.add(0, 10, "a")
+    index.add(5, 30, "b")
+    index.add(40, 50, "c")
+    assert index.overlaps(8, 35) == [(23, 5, 30, "b"), (3, 0, 10, "a")]
+    assert index.overlaps(8, 45, limit=1) == [(23, 5, 30, "b")]
+    assert index.overlaps(31, 39) == []
+
+
+def test_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(100):
+        index, entries = RangeIndex(), []
+        for k in range(rng.randint(0, 30)):
+            start = rng.randint(0, 200)
+            entry = (start, start + rng.randint(0, 100), f"f{k}")
+            index.add(*entry)
+            entries.append(entry)
+        for entry in entries[:len(entries) // 4]:
+            index.remove(*entry)
+            entries.remove(entry)
+        for _ in range(20):
+            start = rng.randint(0, 250)
+            end = start + rng.randint(0, 60)
+            got, expected = index.covering(start, end), brute_covering(entries, start, end)
+            assert (got and got[1] - got[0]) == (expected and expected[1] - expected[0])
+            overlapping = {e for e in entries if e[0] <= end and e[1] >= start}
+            assert {item[1:] for item in index.overlaps(start, end, limit=100)} == overlapping
+
+
+def test_backend_cache_answers_from_covering_entry(tmp_path):
+    cache = BackendCache(str(tmp_path))
+    cache.set("gdp", "2000-01-01", "2010-12-31", {"value": {"2005-01-01": 1.0}}, "q")
+    cache.set("gdp", "2004-01-01", "2006-12-31", {"value": {"2005-01-01": 2.0}}, "q")
+    assert cache.get("gdp", "2005-01-01", "2005-06-30", "q") == {"value": {"2005-01-01": 2.0}}
+    assert cache.get("gdp", "1999-01-01", "2005-06-30", "q") is None
+    # Other frequencies never answer
+    assert cache.get("gdp", "2005-01-01", "2005-06-30", "m") is None
@@ -0,0 +1,70 @@
+from backend.cache import BackendCache
+from backend.shared_cache import MemoryStore, SharedCache, decode, encode
+
+VALUE = {"value": {f"2020-{m:02d}-01": m * 1.5 for m in range(1, 13)}}
+
+
+class CountingStore(MemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.mgets = []
+
+    def mget(self, keys):
+        self.mgets.append(list(keys))
+        return super().mget(keys)
+
+
+class DownStore:
+    def __init__(self):
+        self.calls = 0
+
+    def mget(self, keys):
+        self.calls += 1
+        raise ConnectionError("refused")
+
+    def pipeline(self, transaction=True):
+        self.calls += 1
+        raise ConnectionError("refused")
+
+
+def test_encode_roundtrip_and_compression():
+    assert encode({"a": 1})[:1] == b"j"
+    big = encode(VALUE, compress_min=10)
+    assert big[:1] == b"z"
+    assert decode(big) == VALUE
+    assert decode(encode(VALUE)) == VALUE
+    assert decode(None) is None
+
+
+def test_instances_share_entries(tmp_path):
+    store = MemoryStore()
+    a = BackendCache(str(tmp_path / "a"), shared=SharedCache(store, name="memory"))
+    b = BackendCache(str(tmp_path / "b"), shared=SharedCache(store, name="memory"))
+    a.set("cpi", "2020-01-01", "2020-12-01", VALUE, "m")
+    a.set_artifact("trend", "cpi_v1", {"direction": "upward"})
+    assert b.get("cpi", "2020-01-01", "2020-12-01", "m") == VALUE
+    assert b.get_artifact("trend", "cpi_v1") == {"direction": "upward"}
+    # Pulled into b's own files
+    assert (b.cache_dir / "cpi_m_2020-01-01_2020-12-01.json").exists()
+
+
+def test_get_many_is_one_round_trip(tmp_path):
+    store = CountingStore()
+    a = BackendCache(str(tmp_path / "a"), shared=SharedCache(store, name="memory"))
+    b = BackendCache(str(tmp_path / "b"), shared=SharedCache(store, name="memory"))
+    a.set("cpi", "2020-01-01", "2020-12-01", VALUE, "m")
+    a.set("gdp", "2020-01-01", "2020-12-01", VALUE, "q")
+    found = b.get_many([("cpi", "2020-01-01", "2020-12-01", "m"), ("gdp", "2020-01-01", "2020-12-01", "q"),
+                        ("pce", "2020-01-01", "2020-12-01", "m")])
+    assert found == [VALUE, VALUE, None]
+    assert len(store.mgets) == 1 and len(store.mgets[0]) == 3
+
+
+def test_unreachable_server_falls_back_to_local(tmp_path):
+    store = DownStore()
+    cache = BackendCache(str(tmp_path), shared=SharedCache(store, name="redis", errors=(ConnectionError,)))
+    cache.set("cpi", "2020-01-01", "2020-12-01", VALUE, "m")
+    assert cache.get("cpi", "2020-01-01", "2020-12-01", "m") == VALUE
+    assert cache.get("gdp", "2020-01-01", "2020-12-01", "q") is None
+    # Skipped after the first failure instead of being retried on every call
+    assert store.calls == 1
@@ -0,0 +1,101 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from scripts.story_format import decode_arrays, decode_series, encode_series
+from scripts.verify_story_data import STORY_DATA_DIR, load_manifest
+
+ROOT = Path(__file__).parent.parent
+# Story files as they were before the columnar format ({"value": {"YYYY-MM-DD HH:MM:SS": v}})
+BASELINE_DIR = Path(__file__).parent / "fixtures" / "story-data"
+STORY_UTILS = ROOT / "frontend" / "src" / "utils" / "storyUtils.js"
+
+
+def baseline_series():
+    """(label, {"value": {...}}) for every series in every frame of the baseline stories."""
+    for path in sorted(BASELINE_DIR.glob("*.json")):
+        story = json.loads(path.read_text())
+        sections = {"data": story.get("data"), "fullPeriodData": story.get("fullPeriodData")}
+        for i, frame in enumerate(story.get("timeFrames", [])):
+            sections[f"timeFrames[{i}]"] = frame.get("data")
+        for section, series_map in sections.items():
+            for name, series in (series_map or {}).items():
+                yield f"{path.stem}/{section}/{name}", series
+
+
+def by_day(series):
+    return {k[:10]: v for k, v in series["value"].items()}
+
+
+BASELINE = list(baseline_series())
+
+
+def test_baseline_fixtures_present():
+    assert len(BASELINE) > 20
+
+
+@pytest.mark.parametrize("label, series", BASELINE, ids=[label for label, _ in BASELINE])
+def test_round_trip_is_lossless(label, series):
+    # Through JSON, as the generator writes it
+    encoded = json.loads(json.dumps(encode_series(series)))
+    assert decode_series(encoded)["value"] == by_day(series)
+    dates, values = decode_arrays(encoded)
+    expected = by_day(series)
+    assert [str(d) for d in dates] == sorted(expected)
+    assert values.tolist() == [expected[k] for k in sorted(expected)]
+
+
+def test_shipped_story_data_matches_baseline():
+    """Every baseline value is in the shipped files (frames may live in fullPeriodData)."""
+    manifest = load_manifest(STORY_DATA_DIR)
+    for path in sorted(BASELINE_DIR.glob("*.json")):
+        baseline = json.loads(path.read_text())
+        shipped = json.loads((STORY_DATA_DIR / manifest[path.stem]["file"]).read_text())
+        expected, found = {}, {}
+        for name, series in (baseline.get("data") or {}).items():
+            expected.setdefault(name, {}).update(by_day(series))
+        for frame in baseline.get("timeFrames", []):
+            for name, series in frame["data"].items():
+                expected.setdefault(name, {}).update(by_day(series))
+        for section in ("data", "fullPeriodData"):
+            for name, encoded in (shipped.get(section) or {}).items():
+                found.setdefault(name, {}).update(decode_series(encoded)["value"])
+        for frame in shipped.get("timeFrames", []):
+            if "chunk" in frame:
+                chunk = json.loads((STORY_DATA_DIR / frame["chunk"]).read_text())
+                for name, encoded in chunk["data"].items():
+                    found.setdefault(name, {}).update(decode_series(encoded)["value"])
+        assert found == expected, path.stem
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_frontend_decoder_matches():
+    """decodeSeries in storyUtils.js turns the encoder's output back into the baseline maps."""
+    encoded = {label: encode_series(series) for label, series in BASELINE}
+    script = (
+        f"import {{ decodeSeries }} from {json.dumps(STORY_UTILS.as_uri())};\n"
+        "let input = '';\n"
+        "process.stdin.on('data', (d) => { input += d; });\n"
+        "process.stdin.on('end', () => {\n"
+        "  const out = {};\n"
+        "  for (const [label, e] of Object.entries(JSON.parse(input))) out[label] = decodeSeries(e).value;\n"
+        "  process.stdout.write(JSON.stringify(out));\n"
+        "});\n"
+    )
+    result = subprocess.run(["node", "--input-type=module", "-e", script], input=json.dumps(encoded),
+                            capture_output=True, text=True, check=True)
+    decoded = json.loads(result.stdout)
+    for label, series in BASELINE:
+        assert decoded[label] == by_day(series), label
+
+
+def test_irregular_daily_series_keeps_offsets():
+    series = {"value": {"2020-01-02": 1.0, "2020-01-03": 2.0, "2020-01-06": 3.0}}
+    encoded = encode_series(series)
+    assert encoded["unit"] == "day" and encoded["offsets"] == [0, 1, 4]
+    assert decode_series(encoded) == series
+    assert decode_arrays(encoded)[0].dtype == np.dtype("datetime64[D]")
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pytest
+
+from backend.analytics.units import lookback_start, transform, transform_values
+
+
+def monthly(values, start="2020-01"):
+    dates = np.arange(np.datetime64(start), np.datetime64(start) + len(values)).astype("datetime64[D]")
+    return dates, np.array(values, dtype=float)
+
+
+def test_pch_is_period_over_period():
+    dates, values = monthly([100, 110, 99])
+    result = transform(dates, values, "pch")
+    assert math.isnan(result[0])
+    assert result[1:].tolist() == pytest.approx([10.0, -10.0])
+
+
+def test_pc1_uses_year_ago_value():
+    dates, values = monthly([100 + i for i in range(14)])
+    result = transform(dates, values, "pc1")
+    assert np.isnan(result[:12]).all()
+    assert result[12] == pytest.approx((112 / 100 - 1) * 100)
+    assert result[13] == pytest.approx((113 / 101 - 1) * 100)
+
+
+def test_pc1_quarterly():
+    dates = np.array(["2020-01-01", "2020-04-01", "2020-07-01", "2020-10-01", "2021-01-01"], dtype="datetime64[D]")
+    result = transform(dates, np.array([200, 201, 202, 203, 210.0]), "pc1", "q")
+    assert result[-1] == pytest.approx(5.0)
+    assert np.isnan(result[:-1]).all()
+
+
+def test_pc1_daily_tolerates_weekends():
+    dates = np.array(["2020-01-02", "2020-01-03", "2021-01-04"], dtype="datetime64[D]")
+    result = transform(dates, np.array([10.0, 20.0, 22.0]), "pc1", "d")
+    # 2020-01-04 (year-ago target) has no observation; the Friday before counts
+    assert result[-1] == pytest.approx(10.0)
+
+
+def test_pc1_missing_year_ago_is_nan():
+    dates = np.array(["2020-01-01", "2020-03-01", "2021-02-01"], dtype="datetime64[D]")
+    result = transform(dates, np.array([1.0, 2.0, 3.0]), "pc1", "m")
+    assert math.isnan(result[-1])
+
+
+def test_lin_and_unknown_units():
+    dates, values = monthly([1, 2])
+    assert transform(dates, values, "lin").tolist() == [1.0, 2.0]
+    with pytest.raises(ValueError):
+        transform(dates, values, "xyz")
+
+
+def test_transform_values_maps_nan_to_none():
+    result = transform_values({"2020-02-01": 110.0, "2020-01-01": 100.0}, "pch")
+    assert list(result) == ["2020-01-01", "2020-02-01"]
+    assert result["2020-01-01"] is None
+    assert result["2020-02-01"] == pytest.approx(10.0)
+
+
+def test_lookback_start():
+    assert lookback_start("2021-01-01", "lin") == "2021-01-01"
+    assert lookback_start("2021-03-01", "pch", "m") == "2021-01-29"
+    assert lookback_start("2021-03-01", "pc1", "m") == "2020-02-29"